@@ -1,12 +1,13 @@
 import React, { useState, useEffect } from 'react';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, Cell } from 'recharts';
 import { BENCHMARK_DATA } from '../constants';
-import { BenchmarkData } from '../types';
+import { BenchmarkData, ProverBenchmarkData } from '../types';
 
 const BenchmarkChart: React.FC = () => {
   const [benchmarkData, setBenchmarkData] = useState<BenchmarkData[]>(BENCHMARK_DATA);
   const [isRealData, setIsRealData] = useState(false);
   const [loading, setLoading] = useState(true);
+  const [proverData, setProverData] = useState<ProverBenchmarkData[]>([]);
 
   useEffect(() => {
     // Try to load real benchmark data
@@ -39,6 +40,34 @@ const BenchmarkChart: React.FC = () => {
       .finally(() => {
         setLoading(false);
       });
+
+    // Off-chain prover benchmark (model/benchmark_prover.py), optional
+    fetch('/prover-benchmark-data.json')
+      .then(res => {
+        if (res.ok) {
+          return res.json();
+        }
+        throw new Error('No prover data');
+      })
+      .then((data: any[]) => {
+        const formatted = data
+          .filter(item => !item.error && !item.skipped)
+          .map(item => ({
+            config: item.config,
+            logrows: item.logrows,
+            batchSize: item.batchSize,
+            keygenTime: item.keygenTime,
+            proveTime: item.proveTime.p50,
+            verifyTime: item.verifyTime.p50,
+            proofSize: item.proofSize,
+            pkSize: item.pkSize,
+            peakRssMb: item.peakRss / (1024 * 1024),
+          }));
+        setProverData(formatted);
+      })
+      .catch(() => {
+        setProverData([]);
+      });
   }, []);
 
   // Find Sepolia and Monad data
@@ -124,6 +153,55 @@ const BenchmarkChart: React.FC = () => {
                 </div>
             </div>
 
+            {/* Prover Cost (off-chain) */}
+            {proverData.length > 0 && (
+              <div className="w-full max-w-4xl mt-8 grid grid-cols-1 md:grid-cols-2 gap-8">
+                <div className="bg-monad-secondary/20 p-6 rounded-xl border border-white/5">
+                  <h3 className="text-lg font-semibold text-monad-primary mb-4 text-center">Prove Time p50 (Seconds)</h3>
+                  <div className="h-64 w-full">
+                    <ResponsiveContainer width="100%" height="100%">
+                      <BarChart data={proverData} layout="vertical">
+                        <CartesianGrid strokeDasharray="3 3" stroke="#333" horizontal={false} />
+                        <XAxis type="number" stroke="#888" />
+                        <YAxis dataKey="config" type="category" stroke="#fff" width={180} />
+                        <Tooltip
+                          contentStyle={{ backgroundColor: '#200052', borderColor: '#836EF9', color: '#fff' }}
+                          cursor={{fill: 'rgba(255,255,255,0.1)'}}
+                          formatter={(value: number) => `${value.toFixed(3)}s`}
+                        />
+                        <Bar dataKey="proveTime" fill="#836EF9" radius={[0, 4, 4, 0]} />
+                      </BarChart>
+                    </ResponsiveContainer>
+                  </div>
+                  <p className="text-xs text-gray-400 mt-2 text-center">
+                    Off-chain prover cost per configuration (model/benchmark_prover.py)
+                  </p>
+                </div>
+
+                <div className="bg-monad-secondary/20 p-6 rounded-xl border border-white/5">
+                  <h3 className="text-lg font-semibold text-monad-primary mb-4 text-center">Proof Size (Bytes)</h3>
+                  <div className="h-64 w-full">
+                    <ResponsiveContainer width="100%" height="100%">
+                      <BarChart data={proverData} layout="vertical">
+                        <CartesianGrid strokeDasharray="3 3" stroke="#333" horizontal={false} />
+                        <XAxis type="number" stroke="#888" />
+                        <YAxis dataKey="config" type="category" stroke="#fff" width={180} />
+                        <Tooltip
+                          contentStyle={{ backgroundColor: '#200052', borderColor: '#836EF9', color: '#fff' }}
+                          cursor={{fill: 'rgba(255,255,255,0.1)'}}
+                          formatter={(value: number) => value.toLocaleString()}
+                        />
+                        <Bar dataKey="proofSize" fill="#4B5563" radius={[0, 4, 4, 0]} />
+                      </BarChart>
+                    </ResponsiveContainer>
+                  </div>
+                  <p className="text-xs text-gray-400 mt-2 text-center">
+                    Proof bytes become calldata, so they drive on-chain gas
+                  </p>
+                </div>
+              </div>
+            )}
+
             {/* Gas Cost Details */}
             {isRealData && sepolia && monad && (
               <div className="w-full max-w-4xl mt-8 grid grid-cols-1 md:grid-cols-2 gap-8">
@@ -7,7 +7,8 @@ import {
   getWalletAddress, 
   switchToMonadTestnet,
   loadContractAddresses,
-  verifyPredictionOnChain 
+  verifyPredictionOnChain,
+  submitPredictionCalldata
 } from '../services/blockchainService';
 import { Activity, Cpu, Lock, CheckCircle, Play, FileCode, Globe, Info, X, Terminal, Hash, Settings, Wallet } from 'lucide-react';
 
@@ -132,6 +133,7 @@ const Dashboard: React.FC = () => {
 
     // Local proof value for on-chain verification (avoid relying on async state)
     let proofForChain: string | null = null;
+    let calldataForChain: string | null = null;
     
     const resetSteps = INITIAL_STEPS.map(s => ({ ...s, status: 'pending' as const, log: [] }));
     setSteps(resetSteps);
@@ -205,6 +207,7 @@ const Dashboard: React.FC = () => {
       await new Promise(r => setTimeout(r, 600));
       
       const zkResult = await generateProof(inputValues, predictedPrice);
+      calldataForChain = zkResult.calldata || null;
       
       addLog("[Halo2] Finalizing proof...");
       await new Promise(r => setTimeout(r, 400));
@@ -255,13 +258,15 @@ const Dashboard: React.FC = () => {
       try {
         addLog("[Monad] Sending transaction to blockchain...");
         
-        // Parse proof hex and instances from proof
+        // Prefer the prover's pre-encoded calldata; otherwise encode proof + instances here
         const instances = inputValues.map(v => parseFloat(v));
-        const result = await verifyPredictionOnChain(
-          contractAddresses.monadPriceGuard,
-          instances,
-          proofForChain
-        );
+        const result = calldataForChain
+          ? await submitPredictionCalldata(contractAddresses.monadPriceGuard, calldataForChain)
+          : await verifyPredictionOnChain(
+              contractAddresses.monadPriceGuard,
+              instances,
+              proofForChain
+            );
         
         if (result.success && result.txHash) {
           setTxHash(result.txHash);
@@ -0,0 +1,30 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+/**
+ * Adapter from the Verifier interface MonadPriceGuard calls
+ * (verify(uint256[], bytes)) to the EZKL-generated Halo2Verifier
+ * (verifyProof(bytes, uint256[])).
+ *
+ * Used by model/benchmark_verify_gas.py to run real EZKL proofs through an
+ * unmodified MonadPriceGuard on a local node.
+ */
+interface IHalo2Verifier {
+    function verifyProof(bytes calldata proof, uint256[] calldata instances) external returns (bool);
+}
+
+contract EzklVerifierAdapter {
+    IHalo2Verifier public immutable halo2Verifier;
+
+    constructor(address _halo2Verifier) {
+        halo2Verifier = IHalo2Verifier(_halo2Verifier);
+    }
+
+    function verify(
+        uint256[] calldata instances,
+        bytes calldata proof
+    ) external returns (bool) {
+        require(halo2Verifier.verifyProof(proof, instances), "Invalid proof");
+        return true;
+    }
+}
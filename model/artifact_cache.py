@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for EZKL setup artifacts.
+
+Steps 1-4 of generate_proof() (settings, calibration, compile, keygen) only
+depend on the ONNX model, the run args and the calibration data. Their
+outputs are stored under cache/<sha256>/ and restored when the key matches,
+so repeated runs go straight to witness + prove.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+# Cache root (relative to model/, like the other artifact paths)
+cache_dir = os.path.join('cache')
+
+# Artifacts produced by steps 1-4
+cached_artifacts = [
+    'settings.json',
+    'network.ezkl',
+    'pk.key',
+    'vk.key',
+]
+
+
+def _hash_file(h, path):
+    """Feed a file into hash object h in chunks"""
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+
+
+def cache_key(model_path, run_args, calibration_args, calibration_path):
+    """
+    Compute the cache key for a setup run.
+
+    Args:
+        model_path: Path to the ONNX model
+        run_args: Dict of PyRunArgs fields passed to gen_settings
+        calibration_args: Dict of calibrate_settings parameters (target, scales)
+        calibration_path: Path to the calibration input JSON
+
+    Returns:
+        Hex sha256 digest
+    """
+    h = hashlib.sha256()
+    h.update(b'onnx\0')
+    _hash_file(h, model_path)
+    h.update(b'run_args\0')
+    h.update(json.dumps(run_args, sort_keys=True).encode('utf-8'))
+    h.update(b'calibration\0')
+    h.update(json.dumps(calibration_args, sort_keys=True).encode('utf-8'))
+    _hash_file(h, calibration_path)
+    return h.hexdigest()
+
+
+def _entry_dir(key):
+    return os.path.join(cache_dir, key)
+
+
+def _copy_out(src, dst):
+    """
+    Copy a cached artifact to its working path, unless it is already there.
+
+    Never hardlink: setup and calibrate.py rewrite the working artifacts in
+    place, which would corrupt the entry through a shared inode. copy2 keeps
+    the entry's mtime, so a working file with the same size and mtime_ns is
+    the restored copy and is left alone (no multi-GB pk.key copy per hit).
+    Otherwise the copy is renamed over dst, which is atomic for concurrent
+    readers and also replaces an old hardlink into the cache.
+    """
+    st = os.stat(src)
+    try:
+        current = os.stat(dst)
+        if current.st_size == st.st_size and current.st_mtime_ns == st.st_mtime_ns \
+                and current.st_ino != st.st_ino:
+            return
+    except FileNotFoundError:
+        pass
+    tmp = f"{dst}.tmp{os.getpid()}"
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+def lookup(key):
+    """Return the cache entry directory for key, or None if incomplete/missing"""
+    entry = _entry_dir(key)
+    for name in cached_artifacts:
+        path = os.path.join(entry, name)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+    return entry
+
+
+def restore(key, paths):
+    """
+    Restore cached artifacts into their working locations.
+
+    Args:
+        key: Cache key from cache_key()
+        paths: Dict mapping artifact name (see cached_artifacts) to destination path
+
+    Returns:
+        True on cache hit, False on miss
+    """
+    entry = lookup(key)
+    if entry is None:
+        return False
+    for name in cached_artifacts:
+        _copy_out(os.path.join(entry, name), paths[name])
+    return True
+
+
+def store(key, paths):
+    """
+    Store freshly generated artifacts under key.
+
+    The entry is written to a temp directory and renamed into place so a
+    crashed run never leaves a half-populated entry behind.
+    """
+    entry = _entry_dir(key)
+    if lookup(key) is not None:
+        return entry
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_entry = f"{entry}.tmp{os.getpid()}"
+    shutil.rmtree(tmp_entry, ignore_errors=True)
+    os.makedirs(tmp_entry)
+    for name in cached_artifacts:
+        shutil.copy2(paths[name], os.path.join(tmp_entry, name))
+    shutil.rmtree(entry, ignore_errors=True)
+    os.rename(tmp_entry, entry)
+    return entry
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bulk proof audit: verify thousands of stored proofs in parallel.
+
+Every worker process resolves and warms vk.key, settings.json and the SRS
+for the circuit once (ezkl.verify reads them by path, so after warm-up
+they are served from the page cache), then verifies its share of the
+proofs. Each proof is classified as
+
+    valid     ezkl.verify accepted it
+    invalid   ezkl.verify rejected it
+    mock      a generate_proof() fallback ("proof": "mock_proof_data"),
+              never sent to ezkl
+    corrupt   unreadable JSON, missing/non-hex proof bytes, instances that
+              are not field elements, or ezkl.verify raised
+
+JSON that is not a proof at all (no proof/hex_proof/instances key, e.g.
+summary.json in an output directory) is counted as skipped and does not
+fail the audit.
+
+Accepts proof.json files (directory, glob or single file), proof store /
+job queue entries ({"proof": {...}, "witness": ...}) and JSONL on stdin.
+Writes audit_output/report.json with counts, throughput, verify latency
+percentiles and every non-valid proof with its reason; exits 1 if any
+proof is not valid, so it can gate relaying a day's output on-chain.
+
+Usage (from model/):
+    python audit_proofs.py batch_output/proofs --workers 8
+    python audit_proofs.py 'pipeline_output/proofs/*.json' --profile hashed-inputs
+    cat proofs.jsonl | python audit_proofs.py -
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import calldata_encoder
+import generate_proof as gp
+from instrumentation import percentiles
+from workspace import JobWorkspace
+
+# Report (relative to model/)
+report_path = os.path.join('audit_output', 'report.json')
+
+# Proofs per worker task
+chunk_size = 64
+
+# Verifier state of this worker process (set by _init_worker)
+_verifier = {}
+
+
+def _init_worker(model_dir, artifacts_dir, scratch_dir):
+    """Process pool initializer: resolve + warm VK, settings and SRS once"""
+    os.chdir(model_dir)
+    ws = JobWorkspace(os.path.join(scratch_dir, str(os.getpid())), artifacts_dir=artifacts_dir)
+    gp.load_settings(ws.settings_path)
+    srs_file = ws.srs_path
+    for path in (ws.vk_path, ws.settings_path, srs_file):
+        with open(path, 'rb') as f:
+            while f.read(8 * 1024 * 1024):
+                pass
+    _verifier.update(workspace=ws, srs=srs_file)
+
+
+def classify(proof):
+    """
+    Static checks before verifying.
+
+    Returns:
+        (status, reason) for mock/corrupt proofs, or None if it should be verified
+    """
+    if not calldata_encoder.is_proof(proof):
+        return 'skipped', "not a proof"
+    if isinstance(proof.get('proof'), dict) and 'instances' not in proof:
+        proof = proof['proof']  # proof store / job queue entry
+    if proof.get('proof') == 'mock_proof_data' or 'mock' in str(proof.get('note', '')).lower():
+        return 'mock', proof.get('note') or "mock_proof_data"
+    try:
+        data = gp.proof_to_hex(proof)
+        bytes.fromhex(data[2:])
+    except ValueError as e:
+        return 'corrupt', f"proof bytes: {e}"
+    if len(data) <= 2:
+        return 'corrupt', "empty proof bytes"
+    try:
+        calldata_encoder.proof_instances(proof)
+    except (ValueError, TypeError) as e:
+        return 'corrupt', f"instances: {e}"
+    return None
+
+
+def _audit_chunk(items):
+    """Worker: [(source, proof.json text or None)] -> [result dict]"""
+    ws, srs_file = _verifier['workspace'], _verifier['srs']
+    results = []
+    for source, text in items:
+        result = {'source': source}
+        on_disk = text is None
+        try:
+            if on_disk:
+                with open(source, 'r') as f:
+                    text = f.read()
+            proof = json.loads(text)
+        except (OSError, ValueError) as e:
+            results.append(dict(result, status='corrupt', reason=f"read: {e}"))
+            continue
+        static = classify(proof)
+        if static is not None:
+            results.append(dict(result, status=static[0], reason=static[1]))
+            continue
+        # ezkl.verify takes a path: stdin lines and wrapped entries go through the scratch dir
+        proof_file = source
+        if not on_disk or 'instances' not in proof:
+            proof_file = ws.proof_path
+            with open(proof_file, 'w') as f:
+                json.dump(proof if 'instances' in proof else proof['proof'], f)
+        started = time.perf_counter()
+        try:
+            valid = gp.ezkl.verify(proof_file, ws.settings_path, ws.vk_path, srs_path=srs_file)
+            result.update(status='valid' if valid else 'invalid', seconds=time.perf_counter() - started)
+            if not valid:
+                result['reason'] = "verification failed"
+        except BaseException as e:
+            # Rust panics (pyo3 PanicException) derive from BaseException
+            if isinstance(e, (KeyboardInterrupt, SystemExit)):
+                raise
+            result.update(status='corrupt', reason=f"verify: {e}", seconds=time.perf_counter() - started)
+        results.append(result)
+    return results
+
+
+def audit(source, workers, batch_size=1, profile=None, model=None):
+    """
+    Verify every proof of a source against one circuit's VK.
+
+    Returns:
+        Report dict
+    """
+    model_dir = os.path.dirname(os.path.abspath(__file__))
+    paths = gp.circuit_paths(batch_size, profile, model)
+    for name in ('vk.key', 'settings.json'):
+        if not os.path.exists(paths[name]):
+            raise FileNotFoundError(f"{paths[name]} not found; run the circuit setup first")
+    artifacts_dir = os.path.dirname(os.path.abspath(paths['settings.json']))
+
+    counts = {'valid': 0, 'invalid': 0, 'mock': 0, 'corrupt': 0, 'skipped': 0}
+    problems, verify_s = [], []
+    started = time.perf_counter()
+    # Per-worker scratch dirs live under one directory removed by this process
+    with JobWorkspace(prefix='zkaudit-', artifacts_dir=artifacts_dir) as scratch, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(model_dir, artifacts_dir, scratch.directory)) as pool:
+        chunks = calldata_encoder.chunked(calldata_encoder.iter_proofs(source), chunk_size)
+        for chunk in calldata_encoder.bounded_map(pool, _audit_chunk, chunks, 2 * workers):
+            for r in chunk:
+                counts[r['status']] += 1
+                if 'seconds' in r:
+                    verify_s.append(r['seconds'])
+                if r['status'] not in ('valid', 'skipped'):
+                    problems.append(r)
+            done = sum(counts.values())
+            if done % 1000 < chunk_size:
+                print(f"  {done} audited ({done / (time.perf_counter() - started):.1f} proofs/sec)")
+    elapsed = time.perf_counter() - started
+
+    total = sum(counts.values()) - counts['skipped']
+    return {
+        'source': source,
+        'vk': os.path.abspath(paths['vk.key']),
+        'settings': os.path.abspath(paths['settings.json']),
+        'proofs': total,
+        **counts,
+        'workers': workers,
+        'elapsedSeconds': elapsed,
+        'proofsPerSecond': total / elapsed if elapsed > 0 else 0.0,
+        'verifyTime': percentiles(verify_s),
+        'problems': problems,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel bulk proof verification/audit")
+    parser.add_argument('source', help="Directory or glob of proof JSON files, a single file, or '-' for JSONL on stdin")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--batch-size', type=int, default=1, help="Circuit batch size the proofs were made with")
+    parser.add_argument('--profile', help="Visibility/commitment profile (see profiles.py)")
+    parser.add_argument('--model', help="Registered model (model_registry.py)")
+    parser.add_argument('--out', default=report_path)
+    args = parser.parse_args()
+
+    if args.source != '-' and not os.path.isabs(args.source):
+        args.source = os.path.abspath(args.source)
+    args.out = os.path.abspath(args.out)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        model = None
+        if args.model:
+            import model_registry
+            model = model_registry.resolve(args.model)
+        report = audit(args.source, args.workers, args.batch_size, args.profile, model)
+
+        os.makedirs(os.path.dirname(args.out), exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        bad = report['proofs'] - report['valid']
+        print("\n" + "=" * 60)
+        print(f"[{'OK' if not bad else 'WARNING'}] {report['valid']}/{report['proofs']} valid, "
+              f"{report['invalid']} invalid, {report['mock']} mock, {report['corrupt']} corrupt, "
+              f"{report['skipped']} non-proof file(s) skipped")
+        if report['verifyTime']:
+            print(f"     {report['proofsPerSecond']:.1f} proofs/sec with {report['workers']} worker(s), "
+                  f"verify p50={report['verifyTime']['p50'] * 1000:.1f}ms p99={report['verifyTime']['p99'] * 1000:.1f}ms")
+        print(f"     Report: {args.out}")
+        print("=" * 60)
+        if bad:
+            sys.exit(1)
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
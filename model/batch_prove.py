@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch proving: prove many [BTC Vol, ETH Gas, Market Volume] rows in parallel.
+
+Input is a CSV (3 numeric columns, optional header) or JSONL file (one
+[a, b, c] list or {"inputs": [a, b, c]} object per line). Rows are spread
+across N worker processes; each worker loads the compiled circuit and PK
+once (generate_proof.warm_prover) and then proves rows back to back.
+
+With --batch-size N each proof covers N consecutive rows (circuit compiled
+with the ONNX batch dimension fixed to N, see generate_proof.setup_circuit),
+amortizing the fixed proving cost over N predictions.
+
+With --precheck, rows whose quantized values fall outside the calibrated
+lookup range (reference_eval.precheck) are rejected before any proving.
+
+Output:
+    <out>/proofs/row_000000.json ...   one proof.json per row (or batch_000000.json per batch)
+    <out>/summary.json                 per-row status/timing + throughput
+
+Usage (from model/):
+    python batch_prove.py rows.csv --workers 4 --out batch_output [--batch-size 8] [--precheck]
+"""
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import generate_proof as gp
+import instrumentation
+import profiles
+import proof_store
+from workspace import JobWorkspace
+
+
+def read_rows(path):
+    """
+    Read input vectors from a CSV or JSONL file.
+
+    Returns:
+        List of [float, float, float]
+    """
+    rows = []
+    if path.endswith('.jsonl') or path.endswith('.ndjson'):
+        with open(path, 'r') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+                if isinstance(item, dict):
+                    item = item.get('inputs', item.get('input_data'))
+                if not isinstance(item, list) or len(item) != 3:
+                    raise ValueError(f"{path}:{line_no}: expected 3 input values")
+                rows.append([float(v) for v in item])
+    else:
+        with open(path, 'r', newline='') as f:
+            for line_no, record in enumerate(csv.reader(f), 1):
+                if not record or not ''.join(record).strip():
+                    continue
+                try:
+                    values = [float(v) for v in record[:3]]
+                except ValueError:
+                    if line_no == 1:
+                        continue  # header
+                    raise ValueError(f"{path}:{line_no}: non-numeric row {record}")
+                if len(values) != 3:
+                    raise ValueError(f"{path}:{line_no}: expected 3 input values")
+                rows.append(values)
+    return rows
+
+
+def _prove_row(index, inputs, proofs_dir, use_store):
+    """Worker: prove one row, writing its proof to proofs_dir"""
+    proof_file = os.path.join(proofs_dir, f"row_{index:06d}.json")
+    store = proof_store.open_store() if use_store else None
+    started = time.perf_counter()
+    try:
+        with JobWorkspace(prefix=f'zkbatch-{index}-') as ws:
+            gp.prove_input(inputs, ws, store=store)
+            shutil.move(ws.proof_path, proof_file)
+        return {
+            'index': index,
+            'inputs': inputs,
+            'proof': os.path.relpath(proof_file, os.path.dirname(proofs_dir)),
+            'seconds': time.perf_counter() - started,
+        }
+    except Exception as e:
+        return {
+            'index': index,
+            'inputs': inputs,
+            'error': str(e),
+            'seconds': time.perf_counter() - started,
+        }
+
+
+def _prove_chunk(index, rows, batch_size, proofs_dir, use_store):
+    """Worker: prove up to batch_size rows with one batched proof"""
+    proof_file = os.path.join(proofs_dir, f"batch_{index:06d}.json")
+    store = proof_store.open_store() if use_store else None
+    started = time.perf_counter()
+    try:
+        with gp.batch_workspace(batch_size, prefix=f'zkbatch-{index}-') as ws:
+            _, _, outputs = gp.prove_batch(rows, ws, store=store)
+            shutil.move(ws.proof_path, proof_file)
+        return {
+            'index': index,
+            'inputs': rows,
+            'outputs': outputs,
+            'proof': os.path.relpath(proof_file, os.path.dirname(proofs_dir)),
+            'seconds': time.perf_counter() - started,
+        }
+    except Exception as e:
+        return {
+            'index': index,
+            'inputs': rows,
+            'error': str(e),
+            'seconds': time.perf_counter() - started,
+        }
+
+
+def batch_prove(rows, workers, out_dir, use_store=True, batch_size=1, rejected=()):
+    """
+    Prove all rows across a pool of worker processes.
+
+    Args:
+        rows: List of input vectors
+        workers: Number of worker processes
+        out_dir: Output directory for per-row proofs and summary.json
+        use_store: Reuse proofs of already-proven (quantized) inputs
+        batch_size: Rows per proof (needs setup_circuit(batch_size=...) first)
+        rejected: Pre-check rejections ({'index', 'reason'}, see reference_eval.precheck);
+                  those rows are not proven and are reported apart from 'failed'
+
+    Returns:
+        Summary dict (also written to <out_dir>/summary.json)
+    """
+    model_dir = os.path.dirname(os.path.abspath(__file__))
+    out_dir = os.path.abspath(out_dir)
+    proofs_dir = os.path.join(out_dir, 'proofs')
+    os.makedirs(proofs_dir, exist_ok=True)
+
+    skip = {r['index'] for r in rejected}
+    indexed = [(i, row) for i, row in enumerate(rows) if i not in skip]
+    kept = [row for _, row in indexed]
+    chunks = [kept[i:i + batch_size] for i in range(0, len(kept), batch_size)]
+    print(f"[EZKL] Batch proving {len(kept)} row(s) as {len(chunks)} proof(s) "
+          f"(batch size {batch_size}) with {workers} worker(s)...")
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=gp.warm_prover,
+        initargs=(model_dir, batch_size),
+    ) as pool:
+        if batch_size == 1:
+            futures = [pool.submit(_prove_row, i, row, proofs_dir, use_store) for i, row in indexed]
+        else:
+            futures = [pool.submit(_prove_chunk, i, chunk, batch_size, proofs_dir, use_store)
+                       for i, chunk in enumerate(chunks)]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            if 'error' in result:
+                print(f"  [ERROR] {'row' if batch_size == 1 else 'batch'} {result['index']}: {result['error']}")
+            if done % 50 == 0 or done == len(futures):
+                print(f"  {done}/{len(futures)} done ({done / (time.perf_counter() - started):.2f} proofs/sec)")
+    elapsed = time.perf_counter() - started
+
+    results.sort(key=lambda r: r['index'])
+    proofs = sum(1 for r in results if 'error' not in r)
+    succeeded = sum(len(r['inputs']) if batch_size > 1 else 1 for r in results if 'error' not in r)
+    summary = {
+        'rows': len(rows),
+        'succeeded': succeeded,
+        'failed': len(kept) - succeeded,
+        'workers': workers,
+        'batchSize': batch_size,
+        'proofs': proofs,
+        'rejected': list(rejected),
+        'elapsedSeconds': elapsed,
+        'proofsPerSecond': proofs / elapsed if elapsed > 0 else 0.0,
+        'proofsPerSecondPerWorker': proofs / elapsed / workers if elapsed > 0 else 0.0,
+        'rowsPerSecond': succeeded / elapsed if elapsed > 0 else 0.0,
+        'results': results,
+    }
+    with open(os.path.join(out_dir, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch EZKL proving over many input rows")
+    parser.add_argument('input', help="CSV or JSONL file of [BTC Vol, ETH Gas, Market Volume] rows")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--out', default='batch_output')
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Force a full setup and re-prove inputs already in the proof store")
+    parser.add_argument('--batch-size', type=int, default=1, help="Input rows covered by each proof")
+    parser.add_argument('--profile', help="Visibility/commitment profile (see profiles.py)")
+    parser.add_argument('--precheck', action='store_true',
+                        help="Reject rows that overflow the calibrated lookup range before proving")
+    parser.add_argument('--trace', help="Record per-stage timing/memory to this file (.json or .jsonl)")
+    args = parser.parse_args()
+    if args.trace:
+        instrumentation.enable(args.trace)
+
+    try:
+        if args.profile:
+            # Environment so the worker processes pick it up too
+            profiles.get_profile(args.profile)
+            os.environ['ZK_PROFILE'] = args.profile
+        rows = read_rows(args.input)
+        if not rows:
+            raise ValueError(f"No input rows in {args.input}")
+
+        gp.ensure_calibration_data()
+        if not gp.setup_circuit(use_cache=not args.no_cache, batch_size=args.batch_size):
+            raise Exception("PK/VK setup failed; cannot batch prove")
+
+        rejected = []
+        if args.precheck:
+            import reference_eval
+            settings = gp.load_settings(gp.circuit_paths(args.batch_size)['settings.json'])
+            rejected = reference_eval.precheck(rows, settings, reference_eval.float_reference(rows))
+            for r in rejected:
+                print(f"  [WARNING] row {r['index']} rejected by pre-check: {r['reason']}")
+
+        summary = batch_prove(rows, args.workers, args.out, use_store=not args.no_cache,
+                              batch_size=args.batch_size, rejected=rejected)
+
+        print("\n" + "=" * 60)
+        print(f"[OK] {summary['succeeded']}/{summary['rows']} rows in {summary['proofs']} proof(s), "
+              f"{summary['elapsedSeconds']:.2f}s ({len(summary['rejected'])} rejected by pre-check)")
+        print(f"     {summary['proofsPerSecond']:.2f} proofs/sec with {summary['workers']} worker(s) "
+              f"({summary['proofsPerSecondPerWorker']:.2f} per worker), {summary['rowsPerSecond']:.2f} rows/sec")
+        print(f"     Summary: {os.path.join(args.out, 'summary.json')}")
+        print("=" * 60)
+        if summary['failed']:
+            sys.exit(1)
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Aggregation benchmark: N single proofs (N on-chain calls) versus one
+aggregated proof (one on-chain call).
+
+For each N it records
+    single:     total witness+prove time for N "single" proofs, verify gas per call
+    aggregated: N "for-aggr" proofs + aggregate time, aggregation keygen time,
+                verify gas of the one aggregated call
+
+Gas is measured against a local EVM node (anvil or `npx hardhat node`): the
+EZKL verifiers are deployed there and eth_estimateGas is run on the EZKL
+calldata, so no testnet funds or network access are needed. Gas is for the
+bare verifier; MonadPriceGuard adds its event/wrapper cost once per call.
+Without a reachable node (--rpc-url) only prove times are recorded.
+
+Results are written to ../public/aggregation-benchmark-data.json.
+
+Usage (from model/):
+    anvil &   # or: npx hardhat node
+    python benchmark_aggregation.py --sizes 1 2 4 8 --rpc-url http://127.0.0.1:8545
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+
+import evm_local
+import generate_proof as gp
+from benchmark_prover import load_calibration_rows
+from workspace import JobWorkspace
+
+# Results file
+results_path = os.path.join('..', 'public', 'aggregation-benchmark-data.json')
+
+# Proofs, calldata and deployment addresses
+bench_dir = os.path.join('bench_output', 'aggregation')
+
+
+def _proof_bytes(proof_file):
+    with open(proof_file, 'r') as f:
+        return (len(gp.proof_to_hex(json.load(f))) - 2) // 2
+
+
+def prove_rows(rows, proof_type, out_dir):
+    """Prove every row; returns (proof files, total seconds)"""
+    os.makedirs(out_dir, exist_ok=True)
+    files = []
+    started = time.perf_counter()
+    for i, row in enumerate(rows):
+        with JobWorkspace() as ws:
+            gp.prove_input(row, ws, proof_type=proof_type)
+            dst = os.path.join(out_dir, f'proof_{i:04d}.json')
+            shutil.move(ws.proof_path, dst)
+        files.append(dst)
+    return files, time.perf_counter() - started
+
+
+def run_size(n, rows, logrows, rpc_url, single_address):
+    """Benchmark N single proofs against one aggregated proof"""
+    batch = [rows[i % len(rows)] for i in range(n)]
+    d = os.path.join(bench_dir, f'n{n}')
+    result = {'numProofs': n}
+
+    single_files, single_s = prove_rows(batch, "single", os.path.join(d, 'single'))
+    result['single'] = {
+        'proveSeconds': single_s,
+        'proofBytes': sum(_proof_bytes(p) for p in single_files),
+    }
+
+    aggr_files, inner_s = prove_rows(batch, "for-aggr", os.path.join(d, 'for-aggr'))
+    # Bypass the keys stamp: a stamp hit would record ~0s as keygen time
+    started = time.perf_counter()
+    gp.setup_aggregate(aggr_files, logrows=logrows, use_cache=False)
+    keygen_s = time.perf_counter() - started
+    aggr_proof = os.path.join(d, 'aggr_proof.json')
+    started = time.perf_counter()
+    gp.aggregate_proofs(aggr_files, aggr_proof, logrows=logrows)
+    aggregate_s = time.perf_counter() - started
+    result['aggregated'] = {
+        'innerProveSeconds': inner_s,
+        'aggregateSeconds': aggregate_s,
+        'proveSeconds': inner_s + aggregate_s,
+        'keygenSeconds': keygen_s,
+        'proofBytes': _proof_bytes(aggr_proof),
+    }
+
+    if rpc_url:
+        gas = evm_local.verify_gas(single_files[0], single_address, rpc_url)
+        result['single'].update(gasPerCall=gas, totalGas=gas * n, gasPerPrediction=gas)
+        gp.ensure_aggr_evm_verifier(n, logrows=logrows)
+        address = evm_local.deploy_verifier(gp.aggr_verifier_sol_path, os.path.join(bench_dir, f'aggr_n{n}.addr'), rpc_url)
+        gas = evm_local.verify_gas(aggr_proof, address, rpc_url)
+        result['aggregated'].update(gasPerCall=gas, totalGas=gas, gasPerPrediction=gas / n)
+    return result
+
+
+def print_row(r):
+    s, a = r['single'], r['aggregated']
+    line = (f"  N={r['numProofs']:>3}  prove single={s['proveSeconds']:.2f}s  "
+            f"aggregated={a['proveSeconds']:.2f}s (aggregate {a['aggregateSeconds']:.2f}s)")
+    if 'totalGas' in s:
+        line += f"  gas single={s['totalGas']}  aggregated={a['totalGas']}"
+    print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Single vs aggregated proof benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 2, 4, 8], help="Proofs per aggregate")
+    parser.add_argument('--aggr-logrows', type=int, default=gp.aggr_logrows)
+    parser.add_argument('--rpc-url', default=evm_local.default_rpc_url, help="Local EVM node for gas")
+    parser.add_argument('--out', default=results_path)
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        gp.ensure_calibration_data()
+        if not gp.setup_circuit():
+            raise Exception("PK/VK setup failed; cannot benchmark real proofs")
+        os.makedirs(bench_dir, exist_ok=True)
+        rows = load_calibration_rows()
+
+        rpc_url = args.rpc_url if evm_local.node_available(args.rpc_url) else None
+        single_address = None
+        if rpc_url:
+            gp.ensure_evm_verifier()
+            single_address = evm_local.deploy_verifier(gp.verifier_paths()[0], os.path.join(bench_dir, 'single.addr'), rpc_url)
+        else:
+            print(f"[WARNING] No EVM node at {args.rpc_url}; recording prove times only")
+
+        results = []
+        for n in args.sizes:
+            r = run_size(n, rows, args.aggr_logrows, rpc_url, single_address)
+            print_row(r)
+            results.append(r)
+
+        with open(args.out, 'w') as f:
+            json.dump({
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'aggrLogrows': args.aggr_logrows,
+                'gasMeasured': rpc_url is not None,
+                'results': results,
+            }, f, indent=2)
+        print(f"\n[OK] Aggregation benchmark results saved to: {args.out}")
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Off-chain proving benchmark (complements scripts/benchmark.js, which only
+measures on-chain gas and confirmation time).
+
+Sweeps logrows, calibration scale, input/output visibility and batch size.
+For every configuration it records keygen, witness, prove and verify time
+(percentiles over repeated runs), proof size, PK/VK size and peak RSS.
+Each configuration runs in a fresh process with its own artifact directory
+under bench_output/, so peak memory is not polluted by earlier configs.
+
+Results are written to ../public/prover-benchmark-data.json, which the
+Benchmark tab (components/BenchmarkChart.tsx) plots next to gas cost.
+
+Usage (from model/):
+    python benchmark_prover.py --runs 5 --scales 2 4 --logrows 0 17 \\
+        --visibility public/public hashed/public --batch-sizes 1 4
+    (logrows 0 = keep whatever calibration picks)
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+from datetime import datetime, timezone
+
+import generate_proof as gp
+import srs_store
+from instrumentation import measure, percentiles
+
+# Results file read by components/BenchmarkChart.tsx
+results_path = os.path.join('..', 'public', 'prover-benchmark-data.json')
+
+# Per-config artifacts
+bench_dir = os.path.join('bench_output')
+
+
+def config_id(config):
+    lr = config['logrows'] or 'auto'
+    return (f"lr{lr}-s{config['scale']}-{config['input_visibility']}-"
+            f"{config['output_visibility']}-b{config['batch_size']}")
+
+
+def load_calibration_rows():
+    """Input vectors from calibration.json (used to build benchmark inputs)"""
+    with open(gp.calibration_json_path, 'r') as f:
+        data = json.load(f)['input_data'][0]
+    return [data[i:i + 3] for i in range(0, len(data) - len(data) % 3, 3)]
+
+
+def batch_input(rows, batch_size):
+    """EZKL input JSON for batch_size rows (flattened [N, 3] tensor)"""
+    flat = []
+    for i in range(batch_size):
+        flat.extend(rows[i % len(rows)])
+    return dict(input_data=[flat])
+
+
+def _file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else None
+
+
+def run_config(config, runs):
+    """
+    Benchmark one configuration end to end (runs in a fresh worker process).
+
+    Returns:
+        Result dict for prover-benchmark-data.json
+    """
+    cid = config_id(config)
+    d = os.path.join(bench_dir, cid)
+    os.makedirs(d, exist_ok=True)
+    settings_file = os.path.join(d, 'settings.json')
+    compiled_file = os.path.join(d, 'network.ezkl')
+    pk_file = os.path.join(d, 'pk.key')
+    vk_file = os.path.join(d, 'vk.key')
+    input_file = os.path.join(d, 'input.json')
+    witness_file = os.path.join(d, 'witness.json')
+    proof_file = os.path.join(d, 'proof.json')
+
+    result = {
+        'config': cid,
+        'logrows': config['logrows'],
+        'scale': config['scale'],
+        'inputVisibility': config['input_visibility'],
+        'outputVisibility': config['output_visibility'],
+        'batchSize': config['batch_size'],
+        'runs': runs,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+    }
+    try:
+        with open(input_file, 'w') as f:
+            json.dump(batch_input(load_calibration_rows(), config['batch_size']), f)
+
+        args = dict(
+            gp.circuit_run_args(config['batch_size']),
+            input_visibility=config['input_visibility'],
+            output_visibility=config['output_visibility'],
+        )
+        gp.ezkl.gen_settings(gp.model_path, settings_file, py_run_args=gp.make_py_run_args(args))
+        gp.calibrate(input_file, settings_file, dict(gp.calibration_args, scales=[config['scale']]))
+        with open(settings_file, 'r') as f:
+            settings = json.load(f)
+        result['calibratedLogrows'] = settings['run_args']['logrows']
+        if config['logrows'] and config['logrows'] < result['calibratedLogrows']:
+            # The circuit does not fit: keygen/prove would only fail opaquely
+            result['skipped'] = (f"logrows {config['logrows']} below calibrated minimum "
+                                 f"{result['calibratedLogrows']}")
+            return result
+        if config['logrows']:
+            settings['run_args']['logrows'] = config['logrows']
+            with open(settings_file, 'w') as f:
+                json.dump(settings, f)
+        result['logrows'] = settings['run_args']['logrows']
+
+        with measure() as m_compile:
+            gp.ezkl.compile_circuit(gp.model_path, compiled_file, settings_file)
+        with measure() as m_srs:
+            srs_file = srs_store.srs_for_settings(settings_file)
+        with measure() as m_keygen:
+            gp.ezkl.setup(compiled_file, vk_file, pk_file, srs_path=srs_file)
+
+        witness_s, prove_s, verify_s, peaks = [], [], [], [m_keygen.peak_rss]
+        for _ in range(runs):
+            with measure() as m:
+                gp.ezkl.gen_witness(input_file, compiled_file, witness_file)
+            witness_s.append(m.wall_s)
+            with measure() as m:
+                gp.ezkl.prove(witness_file, compiled_file, pk_file, proof_file, "single", srs_path=srs_file)
+            prove_s.append(m.wall_s)
+            peaks.append(m.peak_rss)
+            with measure() as m:
+                valid = gp.ezkl.verify(proof_file, settings_file, vk_file, srs_path=srs_file)
+            verify_s.append(m.wall_s)
+            if not valid:
+                raise Exception("Proof failed verification")
+
+        with open(proof_file, 'r') as f:
+            proof_hex = gp.proof_to_hex(json.load(f))
+        result.update({
+            'compileTime': m_compile.wall_s,
+            'srsTime': m_srs.wall_s,
+            'keygenTime': m_keygen.wall_s,
+            'keygenPeakRss': m_keygen.peak_rss,
+            'witnessTime': percentiles(witness_s),
+            'proveTime': percentiles(prove_s),
+            'verifyTime': percentiles(verify_s),
+            'provesPerSecond': config['batch_size'] / percentiles(prove_s)['p50'],
+            'provePerPrediction': percentiles(prove_s)['p50'] / config['batch_size'],
+            'proofSize': (len(proof_hex) - 2) // 2,
+            'pkSize': _file_size(pk_file),
+            'vkSize': _file_size(vk_file),
+            'compiledSize': _file_size(compiled_file),
+            'peakRss': max((p for p in peaks if p), default=None),
+        })
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def sweep(logrows_list, scales, visibilities, batch_sizes):
+    for logrows, scale, vis, batch_size in itertools.product(logrows_list, scales, visibilities, batch_sizes):
+        input_vis, output_vis = vis.split('/')
+        yield {
+            'logrows': logrows or None,
+            'scale': scale,
+            'input_visibility': input_vis,
+            'output_visibility': output_vis,
+            'batch_size': batch_size,
+        }
+
+
+def print_row(r):
+    if 'error' in r:
+        print(f"  [ERROR] {r['config']}: {r['error']}")
+        return
+    if 'skipped' in r:
+        print(f"  [WARNING] {r['config']}: skipped, {r['skipped']}")
+        return
+    peak = f"{r['peakRss'] / 2**20:.0f}MiB" if r['peakRss'] else "n/a"
+    print(f"  [OK] {r['config']}: logrows={r['logrows']} keygen={r['keygenTime']:.2f}s "
+          f"prove p50={r['proveTime']['p50']:.3f}s p90={r['proveTime']['p90']:.3f}s "
+          f"verify p50={r['verifyTime']['p50']:.3f}s proof={r['proofSize']}B "
+          f"pk={r['pkSize']}B peak={peak}")
+
+
+def best_batch_sizes(results, max_logrows=None):
+    """
+    Throughput-optimal batch size per logrows (predictions/sec at p50 prove
+    time), optionally limited to a logrows budget.
+
+    Returns:
+        {logrows: result} for the best configuration at each logrows
+    """
+    best = {}
+    for r in results:
+        if 'error' in r or 'skipped' in r or (max_logrows and r['logrows'] > max_logrows):
+            continue
+        current = best.get(r['logrows'])
+        if current is None or r['provesPerSecond'] > current['provesPerSecond']:
+            best[r['logrows']] = r
+    return dict(sorted(best.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Off-chain EZKL proving benchmark")
+    parser.add_argument('--runs', type=int, default=5, help="Witness/prove/verify repetitions per config")
+    parser.add_argument('--logrows', type=int, nargs='+', default=[0], help="0 = calibrated value")
+    parser.add_argument('--scales', type=int, nargs='+', default=gp.calibration_args['scales'])
+    parser.add_argument('--visibility', nargs='+', default=['public/public'],
+                        help="input/output visibility pairs, e.g. public/public hashed/public private/public")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1])
+    parser.add_argument('--max-logrows', type=int, help="logrows budget for the best batch size report")
+    parser.add_argument('--out', default=results_path)
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        gp.ensure_calibration_data()
+        configs = list(sweep(args.logrows, args.scales, args.visibility, args.batch_sizes))
+        print(f"[EZKL] Benchmarking {len(configs)} configuration(s), {args.runs} run(s) each...")
+
+        results = []
+        for config in configs:
+            # Fresh process per config so peak RSS is per-config
+            with multiprocessing.Pool(1, maxtasksperchild=1) as pool:
+                r = pool.apply(run_config, (config, args.runs))
+            print_row(r)
+            results.append(r)
+
+        if len(args.batch_sizes) > 1:
+            print("\n[EZKL] Throughput by batch size (predictions/sec, p50 prove time):")
+            for r in results:
+                if 'error' not in r and 'skipped' not in r:
+                    print(f"  logrows={r['logrows']:>2} batch={r['batchSize']:>3}: "
+                          f"{r['provesPerSecond']:.2f}/s ({r['provePerPrediction']:.3f}s per prediction)")
+            for logrows, r in best_batch_sizes(results, args.max_logrows).items():
+                print(f"  [BEST] logrows={logrows}: batch size {r['batchSize']} ({r['config']})")
+
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n[OK] Prover benchmark results saved to: {args.out}")
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+On-chain verification benchmark with real proofs on a local node.
+
+scripts/benchmark.js sends a 128-byte all-zero MOCK_PROOF to public
+testnets, so its gas numbers never include verifying a real EZKL proof.
+This benchmark runs fully offline against a local anvil / hardhat node:
+
+    1. setup + prove real proofs for each (profile, batch size) circuit
+    2. compile the generated contracts/Verifier.sol and ../contracts/
+       MonadPriceGuard.sol with the local solc and deploy them, wiring
+       MonadPriceGuard -> EzklVerifierAdapter -> Halo2Verifier (the guard
+       calls verify(uint256[], bytes); EZKL exposes verifyProof(bytes, uint256[]))
+    3. send each proof (EZKL calldata) directly to the verifier and through
+       MonadPriceGuard.verifyPrediction, recording gasUsed from the receipt,
+       calldata bytes and submit-to-receipt latency
+
+Results are written to ../public/verify-gas-benchmark-data.json.
+
+Usage (from model/):
+    anvil --code-size-limit 1000000 &
+    python benchmark_verify_gas.py --profiles default hashed-inputs --batch-sizes 1 4 --runs 5
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+from datetime import datetime, timezone
+
+import evm_local
+import generate_proof as gp
+import profiles
+from benchmark_prover import load_calibration_rows
+from instrumentation import percentiles
+
+# Results file
+results_path = os.path.join('..', 'public', 'verify-gas-benchmark-data.json')
+
+# Proofs and calldata per configuration
+bench_dir = os.path.join('bench_output', 'verify_gas')
+
+# On-chain consumer contracts (repo root contracts/)
+guard_sources = [
+    os.path.join('..', 'contracts', 'MonadPriceGuard.sol'),
+    os.path.join('..', 'contracts', 'EzklVerifierAdapter.sol'),
+]
+
+
+def config_id(profile, batch_size):
+    return f"{profile}-b{batch_size}"
+
+
+def prove_config(profile, batch_size, runs, out_dir):
+    """Setup and prove `runs` distinct batches; returns proof files"""
+    if not gp.setup_circuit(batch_size=batch_size, profile=profile):
+        raise Exception("PK/VK setup failed")
+    rows = load_calibration_rows()
+    os.makedirs(out_dir, exist_ok=True)
+    files = []
+    for i in range(runs):
+        batch = [rows[(i * batch_size + j) % len(rows)] for j in range(batch_size)]
+        with gp.batch_workspace(batch_size, profile=profile) as ws:
+            gp.prove_batch(batch, ws)
+            dst = os.path.join(out_dir, f'proof_{i:04d}.json')
+            shutil.move(ws.proof_path, dst)
+        files.append(dst)
+    return files
+
+
+def run_config(profile, batch_size, runs, rpc_url, guard_contracts):
+    """Deploy the config's verifier + guard and verify every proof on-chain"""
+    cid = config_id(profile, batch_size)
+    d = os.path.join(bench_dir, cid)
+    result = {'config': cid, 'profile': profile, 'batchSize': batch_size, 'runs': runs}
+    try:
+        proof_files = prove_config(profile, batch_size, runs, d)
+        gp.ensure_evm_verifier(profile=profile, batch_size=batch_size)
+        settings = gp.load_settings(gp.circuit_paths(batch_size, profile)['settings.json'])
+
+        verifier = evm_local.deploy_verifier(
+            gp.verifier_paths(profile, batch_size)[0], os.path.join(d, 'verifier.addr'), rpc_url)
+        adapter = evm_local.deploy_contract(
+            rpc_url, guard_contracts['EzklVerifierAdapter']['bin'], evm_local.encode_address(verifier))
+        guard = evm_local.deploy_contract(
+            rpc_url, guard_contracts['MonadPriceGuard']['bin'], evm_local.encode_address(adapter))
+        selector = guard_contracts['MonadPriceGuard']['hashes']['verifyPrediction(uint256[],bytes)']
+
+        direct_gas, guard_gas, direct_s, guard_s = [], [], [], []
+        for proof_file in proof_files:
+            calldata = bytes(gp.ezkl.encode_evm_calldata(proof_file, proof_file + '.calldata'))
+            receipt, seconds = evm_local.send_transaction(rpc_url, '0x' + calldata.hex(), to=verifier)
+            if int(receipt['status'], 16) != 1:
+                raise Exception(f"Verifier rejected {proof_file}")
+            direct_gas.append(int(receipt['gasUsed'], 16))
+            direct_s.append(seconds)
+
+            proof_bytes, instances = evm_local.decode_verify_proof_calldata(calldata)
+            guard_calldata = evm_local.encode_uint_array_and_bytes(selector, instances, proof_bytes)
+            receipt, seconds = evm_local.send_transaction(rpc_url, '0x' + guard_calldata.hex(), to=guard)
+            if int(receipt['status'], 16) != 1:
+                raise Exception(f"MonadPriceGuard.verifyPrediction reverted for {proof_file}")
+            guard_gas.append(int(receipt['gasUsed'], 16))
+            guard_s.append(seconds)
+
+        result.update({
+            'logrows': settings['run_args']['logrows'],
+            'proofBytes': len(proof_bytes),
+            'numInstances': len(instances),
+            'verifierCalldataBytes': len(calldata),
+            'guardCalldataBytes': len(guard_calldata),
+            'verifierGas': percentiles(direct_gas),
+            'guardGas': percentiles(guard_gas),
+            'guardGasPerPrediction': percentiles(guard_gas)['p50'] / batch_size,
+            'verifierLatency': percentiles(direct_s),
+            'guardLatency': percentiles(guard_s),
+        })
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def print_row(r):
+    if 'error' in r:
+        print(f"  [ERROR] {r['config']}: {r['error']}")
+        return
+    print(f"  [OK] {r['config']}: logrows={r['logrows']} proof={r['proofBytes']}B "
+          f"calldata={r['guardCalldataBytes']}B verifier gas p50={r['verifierGas']['p50']:.0f} "
+          f"guard gas p50={r['guardGas']['p50']:.0f} ({r['guardGasPerPrediction']:.0f}/prediction) "
+          f"latency p50={r['guardLatency']['p50'] * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local-chain verify gas benchmark with real EZKL proofs")
+    parser.add_argument('--profiles', nargs='+', default=[profiles.default_profile])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1])
+    parser.add_argument('--runs', type=int, default=5, help="Distinct proofs verified per configuration")
+    parser.add_argument('--rpc-url', default=evm_local.default_rpc_url, help="Local anvil/hardhat node")
+    parser.add_argument('--out', default=results_path)
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        if not evm_local.node_available(args.rpc_url):
+            raise Exception(f"No EVM node at {args.rpc_url}; start one with "
+                            f"'anvil --code-size-limit 1000000' or 'npx hardhat node'")
+        for name in args.profiles:
+            if not profiles.supports_evm(name):
+                raise ValueError(f"Profile '{name}' has no EVM verifier ({profiles.commitment(name).upper()})")
+        gp.ensure_calibration_data()
+        guard_contracts = evm_local.compile_solidity(guard_sources)
+
+        results = []
+        for profile in args.profiles:
+            for batch_size in args.batch_sizes:
+                r = run_config(profile, batch_size, args.runs, args.rpc_url, guard_contracts)
+                print_row(r)
+                results.append(r)
+
+        with open(args.out, 'w') as f:
+            json.dump({
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'chainId': int(evm_local.rpc(args.rpc_url, 'eth_chainId', []), 16),
+                'results': results,
+            }, f, indent=2)
+        print(f"\n[OK] Verify gas benchmark results saved to: {args.out}")
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parallel calibration search: pick the settings with the fewest logrows that
+stay within an accuracy tolerance of the float ONNX model.
+
+Every candidate (scale x lookup_safety_margin) is calibrated and compiled in
+its own worker process against the calibration dataset. The witness outputs
+of each dataset row are compared with the float output of
+../public/network.onnx (onnxruntime, see reference_eval.py), and the winner is:
+
+    fewest logrows among candidates within --tolerance, then lowest error
+
+The dataset is written to calibration.json and the full trade-off table to
+calibration_report.json. generate_proof.py reads the chosen calibration
+args from that report, so the setup run at the end (and every later one)
+rebuilds settings.json, network.ezkl and the PK/VK together under a new
+artifact cache key: the working settings never mix with keys from another
+calibration.
+
+Usage (from model/):
+    python calibrate.py rows.csv --scales 0 1 2 4 6 8 --margins 1 2 --tolerance 0.01 --workers 4
+"""
+
+import argparse
+import itertools
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import generate_proof as gp
+import reference_eval
+from batch_prove import read_rows
+
+# Per-candidate settings/circuits
+calibration_dir = os.path.join('calib_output')
+
+
+def candidate_id(candidate):
+    return f"s{candidate['scales'][0]}-m{candidate['lookup_safety_margin']}"
+
+
+def build_candidate(candidate, data_file, d):
+    """
+    gen_settings + calibrate + compile one candidate into directory d.
+
+    Returns:
+        (settings_file, compiled_file)
+    """
+    os.makedirs(d, exist_ok=True)
+    settings_file = os.path.join(d, 'settings.json')
+    compiled_file = os.path.join(d, 'network.ezkl')
+    gp.ezkl.gen_settings(gp.model_path, settings_file, py_run_args=gp.make_py_run_args(gp.run_args))
+    gp.calibrate(data_file, settings_file, candidate)
+    gp.ezkl.compile_circuit(gp.model_path, compiled_file, settings_file)
+    return settings_file, compiled_file
+
+
+def evaluate_candidate(candidate, data_file, rows, reference):
+    """
+    Worker: calibrate + compile one candidate and measure its output error.
+
+    Returns:
+        Report row dict
+    """
+    cid = candidate_id(candidate)
+    report = {'candidate': cid, 'calibration_args': candidate}
+    try:
+        settings_file, compiled_file = build_candidate(candidate, data_file, os.path.join(calibration_dir, cid))
+        with open(settings_file, 'r') as f:
+            settings = json.load(f)
+
+        errors = reference_eval.error_stats(
+            reference, reference_eval.circuit_outputs(rows, compiled_file, settings_file))
+        if errors['failedRows']:
+            raise Exception(f"gen_witness failed for {errors['failedRows']} row(s)")
+
+        report.update({
+            'logrows': settings['run_args']['logrows'],
+            'num_rows': settings.get('num_rows'),
+            'input_scale': settings['run_args'].get('input_scale'),
+            'param_scale': settings['run_args'].get('param_scale'),
+            'lookup_range': settings['run_args'].get('lookup_range'),
+            'max_abs_error': errors['maxAbsError'],
+            'mean_abs_error': errors['meanAbsError'],
+            'max_rel_error': errors['maxRelError'],
+            'settings': settings_file,
+        })
+    except Exception as e:
+        report['error'] = str(e)
+    return report
+
+
+def choose(reports, tolerance, metric):
+    """Fewest logrows within tolerance, then lowest error"""
+    key = 'max_rel_error' if metric == 'rel' else 'max_abs_error'
+    ok = [r for r in reports if 'error' not in r and r[key] <= tolerance]
+    if not ok:
+        return None
+    return min(ok, key=lambda r: (r['logrows'], r[key], r['candidate']))
+
+
+def search(rows, scales, margins, tolerance, metric, workers):
+    """
+    Evaluate all candidates in parallel and return (chosen, reports).
+    """
+    os.makedirs(calibration_dir, exist_ok=True)
+    data_file = os.path.abspath(os.path.join(calibration_dir, 'calibration.json'))
+    with open(data_file, 'w') as f:
+        json.dump(dict(input_data=[[v for row in rows for v in row]]), f)
+
+    print(f"[EZKL] Float reference for {len(rows)} row(s)...")
+    reference = reference_eval.float_reference(rows)
+
+    candidates = [
+        dict(gp.calibration_args, scales=[scale], lookup_safety_margin=margin)
+        for scale, margin in itertools.product(scales, margins)
+    ]
+    print(f"[EZKL] Evaluating {len(candidates)} candidate(s) on {workers} worker(s)...")
+    reports = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(evaluate_candidate, c, data_file, rows, reference) for c in candidates]
+        for future in as_completed(futures):
+            r = future.result()
+            reports.append(r)
+            if 'error' in r:
+                print(f"  [ERROR] {r['candidate']}: {r['error']}")
+            else:
+                print(f"  {r['candidate']}: logrows={r['logrows']} max_abs={r['max_abs_error']:.6g} "
+                      f"max_rel={r['max_rel_error']:.4%}")
+    reports.sort(key=lambda r: (r.get('logrows', 1 << 30), r['candidate']))
+    return choose(reports, tolerance, metric), reports, data_file
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel EZKL calibration search")
+    parser.add_argument('dataset', nargs='?', help="CSV/JSONL calibration rows (default: calibration.json)")
+    parser.add_argument('--scales', type=int, nargs='+', default=[0, 1, 2, 3, 4, 6, 8])
+    parser.add_argument('--margins', type=int, nargs='+', default=[1, 2],
+                        help="lookup_safety_margin values (lookup range headroom)")
+    parser.add_argument('--tolerance', type=float, default=0.01)
+    parser.add_argument('--metric', choices=['rel', 'abs'], default='rel')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        if args.dataset:
+            rows = read_rows(args.dataset)
+        else:
+            gp.ensure_calibration_data()
+            with open(gp.calibration_json_path, 'r') as f:
+                flat = json.load(f)['input_data'][0]
+            rows = [flat[i:i + 3] for i in range(0, len(flat) - len(flat) % 3, 3)]
+        if not rows:
+            raise ValueError("Calibration dataset is empty")
+
+        chosen, reports, data_file = search(rows, args.scales, args.margins, args.tolerance, args.metric, args.workers)
+        report = {
+            'tolerance': args.tolerance,
+            'metric': args.metric,
+            'rows': len(rows),
+            'chosen': chosen,
+            'candidates': reports,
+        }
+        with open(gp.calibration_report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        if chosen is None:
+            raise Exception(f"No candidate within tolerance {args.tolerance} ({args.metric}); "
+                            f"see {gp.calibration_report_path}")
+
+        shutil.copy(data_file, gp.calibration_json_path)
+        gp.calibration_args.update(chosen['calibration_args'])
+        print(f"\n[EZKL] Setting up the chosen calibration ({chosen['candidate']})...")
+        if not gp.setup_circuit():
+            raise Exception("PK/VK setup failed for the chosen calibration")
+        print("\n" + "=" * 60)
+        print(f"[OK] Chosen {chosen['candidate']}: logrows={chosen['logrows']}, "
+              f"max_rel_error={chosen['max_rel_error']:.4%}, max_abs_error={chosen['max_abs_error']:.6g}")
+        print(f"     Settings/keys: {gp.settings_path}, report: {gp.calibration_report_path}")
+        print("=" * 60)
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
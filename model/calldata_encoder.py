@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bulk proof.json -> ready-to-submit EVM calldata.
+
+Each proof is turned into ABI-encoded calldata for
+
+    guard:    MonadPriceGuard.verifyPrediction(uint256[] instances, bytes proof)
+    verifier: EZKL Halo2Verifier.verifyProof(bytes proof, uint256[] instances)
+
+Instances are decoded from EZKL's field-element encoding (little-endian
+hex, or u64 limbs in older versions) here, so submitters only forward
+bytes: no JSON parsing or field conversion on the submission path. The
+encoding is plain Python (no ezkl call per proof); --check compares it
+against ezkl.encode_evm_calldata.
+
+Output directory:
+    calldata.bin      calldata blobs back to back (--format bin, default)
+    calldata.hex      one 0x-prefixed calldata per line (--format hex)
+    index.jsonl       {"i", "source", "offset", "length", "instances"} per proof
+                      (offset = byte offset in .bin / line number in .hex)
+    summary.json      counts + encode throughput
+
+JSON files that are not proofs (no proof/hex_proof/instances key, e.g. the
+summary.json or settings of an output directory) are counted as skipped,
+not failed.
+
+Usage (from model/):
+    python calldata_encoder.py batch_output/proofs --out calldata_output
+    cat proofs.jsonl | python calldata_encoder.py - --format hex   # one proof.json per line
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import evm_local
+import generate_proof as gp
+from instrumentation import percentiles
+
+# Function selectors (solc methodIdentifiers; see artifacts/build-info)
+selectors = {
+    'guard': '795297ff',     # verifyPrediction(uint256[],bytes)
+    'verifier': '1e8e1e13',  # verifyProof(bytes,uint256[])
+}
+
+# BN254 scalar field modulus (instances must be reduced field elements)
+field_modulus = 21888242871839275222246405745257275088548364400416034343698204186575808495617
+
+# Proofs per worker task
+chunk_size = 256
+
+
+def felt_to_int(felt):
+    """Integer value of an EZKL field element (little-endian hex string or u64 limbs)"""
+    if isinstance(felt, str):
+        value = int.from_bytes(bytes.fromhex(felt.removeprefix('0x')), 'little')
+    elif isinstance(felt, list):
+        value = sum(int(limb) << (64 * i) for i, limb in enumerate(felt))
+    else:
+        value = int(felt)
+    if not 0 <= value < field_modulus:
+        raise ValueError(f"Instance {felt!r} is not a reduced field element")
+    return value
+
+
+def is_proof(obj):
+    """Whether parsed JSON looks like a proof.json dict or a stored proof entry"""
+    return isinstance(obj, dict) and any(k in obj for k in ('proof', 'hex_proof', 'instances'))
+
+
+def proof_instances(proof):
+    """Flattened public instances of a proof.json dict as integers"""
+    return [felt_to_int(v) for row in proof.get('instances', []) for v in row]
+
+
+def encode_proof(proof, target='guard'):
+    """
+    ABI-encoded calldata for one proof.json dict.
+
+    Args:
+        target: 'guard' (MonadPriceGuard.verifyPrediction) or 'verifier' (verifyProof)
+    """
+    data = bytes.fromhex(gp.proof_to_hex(proof)[2:])
+    instances = proof_instances(proof)
+    if target == 'guard':
+        return evm_local.encode_uint_array_and_bytes(selectors['guard'], instances, data)
+    return evm_local.encode_bytes_and_uint_array(selectors['verifier'], data, instances)
+
+
+def write_calldata(proof_file, out_file, target='guard'):
+    """Encode one proof.json file to a raw calldata file; returns the calldata"""
+    with open(proof_file, 'r') as f:
+        calldata = encode_proof(json.load(f), target)
+    with open(out_file, 'wb') as f:
+        f.write(calldata)
+    return calldata
+
+
+def _encode_chunk(items, target):
+    """
+    Worker: [(source, proof.json text or path)] -> [(source, calldata, instances, seconds, error)]
+
+    calldata and error are both None for a skipped non-proof file.
+    """
+    out = []
+    for source, text in items:
+        started = time.perf_counter()
+        try:
+            if text is None:
+                with open(source, 'r') as f:
+                    text = f.read()
+            proof = json.loads(text)
+            if not is_proof(proof):
+                out.append((source, None, 0, time.perf_counter() - started, None))
+                continue
+            calldata = encode_proof(proof, target)
+            out.append((source, calldata, sum(len(row) for row in proof.get('instances', [])),
+                        time.perf_counter() - started, None))
+        except Exception as e:
+            out.append((source, None, 0, time.perf_counter() - started, str(e)))
+    return out
+
+
+def iter_proofs(source):
+    """(name, proof text or None) for a directory, glob, single file or '-' (JSONL on stdin)"""
+    if source == '-':
+        for n, line in enumerate(sys.stdin):
+            if line.strip():
+                yield f"stdin:{n + 1}", line
+        return
+    if os.path.isdir(source):
+        paths = sorted(glob.glob(os.path.join(source, '**', '*.json'), recursive=True))
+    elif os.path.isfile(source):
+        paths = [source]
+    else:
+        paths = sorted(glob.glob(source))
+    for path in paths:
+        yield path, None
+
+
+def chunked(iterable, size):
+    """Lists of up to size items from an iterable, read lazily"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def bounded_map(pool, fn, iterable, window, *args):
+    """
+    Like pool.map(fn, iterable, ...) in order, but with at most window tasks
+    in flight: the iterable (e.g. stdin) is only read as results are consumed.
+    """
+    pending = deque()
+    for item in iterable:
+        pending.append(pool.submit(fn, item, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def encode_bulk(source, out_dir, fmt='bin', target='guard', workers=1):
+    """
+    Encode every proof of a source into one calldata file + index.
+
+    Returns:
+        Summary dict (also written to <out_dir>/summary.json)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    data_path = os.path.join(out_dir, f'calldata.{fmt}')
+    started = time.perf_counter()
+    encoded = failed = skipped = total_bytes = 0
+    encode_s = []
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        chunks = chunked(iter_proofs(source), chunk_size)
+        if pool is None:
+            results = (_encode_chunk(chunk, target) for chunk in chunks)
+        else:
+            results = bounded_map(pool, _encode_chunk, chunks, 2 * workers, target)
+        with open(data_path, 'wb' if fmt == 'bin' else 'w') as data, \
+                open(os.path.join(out_dir, 'index.jsonl'), 'w') as index:
+            for chunk in results:
+                for name, calldata, instances, seconds, error in chunk:
+                    if calldata is None and error is None:
+                        skipped += 1
+                        continue
+                    encode_s.append(seconds)
+                    if error is not None:
+                        failed += 1
+                        print(f"  [ERROR] {name}: {error}")
+                        continue
+                    entry = {'i': encoded, 'source': name, 'length': len(calldata), 'instances': instances}
+                    if fmt == 'bin':
+                        entry['offset'] = total_bytes
+                        data.write(calldata)
+                    else:
+                        entry['offset'] = encoded
+                        data.write('0x' + calldata.hex() + '\n')
+                    index.write(json.dumps(entry) + '\n')
+                    encoded += 1
+                    total_bytes += len(calldata)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    elapsed = time.perf_counter() - started
+
+    summary = {
+        'source': source,
+        'target': target,
+        'format': fmt,
+        'encoded': encoded,
+        'failed': failed,
+        'skipped': skipped,
+        'calldataBytes': total_bytes,
+        'meanCalldataBytes': total_bytes / encoded if encoded else 0,
+        'elapsedSeconds': elapsed,
+        'proofsPerSecond': encoded / elapsed if elapsed > 0 else 0.0,
+        'megabytesPerSecond': total_bytes / elapsed / 1e6 if elapsed > 0 else 0.0,
+        'encodeTime': percentiles(encode_s),
+        'workers': workers,
+    }
+    with open(os.path.join(out_dir, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def check_against_ezkl(source, limit=5):
+    """Compare verifyProof calldata with ezkl.encode_evm_calldata on the first proof files"""
+    import tempfile
+    checked = 0
+    for path, _ in iter_proofs(source):
+        if checked >= limit:
+            break
+        with open(path, 'r') as f:
+            proof = json.load(f)
+        if not is_proof(proof):
+            continue
+        ours = encode_proof(proof, 'verifier')
+        with tempfile.TemporaryDirectory() as d:
+            theirs = bytes(gp.ezkl.encode_evm_calldata(path, os.path.join(d, 'calldata')))
+        if ours != theirs:
+            raise Exception(f"Calldata mismatch with ezkl.encode_evm_calldata for {path}")
+        checked += 1
+    return checked
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk proof.json -> EVM calldata encoder")
+    parser.add_argument('source', help="Directory or glob of proof.json files, a single file, or '-' for JSONL on stdin")
+    parser.add_argument('--out', default='calldata_output')
+    parser.add_argument('--format', choices=['bin', 'hex'], default='bin')
+    parser.add_argument('--target', choices=sorted(selectors), default='guard',
+                        help="guard = MonadPriceGuard.verifyPrediction, verifier = EZKL verifyProof")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--check', action='store_true', help="Cross-check a few proofs against ezkl")
+    args = parser.parse_args()
+
+    try:
+        if args.check and args.source != '-':
+            print(f"[OK] {check_against_ezkl(args.source)} proof(s) match ezkl.encode_evm_calldata")
+        summary = encode_bulk(args.source, args.out, args.format, args.target, args.workers)
+        print("\n" + "=" * 60)
+        print(f"[OK] {summary['encoded']} proof(s) encoded ({summary['failed']} failed, "
+              f"{summary['skipped']} non-proof file(s) skipped), "
+              f"{summary['calldataBytes']} calldata bytes")
+        print(f"     {summary['proofsPerSecond']:.0f} proofs/sec, {summary['megabytesPerSecond']:.1f} MB/s "
+              f"with {summary['workers']} worker(s)")
+        print(f"     Output: {os.path.join(args.out, 'calldata.' + args.format)} + index.jsonl")
+        print("=" * 60)
+        if summary['failed']:
+            sys.exit(1)
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compare visibility/commitment profiles (profiles.py) on the same inputs.
+
+For every profile: setup (artifact cache aware, artifacts under
+profiles/<name>/), then witness + prove + verify over the calibration rows,
+recording prove latency percentiles, proof bytes, number of public
+instances, PK/VK size and, when a local EVM node is reachable, verify gas
+of the profile's EZKL verifier (see evm_local.py). Each profile runs in a
+fresh process so peak RSS is per profile.
+
+Results are written to ../public/profile-comparison.json.
+
+Usage (from model/):
+    anvil &   # optional, for gas
+    python compare_profiles.py --profiles default hashed-inputs private-inputs --runs 5
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+from datetime import datetime, timezone
+
+import evm_local
+import generate_proof as gp
+import profiles
+from benchmark_prover import load_calibration_rows
+from instrumentation import measure, percentiles
+
+# Results file
+results_path = os.path.join('..', 'public', 'profile-comparison.json')
+
+# Proofs, calldata and deployment addresses
+compare_dir = os.path.join('bench_output', 'profiles')
+
+
+def _file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else None
+
+
+def run_profile(profile, runs, rpc_url):
+    """
+    Benchmark one profile end to end (runs in a fresh worker process).
+
+    Returns:
+        Result dict for profile-comparison.json
+    """
+    result = {
+        'profile': profile,
+        'runArgs': gp.circuit_run_args(profile=profile),
+        'commitment': profiles.commitment(profile),
+        'runs': runs,
+    }
+    try:
+        with measure() as m_setup:
+            if not gp.setup_circuit(profile=profile):
+                raise Exception("PK/VK setup failed")
+        paths = gp.circuit_paths(profile=profile)
+        rows = load_calibration_rows()
+        d = os.path.join(compare_dir, profile)
+        os.makedirs(d, exist_ok=True)
+        proof_file = os.path.join(d, 'proof.json')
+
+        prove_s, verify_s, peaks = [], [], []
+        for i in range(runs):
+            with gp.batch_workspace(1, profile=profile) as ws:
+                with measure() as m:
+                    gp.prove_input(rows[i % len(rows)], ws)
+                prove_s.append(m.wall_s)
+                peaks.append(m.peak_rss)
+                with measure() as m:
+                    valid = gp.ezkl.verify(ws.proof_path, ws.settings_path, ws.vk_path, srs_path=ws.srs_path)
+                verify_s.append(m.wall_s)
+                if not valid:
+                    raise Exception("Proof failed verification")
+                shutil.copy(ws.proof_path, proof_file)
+
+        with open(proof_file, 'r') as f:
+            proof = json.load(f)
+        settings = gp.load_settings(paths['settings.json'])
+        result.update({
+            'logrows': settings['run_args']['logrows'],
+            'setupTime': m_setup.wall_s,
+            'proveTime': percentiles(prove_s),
+            'verifyTime': percentiles(verify_s),
+            'proofSize': (len(gp.proof_to_hex(proof)) - 2) // 2,
+            'numInstances': sum(len(row) for row in proof.get('instances', [])),
+            'pkSize': _file_size(paths['pk.key']),
+            'vkSize': _file_size(paths['vk.key']),
+            'peakRss': max(p for p in peaks if p),
+            'verifyGas': None,
+        })
+
+        if rpc_url and profiles.supports_evm(profile):
+            gp.ensure_evm_verifier(profile=profile)
+            address = evm_local.deploy_verifier(
+                gp.verifier_paths(profile)[0], os.path.join(d, 'verifier.addr'), rpc_url)
+            result['verifyGas'] = evm_local.verify_gas(proof_file, address, rpc_url)
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def print_table(results):
+    print(f"\n  {'profile':<20} {'logrows':>7} {'prove p50':>10} {'proof B':>8} {'inst':>5} {'verify gas':>11}")
+    for r in results:
+        if 'error' in r:
+            print(f"  {r['profile']:<20} [ERROR] {r['error']}")
+            continue
+        gas = r['verifyGas'] if r['verifyGas'] is not None else '-'
+        print(f"  {r['profile']:<20} {r['logrows']:>7} {r['proveTime']['p50']:>9.3f}s "
+              f"{r['proofSize']:>8} {r['numInstances']:>5} {gas:>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare visibility/commitment profiles")
+    parser.add_argument('--profiles', nargs='+', help="Profile names (default: all)")
+    parser.add_argument('--runs', type=int, default=5, help="Prove/verify repetitions per profile")
+    parser.add_argument('--rpc-url', default=evm_local.default_rpc_url, help="Local EVM node for gas")
+    parser.add_argument('--out', default=results_path)
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        gp.ensure_calibration_data()
+        names = args.profiles or list(profiles.load_profiles())
+        for name in names:
+            profiles.get_profile(name)
+        rpc_url = args.rpc_url if evm_local.node_available(args.rpc_url) else None
+        if rpc_url is None:
+            print(f"[WARNING] No EVM node at {args.rpc_url}; verify gas not measured")
+
+        results = []
+        for name in names:
+            print(f"[EZKL] Profile {name}...")
+            # Fresh process per profile so peak RSS is per-profile
+            with multiprocessing.Pool(1, maxtasksperchild=1) as pool:
+                results.append(pool.apply(run_profile, (name, args.runs, rpc_url)))
+        print_table(results)
+
+        with open(args.out, 'w') as f:
+            json.dump({
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'gasMeasured': rpc_url is not None,
+                'results': results,
+            }, f, indent=2)
+        print(f"\n[OK] Profile comparison saved to: {args.out}")
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
@@ -1,11 +1,35 @@
 #!/usr/bin/env python3
 """
 Helper script to copy ZK artifacts to public/ folder for frontend access
+
+The sync is incremental: each artifact is hashed and only re-published when
+its content changed. Publishing is atomic (write to a temp file in public/,
+then rename), so the frontend never sees a half-written pk.key. Alongside
+each artifact a precompressed .gz (and .zst when the `zstandard` package is
+installed) is written, and public/artifacts-manifest.json lists the sha256,
+size and compressed variants of every artifact. Clients cache artifacts by
+hash and only re-fetch when the manifest changes.
+
+Usage (from model/):
+    python copy_artifacts.py            # sync changed artifacts
+    python copy_artifacts.py --force    # re-publish everything
+    python copy_artifacts.py --link     # hardlink instead of copy (same filesystem)
 """
 
+import argparse
+import gzip
+import hashlib
+import json
 import os
 import shutil
 
+from proof_store import file_hash
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 # Files to copy
 artifacts = [
     'settings.json',
@@ -17,33 +41,148 @@ artifacts = [
 # Source and destination
 source_dir = os.path.dirname(__file__)
 dest_dir = os.path.join(source_dir, '..', 'public')
+manifest_name = 'artifacts-manifest.json'
+
+# Compression levels for the precompressed variants
+gzip_level = 9
+zstd_level = 19
+
+
+def load_manifest():
+    path = os.path.join(dest_dir, manifest_name)
+    if not os.path.exists(path):
+        return {'artifacts': {}}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _write_manifest(manifest):
+    path = os.path.join(dest_dir, manifest_name)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _publish(src, dst, link=False):
+    """Atomically place src at dst (hardlink if requested and possible, else copy)"""
+    tmp = f"{dst}.tmp{os.getpid()}"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    if link:
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copy2(src, tmp)
+    else:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+def _compress(src, dst, encoding):
+    """Write a compressed variant of src to dst atomically; returns its size"""
+    tmp = f"{dst}.tmp{os.getpid()}"
+    with open(src, 'rb') as fin:
+        if encoding == 'gzip':
+            # mtime=0 keeps the output byte-identical for identical input
+            with open(tmp, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb',
+                                                       compresslevel=gzip_level, mtime=0) as fout:
+                shutil.copyfileobj(fin, fout, 1024 * 1024)
+        else:
+            with open(tmp, 'wb') as fout:
+                zstandard.ZstdCompressor(level=zstd_level).copy_stream(fin, fout)
+    os.replace(tmp, dst)
+    return os.path.getsize(dst)
+
+
+def _encodings():
+    encodings = {'gzip': '.gz'}
+    if zstandard is not None:
+        encodings['zstd'] = '.zst'
+    return encodings
+
+def _up_to_date(name, digest, entry):
+    """True if public/ already holds this exact artifact and all its variants"""
+    if not entry or entry.get('sha256') != digest:
+        return False
+    dst = os.path.join(dest_dir, name)
+    if not os.path.exists(dst) or os.path.getsize(dst) != entry['size']:
+        return False
+    variants = entry.get('encodings', {})
+    for encoding in _encodings():
+        variant = variants.get(encoding)
+        if not variant or not os.path.exists(os.path.join(dest_dir, variant['file'])):
+            return False
+    return True
 
-def copy_artifacts():
-    """Copy ZK artifacts to public folder"""
+
+def manifest_version(entries):
+    """Stable digest over the per-artifact hashes"""
+    h = hashlib.sha256()
+    for name in sorted(entries):
+        h.update(f"{name}:{entries[name]['sha256']}\n".encode('utf-8'))
+    return h.hexdigest()
+
+
+def copy_artifacts(force=False, link=False):
+    """Copy changed ZK artifacts to public folder and refresh the manifest"""
     os.makedirs(dest_dir, exist_ok=True)
-    
+    manifest = load_manifest()
+    entries = manifest.setdefault('artifacts', {})
+
     copied = []
+    unchanged = []
     missing = []
-    
+
     for artifact in artifacts:
         src = os.path.join(source_dir, artifact)
         dst = os.path.join(dest_dir, artifact)
-        
-        if os.path.exists(src):
-            shutil.copy2(src, dst)
-            copied.append(artifact)
-            print(f"✓ Copied {artifact} → public/{artifact}")
-        else:
+
+        if not os.path.exists(src):
             missing.append(artifact)
             print(f"✗ Missing: {artifact}")
-    
+            continue
+
+        digest = file_hash(src)
+        if not force and _up_to_date(artifact, digest, entries.get(artifact)):
+            unchanged.append(artifact)
+            print(f"= Unchanged {artifact} ({digest[:12]})")
+            continue
+
+        _publish(src, dst, link=link)
+        entry = {'sha256': digest, 'size': os.path.getsize(dst), 'encodings': {}}
+        for encoding, suffix in _encodings().items():
+            size = _compress(dst, dst + suffix, encoding)
+            entry['encodings'][encoding] = {'file': artifact + suffix, 'size': size}
+        entries[artifact] = entry
+        copied.append(artifact)
+        sizes = ", ".join(f"{e} {v['size']}" for e, v in entry['encodings'].items())
+        print(f"✓ Copied {artifact} → public/{artifact} ({entry['size']} bytes; {sizes})")
+
+    # Clients must not look up artifacts this run did not publish
+    for name in [n for n in entries if n in missing or n not in artifacts]:
+        del entries[name]
+
+    # The manifest hash changes whenever any artifact does: one cheap check for clients
+    manifest['version'] = manifest_version(entries)
+    _write_manifest(manifest)
+
     print("\n" + "=" * 60)
     if copied:
         print(f"✓ Successfully copied {len(copied)} file(s) to public/")
+    if unchanged:
+        print(f"= {len(unchanged)} file(s) unchanged, skipped")
+    if zstandard is None:
+        print("ℹ zstandard not installed; only .gz variants written (pip install zstandard)")
     if missing:
-        print(f"⚠ Missing {len(missing)} file(s). Run generate_proof.py first.")
+        print(f"⚠ Missing {len(missing)} file(s), left out of the manifest. Run generate_proof.py first.")
+    print(f"  Manifest: public/{manifest_name} (version {manifest['version'][:12]})")
     print("=" * 60)
 
-if __name__ == "__main__":
-    copy_artifacts()
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync ZK artifacts to public/")
+    parser.add_argument('--force', action='store_true', help="Re-publish even if unchanged")
+    parser.add_argument('--link', action='store_true',
+                        help="Hardlink instead of copy. Only safe if artifacts are replaced, "
+                             "never rewritten in place, after publishing")
+    args = parser.parse_args()
+    copy_artifacts(force=args.force, link=args.link)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Minimal helpers for measuring verifier gas on a local EVM node (anvil or
+`npx hardhat node`) over plain JSON-RPC, with no web3 dependency.
+
+Contracts are compiled with the local solc binary (SOLC overrides the
+path) and deployed from the node's unlocked dev account, so nothing needs
+network access. EZKL verifiers exceed the 24 KiB EIP-170 code size limit
+for larger circuits; start the node without it:
+
+    anvil --code-size-limit 1000000
+    (hardhat: networks.hardhat.allowUnlimitedContractSize = true)
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import time
+import urllib.request
+
+# Default local node (anvil / hardhat node)
+default_rpc_url = 'http://127.0.0.1:8545'
+
+# solc binary (must already be installed: compilation never downloads)
+solc_binary = os.environ.get('SOLC', 'solc')
+
+# Gas limit for deployments and benchmark transactions
+tx_gas_limit = 30_000_000
+
+
+def rpc(rpc_url, method, params):
+    body = json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params}).encode('utf-8')
+    request = urllib.request.Request(rpc_url, body, {'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        reply = json.load(response)
+    if 'error' in reply:
+        raise Exception(f"{method}: {reply['error'].get('message', reply['error'])}")
+    return reply['result']
+
+def node_available(rpc_url):
+    try:
+        rpc(rpc_url, 'eth_chainId', [])
+        return True
+    except Exception:
+        return False
+
+def _sender(rpc_url):
+    accounts = rpc(rpc_url, 'eth_accounts', [])
+    if not accounts:
+        raise Exception(f"{rpc_url} has no unlocked accounts (use anvil or `npx hardhat node`)")
+    return accounts[0]
+
+
+def compile_solidity(sources, optimize_runs=200):
+    """
+    Compile Solidity files with the local solc.
+
+    Returns:
+        {contract name: {'abi': [...], 'bin': hex, 'hashes': {signature: selector}}}
+    """
+    solc = shutil.which(solc_binary)
+    if solc is None:
+        raise Exception(f"solc not found ('{solc_binary}'); install it once (e.g. solc-select, "
+                        f"apt/brew) or set SOLC=/path/to/solc")
+    base_path = os.path.commonpath([os.path.dirname(os.path.abspath(s)) for s in sources])
+    result = subprocess.run(
+        [solc, '--combined-json', 'abi,bin,hashes', '--optimize', '--optimize-runs', str(optimize_runs),
+         '--base-path', base_path, *[os.path.abspath(s) for s in sources]],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise Exception(f"solc failed: {result.stderr.strip()}")
+    contracts = {}
+    for key, out in json.loads(result.stdout)['contracts'].items():
+        abi = out['abi']
+        contracts[key.rsplit(':', 1)[-1]] = {
+            'abi': json.loads(abi) if isinstance(abi, str) else abi,
+            'bin': out['bin'],
+            'hashes': out.get('hashes', {}),
+        }
+    return contracts
+
+
+def send_transaction(rpc_url, data, to=None):
+    """
+    Send a transaction from the dev account and wait for its receipt.
+
+    Returns:
+        (receipt, seconds from submission to receipt)
+    """
+    tx = {'from': _sender(rpc_url), 'data': data, 'gas': hex(tx_gas_limit)}
+    if to is not None:
+        tx['to'] = to
+    started = time.perf_counter()
+    tx_hash = rpc(rpc_url, 'eth_sendTransaction', [tx])
+    while True:
+        receipt = rpc(rpc_url, 'eth_getTransactionReceipt', [tx_hash])
+        if receipt is not None:
+            return receipt, time.perf_counter() - started
+        time.sleep(0.01)
+
+def deploy_contract(rpc_url, bytecode, constructor_args=b''):
+    """Deploy creation bytecode (+ ABI-encoded constructor args); returns the address"""
+    data = '0x' + bytecode.removeprefix('0x') + constructor_args.hex()
+    receipt, _ = send_transaction(rpc_url, data)
+    if int(receipt['status'], 16) != 1 or not receipt.get('contractAddress'):
+        raise Exception("Deployment reverted (contract over the code size limit? see evm_local.py)")
+    return receipt['contractAddress']
+
+
+def deploy_verifier(sol_path, addr_file, rpc_url):
+    """
+    Compile and deploy an EZKL-generated verifier to the local node.
+
+    Returns:
+        Verifier address (also written to addr_file)
+    """
+    contracts = compile_solidity([sol_path])
+    # The generated file may contain helper contracts; the verifier is the largest
+    name = max(contracts, key=lambda n: len(contracts[n]['bin']))
+    address = deploy_contract(rpc_url, contracts[name]['bin'])
+    os.makedirs(os.path.dirname(os.path.abspath(addr_file)), exist_ok=True)
+    with open(addr_file, 'w') as f:
+        f.write(address)
+    return address
+
+def verify_gas(proof_file, address, rpc_url):
+    """eth_estimateGas of verifying proof_file against the deployed verifier"""
+    import ezkl
+    calldata = ezkl.encode_evm_calldata(proof_file, proof_file + '.calldata')
+    gas = rpc(rpc_url, 'eth_estimateGas', [{'from': _sender(rpc_url), 'to': address,
+                                            'data': '0x' + bytes(calldata).hex()}])
+    return int(gas, 16)
+
+
+# ABI encoding (just enough for uint256[]/bytes arguments)
+
+def encode_address(address):
+    return bytes(12) + bytes.fromhex(address.removeprefix('0x'))
+
+def _word(value):
+    return int(value).to_bytes(32, 'big')
+
+def _read_word(data, offset):
+    return int.from_bytes(data[offset:offset + 32], 'big')
+
+def decode_verify_proof_calldata(calldata):
+    """
+    Split EZKL verifyProof(bytes proof, uint256[] instances) calldata.
+
+    Returns:
+        (proof bytes, list of instance ints)
+    """
+    args = bytes(calldata)[4:]
+    proof_offset, instances_offset = _read_word(args, 0), _read_word(args, 32)
+    proof_len = _read_word(args, proof_offset)
+    proof = args[proof_offset + 32:proof_offset + 32 + proof_len]
+    count = _read_word(args, instances_offset)
+    instances = [_read_word(args, instances_offset + 32 * (i + 1)) for i in range(count)]
+    return proof, instances
+
+def encode_uint_array_and_bytes(selector, values, data):
+    """Calldata for f(uint256[] values, bytes data), e.g. MonadPriceGuard.verifyPrediction"""
+    array = _word(len(values)) + b''.join(_word(v) for v in values)
+    padded = data + bytes(-len(data) % 32)
+    head = _word(64) + _word(64 + len(array))
+    return bytes.fromhex(selector.removeprefix('0x')) + head + array + _word(len(data)) + padded
+
+def encode_bytes_and_uint_array(selector, data, values):
+    """Calldata for f(bytes data, uint256[] values), e.g. the EZKL verifyProof"""
+    padded = _word(len(data)) + data + bytes(-len(data) % 32)
+    head = _word(64) + _word(64 + len(padded))
+    array = _word(len(values)) + b''.join(_word(v) for v in values)
+    return bytes.fromhex(selector.removeprefix('0x')) + head + padded + array
@@ -35,18 +35,15 @@ except ImportError:
 import os
 import json
 import sys
-import asyncio
+import shutil
 
-# Helper function for async SRS loading
-async def _get_srs_async_wrapper(settings_path, srs_file):
-    """Wrapper to load SRS in async context"""
-    try:
-        if hasattr(ezkl, 'get_srs_async'):
-            await ezkl.get_srs_async(settings_path)
-        else:
-            ezkl.get_srs(settings_path, srs_path=srs_file)
-    except:
-        ezkl.get_srs(settings_path, srs_path=srs_file)
+import artifact_cache
+import instrumentation
+import model_registry
+import profiles
+import proof_store
+import srs_store
+from workspace import JobWorkspace
 
 # Helper function to setup with explicit SRS path
 def _setup_with_srs_path(compiled_model_path, vk_path, pk_path, srs_file):
@@ -102,264 +99,337 @@ settings_path = os.path.join('settings.json')
 witness_path = os.path.join('witness.json')
 proof_path = os.path.join('proof.json')
 input_json_path = os.path.join('input.json')
+calibration_json_path = os.path.join('calibration.json')
+
+# EVM verifier outputs, plus the VK/settings hashes they were generated from
+verifier_sol_path = os.path.join('contracts', 'Verifier.sol')
+verifier_abi_path = os.path.join('contracts', 'Verifier.abi')
+verifier_stamp_path = os.path.join('contracts', 'verifier.stamp.json')
+
+# Aggregation: one proof (and one on-chain call) for many single proofs.
+# The aggregation circuit is much larger than the model circuit, so it has
+# its own keys and logrows; its keys depend only on the inner VK and the
+# number of aggregated proofs.
+aggr_dir = os.path.join('aggr')
+aggr_logrows = 23
+aggr_pk_path = os.path.join(aggr_dir, 'aggr_pk.key')
+aggr_vk_path = os.path.join(aggr_dir, 'aggr_vk.key')
+aggr_proof_path = os.path.join(aggr_dir, 'aggr_proof.json')
+aggr_stamp_path = os.path.join(aggr_dir, 'aggr_keys.stamp.json')
+aggr_verifier_sol_path = os.path.join('contracts', 'AggregateVerifier.sol')
+aggr_verifier_abi_path = os.path.join('contracts', 'AggregateVerifier.abi')
+aggr_verifier_stamp_path = os.path.join('contracts', 'aggregate_verifier.stamp.json')
+
+# Setup artifacts, keyed by name for artifact_cache
+setup_artifact_paths = {
+    'settings.json': settings_path,
+    'network.ezkl': compiled_model_path,
+    'pk.key': pk_path,
+    'vk.key': vk_path,
+}
+
+# Batched circuits (one proof covers N input rows) are compiled with the ONNX
+# batch_size dimension fixed to N and kept under batches/b<N>/
+batches_dir = os.path.join('batches')
+
+# Run args for gen_settings (PyRunArgs fields)
+run_args = {
+    'input_visibility': 'public',
+    'output_visibility': 'public',
+    'param_visibility': 'fixed',
+}
 
-def generate_proof(input_data=None):
+# Parameters for calibrate_settings
+calibration_args = {
+    'target': 'resources',
+    'scales': [2],
+}
+
+# Winning candidate of a calibrate.py search, if any, overrides the defaults
+calibration_report_path = os.path.join('calibration_report.json')
+if os.path.exists(calibration_report_path):
+    with open(calibration_report_path, 'r') as f:
+        calibration_args.update((json.load(f).get('chosen') or {}).get('calibration_args', {}))
+
+def circuit_paths(batch_size=1, profile=None, model=None):
     """
-    Generate ZK proof from ONNX model.
+    Setup artifact paths for a batch size, profile and registered model.
+    
+    Batch size 1 under the default profile is the original layout; other
+    profiles live under profiles/<name>/ and batched circuits under
+    [profiles/<name>/]batches/b<N>/. Registered models (model_registry.py)
+    use the same layout under models/<id>/.
+    """
+    profile = profile or profiles.active_profile()
+    if batch_size == 1 and profile == profiles.default_profile and model is None:
+        return dict(setup_artifact_paths)
+    d = profiles.profile_dir(profile)
+    if model is not None:
+        d = os.path.join(model_registry.model_dir(model), d)
+    if batch_size != 1:
+        d = os.path.join(d, batches_dir, f'b{batch_size}')
+    return {name: os.path.normpath(os.path.join(d, name)) for name in setup_artifact_paths}
+
+def onnx_model_path(model=None):
+    """ONNX file of a registered model, or the default ../public/network.onnx"""
+    return model_registry.onnx_path(model) if model is not None else model_path
+
+def circuit_run_args(batch_size=1, profile=None):
+    """run_args with the profile's overrides and the ONNX batch_size dimension fixed"""
+    args = dict(run_args, **profiles.get_profile(profile))
+    if batch_size != 1:
+        args['variables'] = [('batch_size', batch_size)]
+    return args
+
+def model_calibration_path(model=None):
+    """
+    Calibration inputs for a registered model: its own calibration.json
+    (model_registry.py --calibration) or, failing that, the shared one.
+    """
+    if model is not None:
+        path = model_registry.calibration_path(model)
+        if os.path.exists(path):
+            return path
+        print(f"[WARNING] Model {model} has no calibration data of its own; using {calibration_json_path} "
+              f"(set one with model_registry.py setup {model} --calibration FILE)")
+    return calibration_json_path
+
+def batch_calibration_data(batch_size=1, model=None):
+    """
+    Calibration data for a batched circuit: calibration.json rows tiled to
+    a whole number of batches. Only rewritten when the content changes so
+    the artifact cache key stays stable.
+    """
+    source = model_calibration_path(model)
+    if batch_size == 1:
+        return source
+    with open(source, 'r') as f:
+        flat = json.load(f)['input_data'][0]
+    rows = [flat[i:i + 3] for i in range(0, len(flat) - len(flat) % 3, 3)]
+    if not rows:
+        raise ValueError(f"{source} has no input rows")
+    count = -(-len(rows) // batch_size) * batch_size
+    data = dict(input_data=[[v for i in range(count) for v in rows[i % len(rows)]]])
+    
+    base = model_registry.model_dir(model) if model is not None else ''
+    path = os.path.join(base, batches_dir, f'b{batch_size}', 'calibration.json')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            if json.load(f) == data:
+                return path
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    return path
+
+def make_py_run_args(args):
+    """Build an ezkl.PyRunArgs from a plain dict of fields"""
+    py_run_args = ezkl.PyRunArgs()
+    for name, value in args.items():
+        if name == 'commitment' and hasattr(ezkl, 'PyCommitments'):
+            value = getattr(ezkl.PyCommitments, str(value).upper())
+        setattr(py_run_args, name, value)
+    return py_run_args
+
+_settings_cache = {}
+
+def load_settings(settings_file):
+    """Parsed settings.json, memoized until the file changes"""
+    st = os.stat(settings_file)
+    cache_key = (os.path.abspath(settings_file), st.st_mtime_ns, st.st_size)
+    if cache_key not in _settings_cache:
+        with open(settings_file, 'r') as f:
+            _settings_cache[cache_key] = json.load(f)
+    return _settings_cache[cache_key]
+
+def calibrate(data_path, settings_file, args, onnx_file=None):
+    """
+    Run calibrate_settings with a calibration_args dict.
     
     Args:
-        input_data: List of 3 floats [BTC Vol, ETH Gas, Market Volume]
-                   If None, uses default from input.json
+        data_path: Calibration input JSON
+        settings_file: settings.json to calibrate in place
+        args: Dict with 'target' plus optional calibrate_settings keyword
+              arguments ('scales', 'lookup_safety_margin', 'max_logrows', ...)
+        onnx_file: ONNX model (default model_path)
     """
+    kwargs = {k: v for k, v in args.items() if k != 'target'}
+    ezkl.calibrate_settings(data_path, onnx_file or model_path, settings_file, args['target'], **kwargs)
+
+def witness_outputs(witness, settings):
+    """
+    Return the model outputs of a witness.json dict as a flat list of floats.
     
-    # If input_data provided, create input.json
-    if input_data:
-        data = dict(input_data=[input_data])
-        with open(input_json_path, 'w') as f:
-            json.dump(data, f)
-        print(f"[EZKL] Created input.json with data: {input_data}")
+    Uses pretty_elements when EZKL provides them, otherwise dequantizes the
+    output field elements with the calibrated output scales.
+    """
+    pretty = witness.get('pretty_elements') or {}
+    if pretty.get('rescaled_outputs'):
+        return [float(v) for row in pretty['rescaled_outputs'] for v in row]
+    felt_to_float = getattr(ezkl, 'felt_to_float', None) or getattr(ezkl, 'vecu64_to_float')
+    scales = settings.get('model_output_scales', [])
+    values = []
+    for i, row in enumerate(witness.get('outputs', [])):
+        scale = scales[i] if i < len(scales) else scales[-1]
+        values.extend(float(felt_to_float(v, scale)) for v in row)
+    return values
+
+def verifier_paths(profile=None, batch_size=1, model=None):
+    """(sol, abi, stamp) paths of the EVM verifier for a profile/batch size/model circuit"""
+    profile = profile or profiles.active_profile()
+    if profile == profiles.default_profile and batch_size == 1 and model is None:
+        return verifier_sol_path, verifier_abi_path, verifier_stamp_path
+    d = os.path.join(os.path.dirname(circuit_paths(batch_size, profile, model)['settings.json']), 'contracts')
+    return (os.path.join(d, 'Verifier.sol'), os.path.join(d, 'Verifier.abi'),
+            os.path.join(d, 'verifier.stamp.json'))
+
+def ensure_evm_verifier(force=False, profile=None, batch_size=1, model=None):
+    """
+    Generate the EVM verifier only when the VK or settings changed.
     
-    if not os.path.exists(input_json_path):
-        raise FileNotFoundError(f"input.json not found. Please create it first or provide input_data.")
+    The verifier depends on nothing but the VK and settings, so their hashes
+    are stamped next to it and generation is skipped while they match.
     
-    if not os.path.exists(model_path):
-        raise FileNotFoundError(f"ONNX model not found at {model_path}")
+    Returns:
+        True if the verifier was (re)generated
     
-    print("=" * 60)
-    print("EZKL ZK-Proof Generation Pipeline")
-    print("=" * 60)
+    Raises:
+        ValueError for profiles without an EVM verifier (non-KZG commitments)
+    """
+    profile = profile or profiles.active_profile()
+    if not profiles.supports_evm(profile):
+        raise ValueError(f"Profile '{profile}' uses {profiles.commitment(profile).upper()} commitments; "
+                         f"EZKL only generates EVM verifiers for KZG")
+    paths = circuit_paths(batch_size, profile, model)
+    sol_file, abi_file, stamp_file = verifier_paths(profile, batch_size, model)
+    stamp = {
+        'vk': proof_store.file_hash(paths['vk.key']),
+        'settings': proof_store.file_hash(paths['settings.json']),
+    }
+    if not force and all(os.path.exists(p) for p in (sol_file, abi_file, stamp_file)):
+        with open(stamp_file, 'r') as f:
+            if json.load(f) == stamp:
+                return False
+    
+    for path in (sol_file, abi_file, stamp_file):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with instrumentation.stage('create_evm_verifier', profile=profile):
+        ezkl.create_evm_verifier(
+            paths['vk.key'],
+            paths['settings.json'],
+            sol_file,
+            abi_file,
+            srs_path=srs_store.srs_for_settings(paths['settings.json']),
+        )
+    with open(stamp_file, 'w') as f:
+        json.dump(stamp, f)
+    return True
+
+def cwd_workspace(profile=None):
+    """Legacy layout: job files in the working directory, the profile's shared artifacts"""
+    return JobWorkspace(
+        directory=os.path.dirname(os.path.abspath(input_json_path)),
+        artifacts_dir=os.path.dirname(os.path.abspath(circuit_paths(profile=profile)['network.ezkl'])),
+    )
+
+def ensure_calibration_data():
+    """
+    Seed calibration.json from input.json if it does not exist yet.
+    
+    Calibration data is kept separate from the proving input so the
+    artifact cache key stays stable across predictions.
+    """
+    if not os.path.exists(calibration_json_path):
+        shutil.copy(input_json_path, calibration_json_path)
+        print(f"[EZKL] Seeded {calibration_json_path} from {input_json_path}")
+
+def setup_circuit(use_cache=True, batch_size=1, profile=None, model=None):
+    """
+    Run steps 1-4 (settings, calibration, compile, PK/VK setup).
+
+    Results are content-addressed by the ONNX bytes, run args and calibration
+    data (see artifact_cache.py); on a cache hit the stored artifacts are
+    restored and all four steps are skipped.
+
+    Args:
+        use_cache: Reuse/populate the artifact cache
+        batch_size: Input rows per proof; batch sizes > 1 get their own
+                    circuit and keys under batches/b<N>/ (see circuit_paths)
+        profile: Visibility/commitment profile (profiles.py); None = ZK_PROFILE or default
+        model: Registered model id (model_registry.py); None = model_path
+
+    Returns:
+        True if PK/VK are available for proving
+    """
+    paths = circuit_paths(batch_size, profile, model)
+    onnx_file = onnx_model_path(model)
+    settings_file = paths['settings.json']
+    compiled_file = paths['network.ezkl']
+    pk_file = paths['pk.key']
+    vk_file = paths['vk.key']
+    args = circuit_run_args(batch_size, profile)
+    calibration_file = batch_calibration_data(batch_size, model)
+    os.makedirs(os.path.dirname(os.path.abspath(settings_file)), exist_ok=True)
+    
+    key = artifact_cache.cache_key(onnx_file, args, calibration_args, calibration_file)
+    if use_cache and artifact_cache.restore(key, paths):
+        print(f"\n[1-4/6] Artifact cache hit ({key[:12]}), skipping settings/calibrate/compile/setup")
+        return True
+    if use_cache:
+        print(f"\n[INFO] Artifact cache miss ({key[:12]}), running full setup")
     
     # Step 1: Generate settings
     print("\n[1/6] Generating settings...")
-    py_run_args = ezkl.PyRunArgs()
-    py_run_args.input_visibility = "public"
-    py_run_args.output_visibility = "public"
-    py_run_args.param_visibility = "fixed"
+    py_run_args = make_py_run_args(args)
     
-    res = ezkl.gen_settings(model_path, settings_path, py_run_args=py_run_args)
-    print(f"[OK] Settings generated: {settings_path}")
+    with instrumentation.stage('gen_settings'):
+        res = ezkl.gen_settings(onnx_file, settings_file, py_run_args=py_run_args)
+    print(f"[OK] Settings generated: {settings_file}")
     
     # Step 2: Calibrate settings
     print("\n[2/6] Calibrating settings...")
-    ezkl.calibrate_settings(
-        input_json_path, 
-        model_path, 
-        settings_path, 
-        "resources", 
-        scales=[2]
-    )
+    with instrumentation.stage('calibrate_settings', scales=calibration_args['scales']):
+        calibrate(calibration_file, settings_file, calibration_args, onnx_file)
     print("[OK] Settings calibrated")
     
     # Step 3: Compile circuit
     print("\n[3/6] Compiling circuit...")
-    ezkl.compile_circuit(model_path, compiled_model_path, settings_path)
-    print(f"[OK] Circuit compiled: {compiled_model_path}")
+    with instrumentation.stage('compile_circuit'):
+        ezkl.compile_circuit(onnx_file, compiled_file, settings_file)
+    print(f"[OK] Circuit compiled: {compiled_file}")
     
     # Step 4: Setup keys
     print("\n[4/6] Setting up keys (PK/VK)...")
     
-    # Handle event loop for EZKL async operations
-    import asyncio
-    try:
-        import nest_asyncio
-        nest_asyncio.apply()
-    except ImportError:
-        pass  # nest_asyncio not available, will handle manually
-    
-    # Get or create event loop
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_closed():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    
-    # Get SRS (Structured Reference String) - REQUIRED!
-    # EZKL MUST have SRS in resources/ folder before setup
-    print("Downloading/generating SRS (this may take a moment)...")
-    
-    # Create resources directory (EZKL expects SRS here)
-    resources_dir = 'resources'
-    os.makedirs(resources_dir, exist_ok=True)
-    srs_file = os.path.join(resources_dir, 'kzg.srs')
-    
-    # Check if SRS already exists
-    if os.path.exists(srs_file):
-        file_size = os.path.getsize(srs_file)
-        print(f"[OK] Using existing SRS file ({file_size} bytes)")
-    else:
-        # Download/generate SRS
-        srs_loaded = False
-        
-        # Try multiple methods to get SRS
-        methods = [
-            ("Direct with path", lambda: ezkl.get_srs(settings_path, srs_path=srs_file)),
-            ("Direct without path", lambda: ezkl.get_srs(settings_path)),
-            ("Async wrapper", lambda: loop.run_until_complete(_get_srs_async_wrapper(settings_path, srs_file))),
-        ]
-        
-        for method_name, method_func in methods:
-            try:
-                print(f"Trying {method_name}...")
-                method_func()
-                
-                # EZKL may download SRS in background, wait a bit and check
-                import time
-                max_wait = 60  # Wait up to 60 seconds for download
-                wait_interval = 2  # Check every 2 seconds
-                waited = 0
-                
-                while waited < max_wait:
-                    # Check if SRS file was created
-                    if os.path.exists(srs_file) and os.path.getsize(srs_file) > 0:
-                        file_size = os.path.getsize(srs_file)
-                        print(f"[OK] SRS loaded successfully via {method_name} ({file_size} bytes)")
-                        srs_loaded = True
-                        break
-                    elif os.path.exists('kzg.srs') and os.path.getsize('kzg.srs') > 0:
-                        # SRS saved to wrong location, move it
-                        import shutil
-                        shutil.move('kzg.srs', srs_file)
-                        file_size = os.path.getsize(srs_file)
-                        print(f"[OK] SRS moved to resources/ ({file_size} bytes)")
-                        srs_loaded = True
-                        break
-                    
-                    # Still downloading, wait a bit
-                    if waited % 10 == 0 and waited > 0:
-                        print(f"  Still downloading SRS... ({waited}s)")
-                    time.sleep(wait_interval)
-                    waited += wait_interval
-                
-                if srs_loaded:
-                    break
-                    
-            except Exception as e:
-                error_str = str(e).lower()
-                # Check if file was created despite exception
-                if os.path.exists(srs_file) and os.path.getsize(srs_file) > 0:
-                    file_size = os.path.getsize(srs_file)
-                    print(f"[OK] SRS file found despite error ({file_size} bytes)")
-                    srs_loaded = True
-                    break
-                elif 'event loop' not in error_str:  # Skip event loop errors, try next method
-                    print(f"  {method_name} failed: {e}")
-                continue
-        
-        if not srs_loaded:
-            raise Exception("CRITICAL: Could not load SRS. EZKL requires SRS file in resources/kzg.srs. Please check your internet connection.")
-        
-        # Final verification
-        if not os.path.exists(srs_file) or os.path.getsize(srs_file) == 0:
-            raise Exception(f"CRITICAL: SRS file not found or empty at {srs_file}")
-    
-    # Setup keys - this is the critical step
-    print("Setting up proving and verification keys...")
-    
-    # Verify SRS file location - EZKL may have saved it elsewhere
-    possible_srs_locations = [
-        srs_file,  # resources/kzg.srs
-        'kzg.srs',  # Current directory
-        os.path.join('resources', 'kzg.srs'),
-        os.path.join('..', 'resources', 'kzg.srs'),
-    ]
-    
-    actual_srs_path = None
-    for loc in possible_srs_locations:
-        if os.path.exists(loc) and os.path.getsize(loc) > 0:
-            actual_srs_path = os.path.abspath(loc)
-            print(f"Found SRS at: {actual_srs_path} ({os.path.getsize(loc)} bytes)")
-            # Ensure it's in resources/ for EZKL to find
-            if not loc.startswith('resources'):
-                import shutil
-                os.makedirs('resources', exist_ok=True)
-                shutil.copy(loc, srs_file)
-                print(f"Copied SRS to resources/kzg.srs")
-            break
-    
-    if not actual_srs_path:
-        raise Exception("CRITICAL: SRS file not found after download. Please check resources/ folder.")
-    
-    # CRITICAL: EZKL setup() needs SRS file matching the logrows in settings.json
-    # Solution: Read logrows from settings, ensure SRS is loaded, then setup WITHOUT srs_path
-    print("Setting up keys...")
-    
     setup_success = False
+    keys_generated = False  # False when falling back to keys from a previous run
     
     try:
-        # Step 1: Read settings.json to get required logrows
-        print("Checking SRS requirements...")
-        with open(settings_path, 'r') as f:
+        # Resolve the SRS for this circuit's logrows from the local store
+        with open(settings_file, 'r') as f:
             settings = json.load(f)
             logrows = settings.get('run_args', {}).get('logrows', 17)
-            print(f"   -> Model requires logrows = {logrows}")
-        
-        # Step 2: Load SRS (EZKL will download/use kzg{logrows}.srs)
-        print(f"   -> Loading SRS for logrows={logrows} (this may take a moment)...")
-        async def load_srs_async():
-            if hasattr(ezkl, 'get_srs_async'):
-                await ezkl.get_srs_async(settings_path)
-            else:
-                ezkl.get_srs(settings_path)
-        loop.run_until_complete(load_srs_async())
-        print("[OK] SRS loaded")
-        
-        # Wait a bit to ensure SRS is fully loaded
-        import time
-        time.sleep(2)
-        
-        # Check if SRS file exists (EZKL may save it in different locations)
-        # IMPORTANT: EZKL needs kzg{logrows}.srs, not just kzg.srs
-        required_srs_name = f'kzg{logrows}.srs'
-        possible_srs_locations = [
-            required_srs_name,
-            f'resources/{required_srs_name}',
-            f'resources/kzg.srs',  # Fallback
-            srs_file,
-            os.path.expanduser(f'~/.ezkl/{required_srs_name}'),
-        ]
-        
-        srs_found = False
-        found_location = None
-        for loc in possible_srs_locations:
-            if os.path.exists(loc) and os.path.getsize(loc) > 0:
-                print(f"   -> Found SRS at: {loc} ({os.path.getsize(loc)} bytes)")
-                found_location = loc
-                srs_found = True
-                
-                # If it's not the required name, copy/rename it
-                if required_srs_name not in loc:
-                    print(f"   -> Copying to required name: {required_srs_name}")
-                    import shutil
-                    target_path = required_srs_name
-                    if not os.path.exists('resources'):
-                        os.makedirs('resources', exist_ok=True)
-                    target_path = f'resources/{required_srs_name}'
-                    shutil.copy(loc, target_path)
-                    print(f"   -> Copied to: {target_path}")
-                break
-        
-        if not srs_found:
-            print(f"   [WARNING] SRS file not found in expected locations")
-            print(f"   [INFO] EZKL may download it automatically. Continuing...")
+        with instrumentation.stage('srs_lookup', logrows=logrows):
+            srs_file = srs_store.srs_for_settings(settings_file)
+        print(f"   -> Using SRS for logrows={logrows}: {srs_file}")
         
         # Step 3: Verify compiled model exists
-        if not os.path.exists(compiled_model_path):
-            raise Exception(f"Error: Compiled model not found at {compiled_model_path}")
+        if not os.path.exists(compiled_file):
+            raise Exception(f"Error: Compiled model not found at {compiled_file}")
         
-        # Step 4: Setup WITHOUT srs_path - let EZKL find it automatically
+        # Step 4: Setup with the exact SRS for logrows
         print("   -> Setting up keys (PK/VK)...")
-        ezkl.setup(
-            compiled_model_path,
-            vk_path,
-            pk_path,
-            # DO NOT pass srs_path - let EZKL find it automatically
-        )
-        print(f"[OK] Proving key: {pk_path}")
-        print(f"[OK] Verification key: {vk_path}")
+        with instrumentation.stage('setup', logrows=logrows):
+            ezkl.setup(
+                compiled_file,
+                vk_file,
+                pk_file,
+                srs_path=srs_file,
+            )
+        print(f"[OK] Proving key: {pk_file}")
+        print(f"[OK] Verification key: {vk_file}")
         setup_success = True
+        keys_generated = True
     except (Exception, BaseException) as e1:
         # Catch both Python exceptions and Rust panics (PyO3RuntimeException)
         error_str = str(e1).lower()
@@ -379,9 +449,9 @@ def generate_proof(input_data=None):
             print("\nChecking if keys already exist from previous run...")
             
             # Check if keys exist from previous successful run
-            if os.path.exists(pk_path) and os.path.exists(vk_path):
-                pk_size = os.path.getsize(pk_path)
-                vk_size = os.path.getsize(vk_path)
+            if os.path.exists(pk_file) and os.path.exists(vk_file):
+                pk_size = os.path.getsize(pk_file)
+                vk_size = os.path.getsize(vk_file)
                 if pk_size > 1000 and vk_size > 100:
                     print(f"[OK] Using existing keys (PK: {pk_size} bytes, VK: {vk_size} bytes)")
                     setup_success = True
@@ -393,6 +463,57 @@ def generate_proof(input_data=None):
             # Other error - re-raise
             raise
     
+    if use_cache and keys_generated:
+        artifact_cache.store(key, paths)
+        print(f"[OK] Setup artifacts cached: {artifact_cache.cache_dir}/{key[:12]}")
+    
+    return setup_success
+
+
+def generate_proof(input_data=None, use_cache=True, workspace=None, profile=None):
+    """
+    Generate ZK proof from ONNX model.
+    
+    Args:
+        input_data: List of 3 floats [BTC Vol, ETH Gas, Market Volume]
+                   If None, uses default from input.json
+        use_cache: Reuse settings/circuit/keys from the artifact cache when
+                   the model, run args and calibration data are unchanged, and
+                   proofs from the proof store for an already-proven input
+        workspace: JobWorkspace for input/witness/proof files. Defaults to
+                   the working directory (input.json, witness.json, proof.json)
+        profile: Visibility/commitment profile (profiles.py); None = ZK_PROFILE or default
+    """
+    profile = profile or profiles.active_profile()
+    if workspace is None:
+        workspace = cwd_workspace(profile)
+    
+    # If input_data provided, create input.json
+    if input_data:
+        data = dict(input_data=[input_data])
+        with open(workspace.input_path, 'w') as f:
+            json.dump(data, f)
+        print(f"[EZKL] Created input.json with data: {input_data}")
+    elif not os.path.exists(workspace.input_path) and os.path.exists(input_json_path):
+        shutil.copy(input_json_path, workspace.input_path)
+    
+    if not os.path.exists(workspace.input_path):
+        raise FileNotFoundError(f"input.json not found. Please create it first or provide input_data.")
+    
+    ensure_calibration_data()
+    
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"ONNX model not found at {model_path}")
+    
+    print("=" * 60)
+    print("EZKL ZK-Proof Generation Pipeline")
+    if profile != profiles.default_profile:
+        print(f"Profile: {profile} {profiles.get_profile(profile)}")
+    print("=" * 60)
+    
+    with instrumentation.stage('setup_circuit', profile=profile):
+        setup_success = setup_circuit(use_cache=use_cache, profile=profile)
+    
     if not setup_success:
         # EZKL setup() has a known bug - allow script to continue with warning
         print("\n" + "="*60)
@@ -407,92 +528,482 @@ def generate_proof(input_data=None):
         print("="*60 + "\n")
         
         # Check if we can at least continue with witness generation
-        if os.path.exists(compiled_model_path):
+        if os.path.exists(workspace.compiled_model_path):
             print("[INFO] Circuit compiled, will attempt witness generation...")
         else:
             raise Exception("Cannot continue: Circuit not compiled.")
     
     # Step 5: Generate Witness & Proof
     print("\n[5/6] Generating Witness & Proof...")
-    ezkl.gen_witness(input_json_path, compiled_model_path, witness_path)
-    print(f"[OK] Witness generated: {witness_path}")
     
-    # Proof generation needs PK
-    if setup_success and os.path.exists(pk_path) and os.path.getsize(pk_path) > 0:
-        try:
-            ezkl.prove(
-                witness_path,
-                compiled_model_path,
-                pk_path,
-                proof_path,
-                "single",
-            )
-            print(f"[OK] Proof generated: {proof_path}")
-        except Exception as prove_err:
-            print(f"[ERROR] Proof generation failed: {prove_err}")
-            # Create mock proof as fallback
+    # Identical quantized input under the same circuit/VK: reuse the stored proof
+    cached = None
+    store = None
+    if use_cache and setup_success:
+        store = proof_store.open_store()
+        with open(workspace.input_path, 'r') as f:
+            proof_input = json.load(f)['input_data'][0]
+        store_key = proof_store.proof_key(
+            proof_input, load_settings(workspace.settings_path),
+            workspace.compiled_model_path, workspace.vk_path,
+        )
+        with instrumentation.stage('proof_store_lookup'):
+            cached = store.get(store_key)
+    
+    if cached is not None:
+        with open(workspace.witness_path, 'w') as f:
+            json.dump(cached['witness'], f)
+        with open(workspace.proof_path, 'w') as f:
+            json.dump(cached['proof'], f)
+        print(f"[OK] Proof store hit ({store_key[:12]}), skipped witness + prove: {workspace.proof_path}")
+    else:
+        with instrumentation.stage('gen_witness'):
+            ezkl.gen_witness(workspace.input_path, workspace.compiled_model_path, workspace.witness_path)
+        print(f"[OK] Witness generated: {workspace.witness_path}")
+    
+        # Proof generation needs PK
+        if setup_success and os.path.exists(workspace.pk_path) and os.path.getsize(workspace.pk_path) > 0:
+            try:
+                with instrumentation.stage('prove'):
+                    ezkl.prove(
+                        workspace.witness_path,
+                        workspace.compiled_model_path,
+                        workspace.pk_path,
+                        workspace.proof_path,
+                        "single",
+                        srs_path=workspace.srs_path,
+                    )
+                print(f"[OK] Proof generated: {workspace.proof_path}")
+                if store is not None:
+                    with open(workspace.proof_path, 'r') as f:
+                        proof = json.load(f)
+                    with open(workspace.witness_path, 'r') as f:
+                        witness = json.load(f)
+                    store.put(store_key, proof, witness)
+            except Exception as prove_err:
+                print(f"[ERROR] Proof generation failed: {prove_err}")
+                # Create mock proof as fallback
+                mock_proof = {
+                    "proof": "mock_proof_data",
+                    "instances": [[str(v) for v in input_data]],
+                    "note": f"Mock proof due to error: {prove_err}"
+                }
+                with open(workspace.proof_path, 'w') as f:
+                    json.dump(mock_proof, f)
+                print(f"[OK] Mock proof saved: {workspace.proof_path}")
+        else:
+            print("[WARNING] Proving key not available, creating mock proof...")
             mock_proof = {
                 "proof": "mock_proof_data",
                 "instances": [[str(v) for v in input_data]],
-                "note": f"Mock proof due to error: {prove_err}"
+                "note": "Mock proof - PK setup failed due to EZKL bug"
             }
-            with open(proof_path, 'w') as f:
+            with open(workspace.proof_path, 'w') as f:
                 json.dump(mock_proof, f)
-            print(f"[OK] Mock proof saved: {proof_path}")
-    else:
-        print("[WARNING] Proving key not available, creating mock proof...")
-        mock_proof = {
-            "proof": "mock_proof_data",
-            "instances": [[str(v) for v in input_data]],
-            "note": "Mock proof - PK setup failed due to EZKL bug"
-        }
-        with open(proof_path, 'w') as f:
-            json.dump(mock_proof, f)
-        print(f"[OK] Mock proof saved: {proof_path}")
+            print(f"[OK] Mock proof saved: {workspace.proof_path}")
+    
+    # Ready-to-submit MonadPriceGuard.verifyPrediction calldata (not for mock proofs)
+    import calldata_encoder
+    calldata_file = workspace.path('proof.calldata')
+    try:
+        with instrumentation.stage('encode_calldata'):
+            calldata = calldata_encoder.write_calldata(workspace.proof_path, calldata_file)
+        print(f"[OK] Calldata encoded ({len(calldata)} bytes): {calldata_file}")
+    except ValueError:
+        calldata_file = None
     
     # Step 6: Create EVM Verifier (optional, for Solidity)
     print("\n[6/6] Creating EVM Verifier...")
-    os.makedirs('contracts', exist_ok=True)
-    ezkl.create_evm_verifier(
-        vk_path,
-        settings_path,
-        "Verifier.sol",
-        "contracts/Verifier.sol",
-    )
-    print("[OK] Verifier.sol generated at contracts/Verifier.sol")
+    verifier_file = verifier_paths(profile)[0]
+    if not profiles.supports_evm(profile):
+        verifier_file = None
+        print(f"[INFO] Skipped: no EVM verifier for {profiles.commitment(profile).upper()} commitments")
+    elif ensure_evm_verifier(profile=profile):
+        print(f"[OK] Verifier.sol generated at {verifier_file}")
+    else:
+        print(f"[OK] VK unchanged, reusing {verifier_file}")
     
     print("\n" + "=" * 60)
     print("[OK] ZK Proof Generation Complete!")
     print("=" * 60)
+    paths = circuit_paths(profile=profile)
     print(f"\nGenerated files:")
-    print(f"  - {settings_path}")
-    print(f"  - {compiled_model_path}")
-    print(f"  - {pk_path}")
-    print(f"  - {vk_path}")
-    print(f"  - {witness_path}")
-    print(f"  - {proof_path}")
-    print(f"  - contracts/Verifier.sol")
+    print(f"  - {paths['settings.json']}")
+    print(f"  - {paths['network.ezkl']}")
+    print(f"  - {paths['pk.key']}")
+    print(f"  - {paths['vk.key']}")
+    print(f"  - {workspace.witness_path}")
+    print(f"  - {workspace.proof_path}")
+    if calldata_file:
+        print(f"  - {calldata_file}")
+    if verifier_file:
+        print(f"  - {verifier_file}")
+    
+    return {
+        'settings': paths['settings.json'],
+        'compiled': paths['network.ezkl'],
+        'pk': paths['pk.key'],
+        'vk': paths['vk.key'],
+        'witness': workspace.witness_path,
+        'proof': workspace.proof_path,
+        'calldata': calldata_file,
+        'verifier': verifier_file,
+    }
+
+def warm_prover(model_dir, batch_size=1):
+    """
+    Process pool initializer for proving workers.
+    
+    Pays the ezkl import, artifact reads and SRS lookup once per worker
+    instead of once per proof.
+    """
+    os.chdir(model_dir)
+    paths = circuit_paths(batch_size)
+    srs_file = srs_store.srs_for_settings(paths['settings.json'])
+    for path in list(paths.values()) + [srs_file]:
+        with open(path, 'rb') as f:
+            while f.read(8 * 1024 * 1024):
+                pass
+
+def prove_input(input_data, workspace, store=None, proof_type="single"):
+    """
+    Witness + prove a single input vector against the current circuit/PK.
+    
+    Unlike generate_proof() this never falls back to a mock proof; errors
+    propagate to the caller.
+    
+    Args:
+        input_data: List of 3 floats
+        workspace: JobWorkspace receiving input/witness/proof files
+        store: Optional ProofStore consulted before gen_witness/prove and
+               populated afterwards (single proofs only)
+        proof_type: "single" (EVM transcript) or "for-aggr" (input to aggregate_proofs)
+    
+    Returns:
+        (proof, witness) dicts loaded from the workspace
+    """
+    if proof_type != "single":
+        store = None
+    if store is not None:
+        store_key = proof_store.proof_key(
+            input_data, load_settings(workspace.settings_path),
+            workspace.compiled_model_path, workspace.vk_path,
+        )
+        with instrumentation.stage('proof_store_lookup'):
+            cached = store.get(store_key)
+        if cached is not None:
+            with open(workspace.proof_path, 'w') as f:
+                json.dump(cached['proof'], f)
+            return cached['proof'], cached['witness']
+    
+    with open(workspace.input_path, 'w') as f:
+        json.dump(dict(input_data=[input_data]), f)
+    with instrumentation.stage('gen_witness'):
+        ezkl.gen_witness(workspace.input_path, workspace.compiled_model_path, workspace.witness_path)
+    with instrumentation.stage('prove'):
+        ezkl.prove(
+            workspace.witness_path,
+            workspace.compiled_model_path,
+            workspace.pk_path,
+            workspace.proof_path,
+            proof_type,
+            srs_path=workspace.srs_path,
+        )
+    with open(workspace.witness_path, 'r') as f:
+        witness = json.load(f)
+    with open(workspace.proof_path, 'r') as f:
+        proof = json.load(f)
+    if store is not None:
+        store.put(store_key, proof, witness)
+    return proof, witness
+
+def batch_workspace(batch_size, profile=None, model=None, **kwargs):
+    """JobWorkspace whose shared artifacts are the batch_size circuit of a profile/model"""
+    artifacts_dir = os.path.dirname(os.path.abspath(circuit_paths(batch_size, profile, model)['settings.json']))
+    return JobWorkspace(artifacts_dir=artifacts_dir, **kwargs)
+
+def prove_batch(rows, workspace, store=None):
+    """
+    Witness + prove up to N input vectors with one batched proof.
+    
+    The workspace must point at a circuit compiled for batch size N
+    (batch_workspace(N)). Short batches are padded by repeating the last
+    row; the padded outputs are dropped.
+    
+    Args:
+        rows: List of input vectors (3 floats each), at most N
+        workspace: JobWorkspace on the batched circuit
+        store: Optional ProofStore (keyed on the whole padded batch)
+    
+    Returns:
+        (proof, witness, outputs) with one model output per input row
+    """
+    settings = load_settings(workspace.settings_path)
+    batch_size = dict(settings['run_args'].get('variables') or []).get('batch_size', 1)
+    if not rows or len(rows) > batch_size:
+        raise ValueError(f"Expected 1..{batch_size} rows for this circuit, got {len(rows)}")
+    padded = list(rows) + [rows[-1]] * (batch_size - len(rows))
+    flat = [float(v) for row in padded for v in row]
+    
+    proof, witness = prove_input(flat, workspace, store=store)
+    outputs = witness_outputs(witness, settings)
+    per_row = len(outputs) // batch_size
+    return proof, witness, [outputs[i * per_row:(i + 1) * per_row] for i in range(len(rows))]
+
+def proof_to_hex(proof):
+    """
+    Return the proof bytes of a proof.json dict as a 0x-prefixed hex string.
+    
+    EZKL versions differ: newer ones include 'hex_proof', older ones store
+    'proof' as a list of byte values or a hex string.
+    """
+    if proof.get('hex_proof'):
+        hex_proof = proof['hex_proof']
+        return hex_proof if hex_proof.startswith('0x') else '0x' + hex_proof
+    raw = proof.get('proof')
+    if isinstance(raw, list):
+        return '0x' + bytes(raw).hex()
+    if isinstance(raw, str):
+        return raw if raw.startswith('0x') else '0x' + raw
+    raise ValueError("proof.json has no proof bytes")
+
+def public_inputs_from_proof(proof):
+    """
+    Return the rescaled public inputs/outputs of a proof.json dict as floats,
+    or None if the proof does not carry pretty_public_inputs.
+    """
+    pretty = proof.get('pretty_public_inputs') or {}
+    values = []
+    for key in ('rescaled_inputs', 'rescaled_outputs'):
+        for row in pretty.get(key, []):
+            values.extend(float(v) for v in row)
+    return values or None
+
+def generate_batch_proof(rows, batch_size, use_cache=True):
+    """
+    One proof for up to batch_size input rows (batched circuit).
+    
+    Files go to the working directory like generate_proof(); the circuit
+    and keys live under batches/b<N>/.
+    
+    Returns:
+        List of model outputs, one per row
+    """
+    ensure_calibration_data()
+    with instrumentation.stage('setup_circuit', batch_size=batch_size):
+        if not setup_circuit(use_cache=use_cache, batch_size=batch_size):
+            raise Exception("PK/VK setup failed; batched proving needs real keys")
+    
+    print(f"\n[5/6] Generating Witness & Proof for {len(rows)} row(s), batch size {batch_size}...")
+    workspace = batch_workspace(batch_size, directory=os.path.dirname(os.path.abspath(input_json_path)))
+    store = proof_store.open_store() if use_cache else None
+    _, _, outputs = prove_batch(rows, workspace, store=store)
+    print(f"[OK] Proof generated: {workspace.proof_path}")
+    for row, out in zip(rows, outputs):
+        print(f"   {row} -> {out}")
+    return outputs
+
+def setup_aggregate(sample_proofs, logrows=aggr_logrows, use_cache=True):
+    """
+    Aggregation circuit keys for len(sample_proofs) inner proofs.
+    
+    Skipped while the inner VK, proof count and logrows match the stamp
+    from the last setup, since the keys depend on nothing else.
+    
+    Returns:
+        True if keys were (re)generated
+    """
+    stamp = {
+        'vk': proof_store.file_hash(circuit_paths()['vk.key']),
+        'num_proofs': len(sample_proofs),
+        'logrows': logrows,
+    }
+    if use_cache and all(os.path.exists(p) for p in (aggr_pk_path, aggr_vk_path, aggr_stamp_path)):
+        with open(aggr_stamp_path, 'r') as f:
+            if json.load(f) == stamp:
+                return False
+    
+    os.makedirs(aggr_dir, exist_ok=True)
+    with instrumentation.stage('setup_aggregate', num_proofs=len(sample_proofs), logrows=logrows):
+        ezkl.setup_aggregate(
+            sample_proofs,
+            aggr_vk_path,
+            aggr_pk_path,
+            logrows,
+            srs_path=srs_store.srs_path(logrows),
+        )
+    with open(aggr_stamp_path, 'w') as f:
+        json.dump(stamp, f)
+    return True
+
+def ensure_aggr_evm_verifier(num_proofs, logrows=aggr_logrows, force=False):
+    """
+    Aggregate EVM verifier, regenerated only when the aggregation VK changed.
+    
+    Returns:
+        True if the verifier was (re)generated
+    """
+    stamp = {
+        'aggr_vk': proof_store.file_hash(aggr_vk_path),
+        'settings': proof_store.file_hash(circuit_paths()['settings.json']),
+        'num_proofs': num_proofs,
+    }
+    outputs = (aggr_verifier_sol_path, aggr_verifier_abi_path)
+    if not force and all(os.path.exists(p) for p in outputs) and os.path.exists(aggr_verifier_stamp_path):
+        with open(aggr_verifier_stamp_path, 'r') as f:
+            if json.load(f) == stamp:
+                return False
+    
+    os.makedirs('contracts', exist_ok=True)
+    with instrumentation.stage('create_evm_verifier_aggr', num_proofs=num_proofs):
+        ezkl.create_evm_verifier_aggr(
+            [circuit_paths()['settings.json']] * num_proofs,
+            aggr_vk_path,
+            aggr_verifier_sol_path,
+            aggr_verifier_abi_path,
+            logrows=logrows,
+            srs_path=srs_store.srs_path(logrows),
+        )
+    with open(aggr_verifier_stamp_path, 'w') as f:
+        json.dump(stamp, f)
+    return True
+
+def aggregate_proofs(proof_files, out_path=aggr_proof_path, logrows=aggr_logrows, use_cache=True):
+    """
+    Aggregate "for-aggr" proofs into one EVM-verifiable proof.
+    
+    Args:
+        proof_files: proof.json paths produced with proof_type="for-aggr"
+        out_path: Aggregated proof path
+        logrows: Aggregation circuit logrows (needs kzg<logrows>.srs in the SRS store)
+        use_cache: Reuse aggregation keys while the inner VK and count are unchanged
+    
+    Returns:
+        Aggregated proof dict
+    """
+    setup_aggregate(proof_files, logrows=logrows, use_cache=use_cache)
+    with instrumentation.stage('aggregate', num_proofs=len(proof_files)):
+        ezkl.aggregate(
+            proof_files,
+            out_path,
+            aggr_vk_path,
+            "evm",
+            logrows,
+            "safe",
+            srs_path=srs_store.srs_path(logrows),
+        )
+    with instrumentation.stage('verify_aggr'):
+        if not ezkl.verify_aggr(out_path, aggr_vk_path, logrows, srs_path=srs_store.srs_path(logrows)):
+            raise Exception("Aggregated proof failed verification")
+    with open(out_path, 'r') as f:
+        return json.load(f)
+
+def generate_aggregated_proof(rows, use_cache=True, logrows=aggr_logrows):
+    """
+    Prove every row as an aggregation input and fold them into one proof
+    verifiable with a single on-chain call.
+    
+    Args:
+        rows: List of input vectors (3 floats each)
+        use_cache: Artifact cache for the model circuit, stamps for the aggregation keys
+        logrows: Aggregation circuit logrows
+    
+    Returns:
+        Dict with the aggregated proof path and inner proof paths
+    """
+    if not rows:
+        raise ValueError("No rows to aggregate")
+    ensure_calibration_data()
+    with instrumentation.stage('setup_circuit'):
+        if not setup_circuit(use_cache=use_cache):
+            raise Exception("PK/VK setup failed; aggregation needs real proofs")
+    
+    print(f"\n[5/6] Proving {len(rows)} input(s) for aggregation...")
+    inner_dir = os.path.join(aggr_dir, 'proofs')
+    os.makedirs(inner_dir, exist_ok=True)
+    proof_files = []
+    for i, row in enumerate(rows):
+        with JobWorkspace() as ws:
+            prove_input([float(v) for v in row], ws, proof_type="for-aggr")
+            dst = os.path.join(inner_dir, f'proof_{i:04d}.json')
+            shutil.copy(ws.proof_path, dst)
+        proof_files.append(dst)
+    print(f"[OK] {len(proof_files)} inner proof(s) in {inner_dir}/")
+    
+    print(f"\n[6/6] Aggregating (logrows={logrows})...")
+    aggregate_proofs(proof_files, aggr_proof_path, logrows=logrows, use_cache=use_cache)
+    print(f"[OK] Aggregated proof: {aggr_proof_path}")
+    if ensure_aggr_evm_verifier(len(proof_files), logrows=logrows):
+        print(f"[OK] Aggregate verifier generated at {aggr_verifier_sol_path}")
+    else:
+        print(f"[OK] Aggregation VK unchanged, reusing {aggr_verifier_sol_path}")
     
     return {
-        'settings': settings_path,
-        'compiled': compiled_model_path,
-        'pk': pk_path,
-        'vk': vk_path,
-        'witness': witness_path,
-        'proof': proof_path,
+        'proof': aggr_proof_path,
+        'inner_proofs': proof_files,
+        'verifier': aggr_verifier_sol_path,
     }
 
 if __name__ == "__main__":
+    # --no-cache forces a full settings/calibrate/compile/setup run
+    use_cache = '--no-cache' not in sys.argv
+    args = [a for a in sys.argv[1:] if a != '--no-cache']
+    
+    # --trace <file> records per-stage timing/memory (same as EZKL_TRACE=<file>)
+    if '--trace' in args:
+        i = args.index('--trace')
+        instrumentation.enable(args[i + 1])
+        del args[i:i + 2]
+    
+    # --profile <name> selects a visibility/commitment profile (same as ZK_PROFILE=<name>)
+    if '--profile' in args:
+        i = args.index('--profile')
+        profiles.get_profile(args[i + 1])
+        os.environ['ZK_PROFILE'] = args[i + 1]
+        del args[i:i + 2]
+    
+    # --aggregate <rows.csv|rows.jsonl> [--aggr-logrows N]: one aggregated proof for all rows
+    if '--aggregate' in args:
+        from batch_prove import read_rows
+        i = args.index('--aggregate')
+        rows_file = args[i + 1]
+        logrows = aggr_logrows
+        if '--aggr-logrows' in args:
+            logrows = int(args[args.index('--aggr-logrows') + 1])
+        try:
+            with instrumentation.stage('generate_aggregated_proof'):
+                generate_aggregated_proof(read_rows(rows_file), use_cache=use_cache, logrows=logrows)
+        except Exception as e:
+            print(f"\n[ERROR] Error: {e}")
+            sys.exit(1)
+        sys.exit(0)
+    
+    # --batch-size N a b c [a b c ...]: one proof covering up to N rows
+    if '--batch-size' in args:
+        i = args.index('--batch-size')
+        batch_size = int(args[i + 1])
+        del args[i:i + 2]
+        values = [float(v) for v in args] or [0.45, 24.0, 1.2]
+        rows = [values[j:j + 3] for j in range(0, len(values) - len(values) % 3, 3)]
+        try:
+            with instrumentation.stage('generate_batch_proof', batch_size=batch_size):
+                generate_batch_proof(rows, batch_size, use_cache=use_cache)
+        except Exception as e:
+            print(f"\n[ERROR] Error: {e}")
+            sys.exit(1)
+        sys.exit(0)
+    
     # Default input if no args
-    if len(sys.argv) > 1:
+    if len(args) > 0:
         # Parse input from command line: python generate_proof.py 0.45 24 1.2
-        input_data = [float(sys.argv[1]), float(sys.argv[2]), float(sys.argv[3])]
+        input_data = [float(args[0]), float(args[1]), float(args[2])]
     else:
         # Use default from input.json or create one
         input_data = [0.45, 24.0, 1.2]
     
     try:
-        generate_proof(input_data)
+        with instrumentation.stage('generate_proof'):
+            generate_proof(input_data, use_cache=use_cache)
     except Exception as e:
         print(f"\n[ERROR] Error: {e}")
         sys.exit(1)
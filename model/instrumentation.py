@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing and peak-memory instrumentation for the proving pipeline.
+
+Enable with the EZKL_TRACE environment variable (or enable(path)):
+    EZKL_TRACE=trace.json   Chrome trace events, open in chrome://tracing,
+                            https://ui.perfetto.dev or speedscope
+    EZKL_TRACE=trace.jsonl  One JSON record per stage
+
+Each stage records wall time, CPU time (all threads of the process) and
+peak RSS while the stage ran (sampled from /proc, falling back to
+getrusage). Several processes may write to the same file; records are
+appended with O_APPEND and the trace uses Chrome's JSON array format,
+which tolerates the missing closing bracket.
+
+Usage:
+    with instrumentation.stage('prove', logrows=17):
+        ezkl.prove(...)
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# How often peak RSS is sampled while a stage runs
+sample_interval = 0.01
+
+_trace_path = None
+_stack = threading.local()
+_page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def enable(path):
+    """Start recording stages to path (.jsonl for JSON lines, else Chrome trace)"""
+    global _trace_path
+    _trace_path = os.path.abspath(path)
+    # Child processes (pools) inherit the setting through the environment
+    os.environ['EZKL_TRACE'] = _trace_path
+
+def disable():
+    global _trace_path
+    _trace_path = None
+    os.environ.pop('EZKL_TRACE', None)
+
+def enabled():
+    return _trace_path is not None
+
+
+def current_rss():
+    """Resident set size of this process in bytes (None if unknown)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * _page_size
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _lifetime_peak_rss():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class _PeakSampler(threading.Thread):
+    """Background thread tracking the highest RSS seen while a stage runs"""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = current_rss() or 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(sample_interval):
+            rss = current_rss()
+            if rss and rss > self.peak:
+                self.peak = rss
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        rss = current_rss()
+        if rss and rss > self.peak:
+            self.peak = rss
+        # No /proc: best we have is the lifetime high-water mark
+        return self.peak or _lifetime_peak_rss()
+
+
+def _write(record):
+    line = json.dumps(record)
+    if _trace_path.endswith('.jsonl'):
+        data = line + '\n'
+    else:
+        # Chrome trace, JSON array format: first writer opens the array
+        try:
+            fd = os.open(_trace_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            os.write(fd, b'[\n')
+            os.close(fd)
+        except FileExistsError:
+            pass
+        data = line + ',\n'
+    fd = os.open(_trace_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, data.encode('utf-8'))
+    finally:
+        os.close(fd)
+
+
+def record(name, wall_s, cpu_s, peak_rss, start_ts, depth=0, error=None, **attrs):
+    """Emit one stage record to the trace file"""
+    if _trace_path.endswith('.jsonl'):
+        rec = {
+            'stage': name,
+            'pid': os.getpid(),
+            'depth': depth,
+            'start': start_ts,
+            'wall_s': wall_s,
+            'cpu_s': cpu_s,
+            'peak_rss': peak_rss,
+            'max_rss_lifetime': _lifetime_peak_rss(),
+        }
+        if error:
+            rec['error'] = error
+        rec.update(attrs)
+    else:
+        args = dict(attrs, cpu_s=cpu_s, peak_rss=peak_rss)
+        if error:
+            args['error'] = error
+        rec = {
+            'name': name,
+            'cat': 'ezkl',
+            'ph': 'X',
+            'ts': start_ts * 1e6,
+            'dur': wall_s * 1e6,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args,
+        }
+    _write(rec)
+
+
+def percentiles(values):
+    """Summary statistics (min/p50/p90/p99/max/mean) of a list of numbers"""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+
+    def pct(p):
+        # Nearest-rank percentile
+        k = max(0, min(len(values) - 1, math.ceil(p / 100.0 * len(values)) - 1))
+        return values[k]
+
+    return {
+        'min': values[0],
+        'p50': pct(50),
+        'p90': pct(90),
+        'p99': pct(99),
+        'max': values[-1],
+        'mean': sum(values) / len(values),
+        'n': len(values),
+    }
+
+
+class Measurement:
+    """Wall time, CPU time and peak RSS of a measured block"""
+
+    def __init__(self):
+        self.wall_s = None
+        self.cpu_s = None
+        self.peak_rss = None
+
+    def as_dict(self):
+        return {'wall_s': self.wall_s, 'cpu_s': self.cpu_s, 'peak_rss': self.peak_rss}
+
+
+@contextmanager
+def measure():
+    """
+    Measure a block regardless of whether tracing is enabled.
+
+    Usage:
+        with measure() as m:
+            ezkl.prove(...)
+        print(m.wall_s, m.peak_rss)
+    """
+    m = Measurement()
+    sampler = _PeakSampler()
+    sampler.start()
+    wall0 = time.perf_counter()
+    cpu0 = time.process_time()
+    try:
+        yield m
+    finally:
+        m.wall_s = time.perf_counter() - wall0
+        m.cpu_s = time.process_time() - cpu0
+        m.peak_rss = sampler.stop()
+
+
+@contextmanager
+def stage(name, **attrs):
+    """
+    Time a pipeline stage. No-op unless tracing is enabled.
+
+    Args:
+        name: Stage name (e.g. 'calibrate_settings', 'srs_lookup')
+        **attrs: Extra JSON-serialisable fields stored with the record
+    """
+    if _trace_path is None:
+        yield
+        return
+
+    depth = getattr(_stack, 'depth', 0)
+    _stack.depth = depth + 1
+    start_ts = time.time()
+    error = None
+    try:
+        with measure() as m:
+            yield
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _stack.depth = depth
+        record(name, m.wall_s, m.cpu_s, m.peak_rss, start_ts, depth=depth, error=error, **attrs)
+
+
+# Pick up EZKL_TRACE at import so worker processes trace too
+if os.environ.get('EZKL_TRACE'):
+    enable(os.environ['EZKL_TRACE'])
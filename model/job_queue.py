@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Durable proof job queue: SQLite-backed, priorities, deadlines, leases.
+
+Jobs survive crashes of both the submitter and the prover. A worker
+claims the next job with a lease; if it dies mid-prove the lease runs out
+and the job is queued again (up to max_attempts), instead of the work
+being lost or replaced by a mock proof.
+
+Ordering: lower priority value first (critical < high < normal <
+backfill), then earliest deadline, then submission order, so latency-
+critical guard checks jump ahead of backfill work. The deadline is a
+start deadline: a job still queued when it passes (also when requeued
+after an error or an expired lease) is marked 'expired' and not proved
+again, while a job already running at that point is allowed to finish.
+
+`submit` sets up the job's profile/model circuit before queuing it (an
+artifact cache hit when it exists). A worker that finds the circuit
+missing fails the job at once instead of spending its attempts.
+
+Layout (default model/job_queue/):
+    jobs.sqlite     jobs table (status, lease, attempts, result JSON)
+
+States: queued -> running -> done | failed; queued -> expired | cancelled;
+running -> queued again on error or lease expiry while attempts remain.
+
+Usage (from model/):
+    python job_queue.py worker --workers 4
+    python job_queue.py submit 0.45 24 1.2 --priority critical --deadline 30
+    python job_queue.py result 17 --wait 60 --out proof.json
+    python job_queue.py status 17
+    python job_queue.py stats
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+
+from instrumentation import percentiles
+
+# Defaults (override per queue)
+default_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'job_queue')
+default_lease = 300.0  # seconds a claim is valid without a heartbeat
+default_max_attempts = 3
+retry_backoff = 2.0  # seconds, doubled per failed attempt
+restart_delay = 1.0  # seconds before respawning a dead worker, doubled while it keeps dying young
+
+# Priority levels (lower runs first); integers are accepted too
+priorities = {
+    'critical': 0,
+    'high': 10,
+    'normal': 20,
+    'backfill': 30,
+}
+
+# Terminal states
+finished_states = ('done', 'failed', 'expired', 'cancelled')
+
+
+def priority_value(priority):
+    if isinstance(priority, int):
+        return priority
+    if str(priority).lstrip('-').isdigit():
+        return int(priority)
+    if priority not in priorities:
+        raise ValueError(f"Unknown priority '{priority}' (use {', '.join(priorities)} or an integer)")
+    return priorities[priority]
+
+
+class JobQueue:
+    """
+    SQLite job table shared by submitters and worker processes.
+
+    Args:
+        root: Queue directory
+    """
+
+    def __init__(self, root=None):
+        self.root = os.path.abspath(root or default_root)
+        os.makedirs(self.root, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(self.root, 'jobs.sqlite'), timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                inputs TEXT NOT NULL,
+                model TEXT,
+                profile TEXT,
+                priority INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                deadline REAL,
+                available_at REAL NOT NULL,
+                created REAL NOT NULL,
+                started REAL,
+                finished REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                lease_owner TEXT,
+                lease_expires REAL,
+                error TEXT,
+                result TEXT
+            )''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS jobs_next ON jobs(status, priority, deadline, id)')
+
+    def submit(self, inputs, priority='normal', deadline=None, max_attempts=default_max_attempts,
+               model=None, profile=None):
+        """
+        Queue a proof job.
+
+        Args:
+            inputs: Input vector (3 floats)
+            priority: Level name from priorities or an integer (lower first)
+            deadline: Seconds from now after which the job is no longer started (None = never)
+            max_attempts: Claims before the job is marked failed
+            model: Registered model id (model_registry.py); None = default model
+            profile: Visibility/commitment profile; None = the worker's ZK_PROFILE
+
+        The job's circuit must already be set up (gp.setup_circuit with the same
+        profile/model); the submit CLI does this.
+
+        Returns:
+            Job id
+        """
+        now = time.time()
+        cursor = self.db.execute(
+            'INSERT INTO jobs(inputs, model, profile, priority, status, deadline, available_at, created, max_attempts) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (json.dumps([float(v) for v in inputs]), model, profile, priority_value(priority), 'queued',
+             None if deadline is None else now + deadline, now, now, max_attempts))
+        return cursor.lastrowid
+
+    def _reap(self, now):
+        """Expire overdue queued jobs and requeue/fail jobs whose lease ran out (in a transaction)"""
+        self.db.execute(
+            "UPDATE jobs SET status = 'expired', finished = ?, error = 'deadline passed before proving' "
+            "WHERE status = 'queued' AND deadline IS NOT NULL AND deadline < ?", (now, now))
+        self.db.execute(
+            "UPDATE jobs SET status = 'failed', finished = ?, lease_owner = NULL, "
+            "error = 'lease expired (worker died?)' "
+            "WHERE status = 'running' AND lease_expires < ? AND attempts >= max_attempts", (now, now))
+        self.db.execute(
+            "UPDATE jobs SET status = 'queued', lease_owner = NULL, lease_expires = NULL, "
+            "error = 'lease expired (worker died?)' "
+            "WHERE status = 'running' AND lease_expires < ?", (now,))
+
+    def claim(self, worker_id, lease=default_lease):
+        """
+        Lease the next runnable job to a worker.
+
+        Returns:
+            Job dict, or None when nothing is runnable
+        """
+        now = time.time()
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            self._reap(now)
+            row = self.db.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' AND available_at <= ? "
+                "ORDER BY priority, deadline IS NULL, deadline, id LIMIT 1", (now,)).fetchone()
+            if row is not None:
+                self.db.execute(
+                    "UPDATE jobs SET status = 'running', lease_owner = ?, lease_expires = ?, "
+                    "started = ?, attempts = attempts + 1 WHERE id = ?",
+                    (worker_id, now + lease, now, row['id']))
+            self.db.execute('COMMIT')
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        if row is None:
+            return None
+        job = self._job(row)
+        job['attempts'] += 1
+        return job
+
+    def heartbeat(self, job_id, worker_id, lease=default_lease):
+        """Extend a lease; False if the worker no longer holds it"""
+        cursor = self.db.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = 'running' AND lease_owner = ?",
+            (time.time() + lease, job_id, worker_id))
+        return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, result):
+        """Store the result of a leased job; False if the lease was lost meanwhile"""
+        cursor = self.db.execute(
+            "UPDATE jobs SET status = 'done', finished = ?, result = ?, error = NULL, lease_owner = NULL "
+            "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+            (time.time(), json.dumps(result), job_id, worker_id))
+        return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error, retry=True):
+        """Record an error: retried with backoff while attempts remain (and retry), else failed"""
+        now = time.time()
+        row = self.db.execute(
+            "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = 'running' AND lease_owner = ?",
+            (job_id, worker_id)).fetchone()
+        if row is None:
+            return
+        if not retry or row['attempts'] >= row['max_attempts']:
+            self.db.execute(
+                "UPDATE jobs SET status = 'failed', finished = ?, error = ?, lease_owner = NULL WHERE id = ?",
+                (now, str(error), job_id))
+        else:
+            self.db.execute(
+                "UPDATE jobs SET status = 'queued', available_at = ?, error = ?, lease_owner = NULL, "
+                "lease_expires = NULL WHERE id = ?",
+                (now + retry_backoff * 2 ** (row['attempts'] - 1), str(error), job_id))
+
+    def cancel(self, job_id):
+        """Cancel a job that has not started; False if it already ran"""
+        cursor = self.db.execute(
+            "UPDATE jobs SET status = 'cancelled', finished = ? WHERE id = ? AND status = 'queued'",
+            (time.time(), job_id))
+        return cursor.rowcount == 1
+
+    def _job(self, row, with_result=False):
+        job = {k: row[k] for k in row.keys() if k != 'result'}
+        job['inputs'] = json.loads(job['inputs'])
+        if with_result:
+            job['result'] = json.loads(row['result']) if row['result'] else None
+        return job
+
+    def status(self, job_id):
+        """Job dict without the result (None for an unknown id)"""
+        row = self.db.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return None if row is None else self._job(row)
+
+    def result(self, job_id, wait=None, poll_interval=0.25):
+        """
+        Job dict with 'result' ({"proof", "witness"} once done).
+
+        Args:
+            wait: Seconds to wait for a terminal state (None = don't wait)
+        """
+        stop = time.time() + (wait or 0)
+        while True:
+            row = self.db.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"Unknown job {job_id}")
+            if row['status'] in finished_states or time.time() >= stop:
+                return self._job(row, with_result=True)
+            time.sleep(poll_interval)
+
+    def stats(self):
+        counts = dict(self.db.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+        depth = {str(p): n for p, n in self.db.execute(
+            "SELECT priority, COUNT(*) FROM jobs WHERE status = 'queued' GROUP BY priority").fetchall()}
+        recent = self.db.execute(
+            "SELECT created, started, finished FROM jobs WHERE status = 'done' "
+            "ORDER BY finished DESC LIMIT 1000").fetchall()
+        return {
+            'counts': counts,
+            'queuedByPriority': depth,
+            'waitTime': percentiles([r['started'] - r['created'] for r in recent]),
+            'latency': percentiles([r['finished'] - r['created'] for r in recent]),
+        }
+
+    def close(self):
+        self.db.close()
+
+
+# ---------------------------------------------------------------------------
+# Workers
+# ---------------------------------------------------------------------------
+
+def _heartbeat(root, job_id, worker_id, lease, stop):
+    """Keep a lease alive while the job runs (own connection: sqlite3 objects are per thread)"""
+    q = JobQueue(root)
+    try:
+        while not stop.wait(lease / 3):
+            if not q.heartbeat(job_id, worker_id, lease):
+                return
+    finally:
+        q.close()
+
+
+class CircuitNotReady(Exception):
+    """The job's profile/model circuit is not set up (retrying cannot help)"""
+
+
+def _run_job(job, store, models):
+    import generate_proof as gp
+    paths = gp.circuit_paths(1, job['profile'], job['model'])
+    missing = [p for p in paths.values() if not os.path.exists(p)]
+    if missing:
+        raise CircuitNotReady(f"{missing[0]} missing; set up profile {job['profile'] or 'default'}"
+                              f"{' model ' + job['model'] if job['model'] else ''} first")
+    if job['model'] is not None:
+        with models.workspace(job['model'], job['profile']) as ws:
+            proof, witness = gp.prove_input(job['inputs'], ws, store=store)
+    else:
+        with gp.batch_workspace(1, profile=job['profile'], prefix=f"zkqueue-{job['id']}-") as ws:
+            proof, witness = gp.prove_input(job['inputs'], ws, store=store)
+    return {'proof': proof, 'witness': witness}
+
+
+def worker_main(root, worker_index, lease=default_lease, poll_interval=0.5, use_store=True):
+    """Worker process: claim, prove, complete until terminated"""
+    import generate_proof as gp
+    import proof_store
+    from model_cache import ModelCache
+
+    model_dir = os.path.dirname(os.path.abspath(__file__))
+    gp.warm_prover(model_dir)
+    q = JobQueue(root)
+    store = proof_store.open_store() if use_store else None
+    models = ModelCache()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{worker_index}"
+    try:
+        while True:
+            job = q.claim(worker_id, lease)
+            if job is None:
+                time.sleep(poll_interval)
+                continue
+            stop = threading.Event()
+            beat = threading.Thread(target=_heartbeat, args=(root, job['id'], worker_id, lease, stop), daemon=True)
+            beat.start()
+            try:
+                result = _run_job(job, store, models)
+            except BaseException as e:
+                # Rust panics (pyo3 PanicException) derive from BaseException
+                if isinstance(e, (KeyboardInterrupt, SystemExit)):
+                    raise
+                q.fail(job['id'], worker_id, e, retry=not isinstance(e, CircuitNotReady))
+                print(f"  [ERROR] job {job['id']} attempt {job['attempts']}/{job['max_attempts']}: {e}")
+            else:
+                if not q.complete(job['id'], worker_id, result):
+                    print(f"  [WARNING] job {job['id']}: lease lost before completion, result dropped")
+            finally:
+                stop.set()
+                beat.join()
+    finally:
+        models.close()
+        q.close()
+
+
+def run_workers(workers, root=None, lease=default_lease, use_store=True):
+    """
+    Run worker processes until Ctrl-C, respawning any that exit.
+
+    Unfinished jobs of a dead or stopped worker are reclaimed after their lease.
+    """
+    root = os.path.abspath(root or default_root)
+
+    def spawn(i):
+        p = multiprocessing.Process(target=worker_main, args=(root, i, lease, 0.5, use_store), daemon=True)
+        p.start()
+        return p, time.time()
+
+    procs, started = map(list, zip(*(spawn(i) for i in range(workers))))
+    delays = [restart_delay] * workers
+    restart_at = [None] * workers
+    print(f"[OK] {workers} worker(s) on {root}")
+    try:
+        while True:
+            time.sleep(0.5)
+            now = time.time()
+            for i, p in enumerate(procs):
+                if p.is_alive():
+                    continue
+                if restart_at[i] is None:
+                    # Back off while a worker keeps dying right after start (e.g. broken artifacts)
+                    delays[i] = min(delays[i] * 2, 60.0) if now - started[i] < 10.0 else restart_delay
+                    restart_at[i] = now + delays[i]
+                    print(f"[WARNING] Worker {i} exited with code {p.exitcode}; restarting in {delays[i]:.0f}s")
+                elif now >= restart_at[i]:
+                    procs[i], started[i] = spawn(i)
+                    restart_at[i] = None
+    except KeyboardInterrupt:
+        print("\n[INFO] Stopping workers (running jobs are retried after their lease)")
+        for p in procs:
+            p.terminate()
+            p.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Durable proof job queue")
+    parser.add_argument('--root', default=None, help="Queue directory (default model/job_queue)")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('submit', help="Queue a proof job")
+    p.add_argument('inputs', type=float, nargs=3)
+    p.add_argument('--priority', default='normal', help=f"{', '.join(priorities)} or an integer")
+    p.add_argument('--deadline', type=float, help="Skip the job if not started within this many seconds")
+    p.add_argument('--max-attempts', type=int, default=default_max_attempts)
+    p.add_argument('--model', help="Registered model (model_registry.py)")
+    p.add_argument('--profile', help="Visibility/commitment profile (see profiles.py)")
+    p = sub.add_parser('status', help="Show a job")
+    p.add_argument('job_id', type=int)
+    p = sub.add_parser('result', help="Fetch a job's proof")
+    p.add_argument('job_id', type=int)
+    p.add_argument('--wait', type=float, help="Seconds to wait for it to finish")
+    p.add_argument('--out', help="Write proof.json here")
+    p = sub.add_parser('cancel', help="Cancel a queued job")
+    p.add_argument('job_id', type=int)
+    p = sub.add_parser('worker', help="Run worker processes")
+    p.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    p.add_argument('--lease', type=float, default=default_lease, help="Lease seconds per claim")
+    p.add_argument('--no-cache', action='store_true', help="Never reuse proofs from the proof store")
+    sub.add_parser('stats', help="Queue counts and latency")
+    args = parser.parse_args()
+
+    if args.command == 'result' and args.out:
+        args.out = os.path.abspath(args.out)
+    root = os.path.abspath(args.root or default_root)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        if args.command == 'worker':
+            import generate_proof as gp
+            gp.ensure_calibration_data()
+            if not gp.setup_circuit():
+                raise Exception("PK/VK setup failed; cannot prove")
+            run_workers(args.workers, root, args.lease, use_store=not args.no_cache)
+            sys.exit(0)
+
+        q = JobQueue(root)
+        if args.command == 'submit':
+            model = None
+            if args.model:
+                import model_registry
+                model = model_registry.resolve(args.model)
+            if args.profile or model:
+                # Workers only set up the default circuit; stdout is reserved for the job id
+                import contextlib
+                import generate_proof as gp
+                import profiles
+                if args.profile:
+                    profiles.get_profile(args.profile)
+                with contextlib.redirect_stdout(sys.stderr):
+                    gp.ensure_calibration_data()
+                    if not gp.setup_circuit(profile=args.profile, model=model):
+                        raise Exception("PK/VK setup failed for the job's circuit")
+            job_id = q.submit(args.inputs, args.priority, args.deadline, args.max_attempts, model, args.profile)
+            print(job_id)
+        elif args.command == 'status':
+            job = q.status(args.job_id)
+            if job is None:
+                raise KeyError(f"Unknown job {args.job_id}")
+            print(json.dumps(job, indent=2))
+        elif args.command == 'result':
+            job = q.result(args.job_id, wait=args.wait)
+            if job['status'] != 'done':
+                raise Exception(f"Job {args.job_id} is {job['status']}" + (f": {job['error']}" if job['error'] else ""))
+            if args.out:
+                with open(args.out, 'w') as f:
+                    json.dump(job['result']['proof'], f)
+                print(f"[OK] Proof saved: {args.out}")
+            else:
+                print(json.dumps(job['result']['proof']))
+        elif args.command == 'cancel':
+            if not q.cancel(args.job_id):
+                raise Exception(f"Job {args.job_id} is not queued")
+            print(f"[OK] Job {args.job_id} cancelled")
+        else:
+            print(json.dumps(q.stats(), indent=2))
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
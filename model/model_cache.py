@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Memory-bounded LRU of loaded proving state for registered models.
+
+EZKL's Python API reads the compiled circuit and PK from a path on every
+prove call, so "loaded" here means staged into RAM: the model's
+settings.json, network.ezkl, pk.key and vk.key are copied into a tmpfs
+directory (workspace.scratch_root, /dev/shm when available) and job
+workspaces point at that copy. A hot model then proves without touching
+disk; a cold one is paged in on its first request.
+
+The staged bytes are bounded by max_bytes. Loading a model evicts least
+recently used models that no job is using; models in use are never
+evicted, so the budget can be exceeded temporarily (counted as
+overBudget). The SRS is shared by all models with the same logrows and is
+not staged.
+
+Entries are versioned by the source artifacts' mtime and size, so keys
+regenerated by `model_registry.py setup` are staged afresh on the next
+request and the stale copy is dropped once idle. The staging directory is
+removed by close(), and at process exit (also in pool worker processes,
+which skip atexit) through a multiprocessing finalizer.
+
+Usage:
+    cache = ModelCache(max_bytes=2 * 1024**3)
+    with cache.workspace(model_id) as ws:
+        gp.prove_input(inputs, ws)
+    cache.stats()   # hits, misses, evictions, load time percentiles
+"""
+
+import multiprocessing.util
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import generate_proof as gp
+import instrumentation
+import profiles
+from instrumentation import percentiles
+from workspace import JobWorkspace, scratch_root, shared_artifacts
+
+# Default budget for staged proving state in MB (ZK_MODEL_CACHE_MB overrides)
+default_max_mb = 2048
+
+# Load-time samples kept for percentiles
+max_load_samples = 1000
+
+
+class ModelCache:
+    """
+    LRU of staged proving artifacts, keyed by (model, profile, batch size,
+    source artifact version).
+
+    Args:
+        max_bytes: Budget for staged artifacts (default: ZK_MODEL_CACHE_MB or default_max_mb)
+        root: Staging directory parent (default: workspace.scratch_root())
+    """
+
+    def __init__(self, max_bytes=None, root=None):
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('ZK_MODEL_CACHE_MB', default_max_mb)) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.root = tempfile.mkdtemp(prefix='zkmodels-', dir=root or scratch_root())
+        # Staged PKs can be GBs of tmpfs RAM: never leave them behind
+        self._finalizer = multiprocessing.util.Finalize(
+            self, shutil.rmtree, args=(self.root,), kwargs={'ignore_errors': True}, exitpriority=10)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> {'dir', 'bytes', 'refs', 'load_s', 'stale'}
+        self._loads = 0
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.over_budget = 0
+        self._load_s = []
+
+    def _source_files(self, model, profile, batch_size):
+        """Source artifact paths of a model and their version ((mtime_ns, size) per file)"""
+        src = os.path.dirname(os.path.abspath(gp.circuit_paths(batch_size, profile, model)['settings.json']))
+        files = [os.path.join(src, name) for name in shared_artifacts.values()]
+        try:
+            version = tuple((st.st_mtime_ns, st.st_size) for st in map(os.stat, files))
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Model {model} is not set up ({e.filename} missing; "
+                                    f"run model_registry.py setup {model})")
+        return files, version
+
+    def _remove(self, key):
+        """Delete a staged entry (lock held)"""
+        entry = self._entries.pop(key)
+        shutil.rmtree(entry['dir'], ignore_errors=True)
+        self.resident_bytes -= entry['bytes']
+
+    def _drop_stale(self, key):
+        """Remove older versions of key's model; in-use ones go on their last release (lock held)"""
+        for other in [k for k in self._entries if k[:3] == key[:3] and k != key]:
+            if self._entries[other]['refs']:
+                self._entries[other]['stale'] = True
+            else:
+                self._remove(other)
+
+    def _evict_for(self, needed):
+        """Drop idle LRU entries until `needed` more bytes fit (lock held)"""
+        for key in list(self._entries):
+            if self.resident_bytes + needed <= self.max_bytes:
+                return
+            if self._entries[key]['refs']:
+                continue
+            self._remove(key)
+            self.evictions += 1
+        if self.resident_bytes + needed > self.max_bytes:
+            self.over_budget += 1
+
+    def _reserve(self, key):
+        """Make room for and register a model that is about to be staged (lock held)"""
+        size = sum(st_size for _, st_size in key[3])
+        self._evict_for(size)
+        model, profile, batch_size, _ = key
+        self._loads += 1
+        self.resident_bytes += size
+        return {'dir': os.path.join(self.root, f"{model}-{profile}-b{batch_size}-{self._loads}"),
+                'bytes': size, 'refs': 0, 'load_s': None, 'stale': False,
+                'ready': threading.Event(), 'error': None}
+
+    def _load(self, key, entry, files):
+        """Copy a reserved model's artifacts into RAM (lock not held: may take seconds per GB)"""
+        started = time.perf_counter()
+        with instrumentation.stage('model_load', model=key[0], bytes=entry['bytes']):
+            os.makedirs(entry['dir'], exist_ok=True)
+            for f in files:
+                shutil.copyfile(f, os.path.join(entry['dir'], os.path.basename(f)))
+        seconds = time.perf_counter() - started
+        with self._lock:
+            entry['load_s'] = seconds
+            self._load_s = (self._load_s + [seconds])[-max_load_samples:]
+
+    def acquire(self, model, profile=None, batch_size=1):
+        """
+        Staged artifacts directory of a model, loading it on a miss.
+
+        A miss reserves the entry under the lock and copies outside it, so
+        hits on other models never wait behind a cold load; concurrent
+        requests for the loading model wait for it to be ready.
+
+        Every acquire() must be paired with release() of the returned
+        directory; workspace() does both.
+        """
+        profile = profile or profiles.active_profile()
+        files, version = self._source_files(model, profile, batch_size)
+        key = (model, profile, batch_size, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            loading = entry is None
+            if loading:
+                self.misses += 1
+                self._drop_stale(key)
+                entry = self._entries[key] = self._reserve(key)
+            else:
+                self.hits += 1
+            self._entries.move_to_end(key)
+            entry['refs'] += 1
+
+        if loading:
+            try:
+                self._load(key, entry, files)
+            except BaseException as e:
+                with self._lock:
+                    entry['error'] = e
+                    if self._entries.get(key) is entry:
+                        self._remove(key)
+                entry['ready'].set()
+                raise
+            entry['ready'].set()
+        else:
+            entry['ready'].wait()
+            if entry['error'] is not None:
+                raise Exception(f"Loading model {model} failed: {entry['error']}")
+        return entry['dir']
+
+    def release(self, artifacts_dir):
+        """Release a directory returned by acquire()"""
+        with self._lock:
+            for key, entry in self._entries.items():
+                if entry['dir'] == artifacts_dir:
+                    entry['refs'] -= 1
+                    if entry['stale'] and not entry['refs']:
+                        self._remove(key)
+                    return
+
+    @contextmanager
+    def workspace(self, model, profile=None, batch_size=1, **kwargs):
+        """JobWorkspace on a model's staged artifacts; the model stays resident until exit"""
+        artifacts_dir = self.acquire(model, profile, batch_size)
+        try:
+            with JobWorkspace(artifacts_dir=artifacts_dir, **kwargs) as ws:
+                yield ws
+        finally:
+            self.release(artifacts_dir)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'maxBytes': self.max_bytes,
+                'residentBytes': self.resident_bytes,
+                'resident': [
+                    {'model': k[0], 'profile': k[1], 'batchSize': k[2], 'bytes': e['bytes'],
+                     'inUse': e['refs'], 'loadSeconds': e['load_s']}
+                    for k, e in self._entries.items()
+                ],
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'overBudget': self.over_budget,
+                'loadTime': percentiles(self._load_s),
+            }
+
+    def close(self):
+        """Remove all staged artifacts"""
+        with self._lock:
+            self._finalizer()
+            self._entries.clear()
+            self.resident_bytes = 0
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Registry of risk models served from one prover host.
+
+Each registered ONNX model is identified by its content hash and gets its
+own directory with a copy of the ONNX file; generate_proof keeps that
+model's settings, compiled circuit, keys and verifier there too (pass
+model=<id> to setup_circuit / circuit_paths / ensure_evm_verifier):
+
+    models/registry.json                index: id -> {sha256, name, source}
+    models/<id>/network.onnx
+    models/<id>/calibration.json        the model's calibration inputs (--calibration)
+    models/<id>/settings.json, network.ezkl, pk.key, vk.key, contracts/
+    models/<id>/profiles/<name>/...     non-default profiles
+    models/<id>/batches/b<N>/...        batched circuits
+
+The id is the first 16 hex chars of the ONNX sha256, so re-registering the
+same bytes under another name is a no-op and changed weights always get a
+new id. Names (e.g. an asset pair) are aliases for lookup.
+
+Each model should be calibrated on its own input distribution: pass
+--calibration (an {"input_data": [[...]]} file like calibration.json) to
+register or setup. Without it, setup falls back to the shared
+calibration.json of the default model and warns.
+
+The unregistered ../public/network.onnx keeps the original layout.
+
+Usage (from model/):
+    python model_registry.py register ../public/network.onnx --name btc-eth --calibration btc_eth_calibration.json
+    python model_registry.py setup btc-eth [--batch-size N] [--profile P] [--verifier] [--calibration FILE]
+    python model_registry.py list
+"""
+
+import json
+import os
+import shutil
+import sys
+from datetime import datetime, timezone
+
+import proof_store
+
+# Registry root (relative to model/, like the other artifact paths)
+models_dir = os.path.join('models')
+registry_path = os.path.join(models_dir, 'registry.json')
+
+# Length of the ONNX sha256 prefix used as model id
+model_id_length = 16
+
+
+def load_registry():
+    """{model id: {'sha256', 'name', 'source', 'registered'}}"""
+    if not os.path.exists(registry_path):
+        return {}
+    with open(registry_path, 'r') as f:
+        return json.load(f)
+
+
+def _save_registry(registry):
+    os.makedirs(models_dir, exist_ok=True)
+    tmp = registry_path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(registry, f, indent=2, sort_keys=True)
+    os.replace(tmp, registry_path)
+
+
+def model_dir(model_id):
+    return os.path.join(models_dir, model_id)
+
+
+def onnx_path(model_id):
+    return os.path.join(model_dir(model_id), 'network.onnx')
+
+
+def calibration_path(model_id):
+    """The model's own calibration inputs (may not exist, see set_calibration)"""
+    return os.path.join(model_dir(model_id), 'calibration.json')
+
+
+def set_calibration(model_id, calibration_file):
+    """Install a model's calibration inputs ({"input_data": [[...]]} JSON)"""
+    with open(calibration_file, 'r') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not data.get('input_data'):
+        raise ValueError(f"{calibration_file} has no 'input_data'")
+    os.makedirs(model_dir(model_id), exist_ok=True)
+    with open(calibration_path(model_id), 'w') as f:
+        json.dump(data, f)
+
+
+def register(onnx_file, name=None, calibration=None):
+    """
+    Add an ONNX model to the registry (idempotent for identical bytes).
+
+    Args:
+        onnx_file: Path to the ONNX model
+        name: Optional alias; moved from any model that had it
+        calibration: Optional calibration inputs file (see set_calibration)
+
+    Returns:
+        Model id
+    """
+    digest = proof_store.file_hash(onnx_file)
+    model_id = digest[:model_id_length]
+    registry = load_registry()
+    if name:
+        for entry in registry.values():
+            if entry.get('name') == name:
+                entry['name'] = None
+    entry = registry.get(model_id) or {
+        'sha256': digest,
+        'source': os.path.abspath(onnx_file),
+        'registered': datetime.now(timezone.utc).isoformat(),
+    }
+    entry['name'] = name or entry.get('name')
+    registry[model_id] = entry
+
+    os.makedirs(model_dir(model_id), exist_ok=True)
+    if not os.path.exists(onnx_path(model_id)):
+        shutil.copy(onnx_file, onnx_path(model_id))
+    if calibration:
+        set_calibration(model_id, calibration)
+    _save_registry(registry)
+    return model_id
+
+
+def resolve(ref):
+    """
+    Model id for a name, id or sha256 (prefix).
+
+    Raises:
+        KeyError for unknown or ambiguous references
+    """
+    registry = load_registry()
+    for model_id, entry in registry.items():
+        if entry.get('name') == ref:
+            return model_id
+    matches = [model_id for model_id, entry in registry.items()
+               if model_id.startswith(ref) or entry['sha256'].startswith(ref)]
+    if len(matches) == 1:
+        return matches[0]
+    if matches:
+        raise KeyError(f"Ambiguous model '{ref}' ({', '.join(sorted(matches))})")
+    raise KeyError(f"Unknown model '{ref}' (register it with model_registry.py register)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Multi-model registry")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('register', help="Register an ONNX model")
+    p.add_argument('onnx')
+    p.add_argument('--name', help="Alias, e.g. an asset pair")
+    p.add_argument('--calibration', help="Calibration inputs for this model ({\"input_data\": [[...]]})")
+    p = sub.add_parser('setup', help="Settings/calibrate/compile/PK+VK for a registered model")
+    p.add_argument('model', help="Name, id or sha256 prefix")
+    p.add_argument('--batch-size', type=int, default=1)
+    p.add_argument('--profile', help="Visibility/commitment profile (see profiles.py)")
+    p.add_argument('--verifier', action='store_true', help="Also generate the EVM verifier")
+    p.add_argument('--no-cache', action='store_true')
+    p.add_argument('--calibration', help="Replace the model's calibration inputs before setup")
+    sub.add_parser('list', help="List registered models")
+    args = parser.parse_args()
+
+    if args.command == 'register':
+        args.onnx = os.path.abspath(args.onnx)
+    if getattr(args, 'calibration', None):
+        args.calibration = os.path.abspath(args.calibration)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        if args.command == 'register':
+            model_id = register(args.onnx, args.name, args.calibration)
+            print(f"[OK] Registered {args.onnx} as {model_id}" + (f" ({args.name})" if args.name else ""))
+        elif args.command == 'setup':
+            import generate_proof as gp
+            model_id = resolve(args.model)
+            if args.calibration:
+                set_calibration(model_id, args.calibration)
+            gp.ensure_calibration_data()
+            if not gp.setup_circuit(use_cache=not args.no_cache, batch_size=args.batch_size,
+                                    profile=args.profile, model=model_id):
+                raise Exception(f"PK/VK setup failed for model {model_id}")
+            if args.verifier:
+                gp.ensure_evm_verifier(profile=args.profile, batch_size=args.batch_size, model=model_id)
+                print(f"[OK] Verifier: {gp.verifier_paths(args.profile, args.batch_size, model_id)[0]}")
+            print(f"[OK] Model {model_id} ready: {model_dir(model_id)}")
+        else:
+            registry = load_registry()
+            if not registry:
+                print("[INFO] No registered models")
+            for model_id, entry in sorted(registry.items()):
+                ready = os.path.exists(os.path.join(model_dir(model_id), 'pk.key'))
+                print(f"  {model_id}  {entry.get('name') or '-':<16} {'ready' if ready else 'not set up':<11} "
+                      f"{entry['source']}")
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
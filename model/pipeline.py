@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipelined proving: witness generation for request N+1 overlaps proving of
+request N.
+
+    submit() --[jobs q]--> witness workers --[witnessed q]--> prove workers --[results q]--> results()
+
+Both queues are bounded, so a slow prover stalls witness generation and a
+full jobs queue blocks submit(): memory stays flat under sustained load.
+Each worker process warms the circuit/PK/SRS once (generate_proof.warm_prover)
+and jobs move between stages as a JobWorkspace directory, never as copies
+of the witness. The EVM verifier is not part of the per-proof path; it is
+regenerated only when the VK changes (generate_proof.ensure_evm_verifier).
+
+Usage (from model/):
+    python pipeline.py rows.csv --witness-workers 1 --prove-workers 2 --queue-size 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+import generate_proof as gp
+import proof_store
+from workspace import JobWorkspace
+
+_STOP = None
+
+# Seconds between worker liveness checks while waiting for a result
+worker_check_s = 1.0
+
+
+def _witness_worker(model_dir, jobs, witnessed, results, use_store):
+    """Stage 1: input JSON + proof store lookup + gen_witness"""
+    gp.warm_prover(model_dir)
+    store = proof_store.open_store() if use_store else None
+    while True:
+        job = jobs.get()
+        if job is _STOP:
+            break
+        job_id, inputs, submitted = job
+        started = time.perf_counter()
+        ws = JobWorkspace(prefix='zkpipe-')
+        try:
+            if store is not None:
+                key = proof_store.proof_key(inputs, gp.load_settings(ws.settings_path), ws.compiled_model_path, ws.vk_path)
+                cached = store.get(key)
+                if cached is not None:
+                    ws.cleanup()
+                    results.put({'id': job_id, 'inputs': inputs, 'proof': cached['proof'], 'cached': True,
+                                 'submitted': submitted, 'witness_s': 0.0, 'prove_s': 0.0})
+                    continue
+            else:
+                key = None
+            with open(ws.input_path, 'w') as f:
+                json.dump(dict(input_data=[inputs]), f)
+            gp.ezkl.gen_witness(ws.input_path, ws.compiled_model_path, ws.witness_path)
+            # Blocks while the prove stage is saturated (backpressure)
+            witnessed.put((job_id, inputs, submitted, ws.directory, key, time.perf_counter() - started))
+        except BaseException as e:
+            # Rust panics (pyo3 PanicException) derive from BaseException
+            ws.cleanup()
+            results.put({'id': job_id, 'inputs': inputs, 'error': f"witness: {e}", 'submitted': submitted})
+            if isinstance(e, (KeyboardInterrupt, SystemExit)):
+                raise
+
+
+def _prove_worker(model_dir, witnessed, results, use_store):
+    """Stage 2: prove from a witnessed workspace"""
+    gp.warm_prover(model_dir)
+    store = proof_store.open_store() if use_store else None
+    while True:
+        item = witnessed.get()
+        if item is _STOP:
+            break
+        job_id, inputs, submitted, directory, key, witness_s = item
+        ws = JobWorkspace(directory=directory, owned=True)
+        started = time.perf_counter()
+        try:
+            gp.ezkl.prove(ws.witness_path, ws.compiled_model_path, ws.pk_path, ws.proof_path,
+                          "single", srs_path=ws.srs_path)
+            with open(ws.proof_path, 'r') as f:
+                proof = json.load(f)
+            if store is not None:
+                with open(ws.witness_path, 'r') as f:
+                    store.put(key, proof, json.load(f))
+            results.put({'id': job_id, 'inputs': inputs, 'proof': proof, 'cached': False, 'submitted': submitted,
+                         'witness_s': witness_s, 'prove_s': time.perf_counter() - started})
+        except BaseException as e:
+            # Rust panics (pyo3 PanicException) derive from BaseException
+            results.put({'id': job_id, 'inputs': inputs, 'error': f"prove: {e}", 'submitted': submitted})
+            if isinstance(e, (KeyboardInterrupt, SystemExit)):
+                raise
+        finally:
+            ws.cleanup()
+
+
+class ProvingPipeline:
+    """
+    Two-stage witness/prove pipeline over worker processes.
+
+    Args:
+        witness_workers: Processes running gen_witness
+        prove_workers: Processes running prove
+        queue_size: Capacity of each inter-stage queue
+        use_store: Consult/populate the proof store
+    """
+
+    def __init__(self, witness_workers=1, prove_workers=1, queue_size=4, use_store=True):
+        self.model_dir = os.path.dirname(os.path.abspath(__file__))
+        self.witness_workers = witness_workers
+        self.prove_workers = prove_workers
+        self.jobs = multiprocessing.Queue(queue_size)
+        self.witnessed = multiprocessing.Queue(queue_size)
+        self.results = multiprocessing.Queue()
+        self.use_store = use_store
+        self._witness_procs = []
+        self._prove_procs = []
+        self._broken = False
+
+    def start(self):
+        for _ in range(self.witness_workers):
+            p = multiprocessing.Process(
+                target=_witness_worker,
+                args=(self.model_dir, self.jobs, self.witnessed, self.results, self.use_store),
+                daemon=True,
+            )
+            p.start()
+            self._witness_procs.append(p)
+        for _ in range(self.prove_workers):
+            p = multiprocessing.Process(
+                target=_prove_worker,
+                args=(self.model_dir, self.witnessed, self.results, self.use_store),
+                daemon=True,
+            )
+            p.start()
+            self._prove_procs.append(p)
+        return self
+
+    def submit(self, job_id, inputs):
+        """Queue a job; blocks while the pipeline is full"""
+        self.jobs.put((job_id, [float(v) for v in inputs], time.time()))
+
+    def get_result(self, timeout=None):
+        """
+        Next finished job (completion order), with end-to-end latency.
+
+        Raises queue.Empty after timeout seconds, or an Exception if a worker
+        process died (its in-flight job would otherwise never report).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = worker_check_s if deadline is None else max(0.0, min(worker_check_s, deadline - time.monotonic()))
+            try:
+                result = self.results.get(timeout=wait)
+                break
+            except queue.Empty:
+                self.check_workers()
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise
+        result['latency_s'] = time.time() - result['submitted']
+        return result
+
+    def check_workers(self):
+        """Raise if a worker process exited before close()"""
+        for p in self._witness_procs + self._prove_procs:
+            if not p.is_alive():
+                self._broken = True
+                raise Exception(f"Pipeline worker {p.name} exited with code {p.exitcode}")
+
+    def close(self):
+        """Drain both stages in order and stop the workers"""
+        if self._broken:
+            # A dead stage cannot drain: stop whatever is left
+            for p in self._witness_procs + self._prove_procs:
+                p.terminate()
+                p.join()
+            return
+        for _ in self._witness_procs:
+            self.jobs.put(_STOP)
+        for p in self._witness_procs:
+            p.join()
+        for _ in self._prove_procs:
+            self.witnessed.put(_STOP)
+        for p in self._prove_procs:
+            p.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def run(rows, witness_workers, prove_workers, queue_size, out_dir, use_store=True):
+    """
+    Push rows through the pipeline and collect results.
+
+    Returns:
+        Summary dict (also written to <out_dir>/summary.json)
+    """
+    import threading
+    from instrumentation import percentiles
+
+    proofs_dir = os.path.join(out_dir, 'proofs')
+    os.makedirs(proofs_dir, exist_ok=True)
+    results = []
+    started = time.perf_counter()
+    with ProvingPipeline(witness_workers, prove_workers, queue_size, use_store) as pipe:
+        # Feed from a thread so result collection never blocks on a full jobs queue
+        feeder = threading.Thread(target=lambda: [pipe.submit(i, row) for i, row in enumerate(rows)], daemon=True)
+        feeder.start()
+        for _ in range(len(rows)):
+            r = pipe.get_result()
+            if 'proof' in r:
+                with open(os.path.join(proofs_dir, f"row_{r['id']:06d}.json"), 'w') as f:
+                    json.dump(r.pop('proof'), f)
+            else:
+                print(f"  [ERROR] row {r['id']}: {r['error']}")
+            results.append(r)
+        feeder.join()
+    elapsed = time.perf_counter() - started
+
+    ok = [r for r in results if 'error' not in r]
+    proved = [r for r in ok if not r['cached']]
+    summary = {
+        'rows': len(rows),
+        'succeeded': len(ok),
+        'cached': len(ok) - len(proved),
+        'failed': len(results) - len(ok),
+        'witnessWorkers': witness_workers,
+        'proveWorkers': prove_workers,
+        'queueSize': queue_size,
+        'elapsedSeconds': elapsed,
+        'proofsPerSecond': len(ok) / elapsed if elapsed > 0 else 0.0,
+        'witnessTime': percentiles([r['witness_s'] for r in proved]),
+        'proveTime': percentiles([r['prove_s'] for r in proved]),
+        'latency': percentiles([r['latency_s'] for r in ok]),
+    }
+    with open(os.path.join(out_dir, 'summary.json'), 'w') as f:
+        json.dump(dict(summary, results=sorted(results, key=lambda r: r['id'])), f, indent=2)
+    return summary
+
+
+if __name__ == "__main__":
+    from batch_prove import read_rows
+
+    parser = argparse.ArgumentParser(description="Pipelined witness/prove over many input rows")
+    parser.add_argument('input', help="CSV or JSONL file of input rows")
+    parser.add_argument('--witness-workers', type=int, default=1)
+    parser.add_argument('--prove-workers', type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument('--queue-size', type=int, default=4)
+    parser.add_argument('--out', default='pipeline_output')
+    parser.add_argument('--no-cache', action='store_true', help="Full setup and no proof store")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        rows = read_rows(args.input)
+        gp.ensure_calibration_data()
+        if not gp.setup_circuit(use_cache=not args.no_cache):
+            raise Exception("PK/VK setup failed; cannot prove")
+        if gp.ensure_evm_verifier():
+            print("[OK] VK changed, Verifier.sol regenerated")
+
+        summary = run(rows, args.witness_workers, args.prove_workers, args.queue_size, args.out,
+                      use_store=not args.no_cache)
+        print("\n" + "=" * 60)
+        print(f"[OK] {summary['succeeded']}/{summary['rows']} proofs ({summary['cached']} from store) "
+              f"in {summary['elapsedSeconds']:.2f}s = {summary['proofsPerSecond']:.2f} proofs/sec")
+        if summary['proveTime']:
+            print(f"     witness p50={summary['witnessTime']['p50']:.3f}s  prove p50={summary['proveTime']['p50']:.3f}s  "
+                  f"latency p90={summary['latency']['p90']:.3f}s")
+        print("=" * 60)
+        if summary['failed']:
+            sys.exit(1)
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Circuit profiles: named visibility/commitment settings.
+
+A profile overrides the gen_settings run args (input/output/param
+visibility, commitment scheme). Visibility decides what ends up as
+`instances` calldata (public), as a Poseidon hash of the values (hashed),
+as a KZG commitment (polycommit) or not at all (private), which changes
+proof size, prove time and on-chain verify gas.
+
+Every profile except 'default' keeps its settings, circuit, keys and
+verifier under profiles/<name>/, so switching profiles never invalidates
+another profile's artifacts. Extra or overriding profiles can be defined
+in profiles.json next to this file:
+
+    {"hashed-out": {"output_visibility": "hashed"}}
+
+Select with --profile <name> or ZK_PROFILE=<name>.
+"""
+
+import json
+import os
+
+# Profile used when none is selected (the original public/public/fixed, KZG layout)
+default_profile = 'default'
+
+# Built-in profiles: run-arg overrides on top of generate_proof.run_args
+builtin_profiles = {
+    'default': {},
+    # Inputs enter the circuit as a Poseidon hash: 1 instance instead of 3
+    'hashed-inputs': {'input_visibility': 'hashed'},
+    # Inputs stay off-chain entirely; only the prediction is public
+    'private-inputs': {'input_visibility': 'private'},
+    # Inputs committed with KZG inside the proof (no instances for them)
+    'polycommit-inputs': {'input_visibility': 'polycommit'},
+    # Model weights hashed instead of baked into the circuit as constants
+    'hashed-params': {'param_visibility': 'hashed'},
+    # IPA commitments: no trusted setup, but no EVM verifier either
+    'ipa': {'commitment': 'ipa'},
+}
+
+# Optional user-defined profiles
+profiles_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles.json')
+
+# Artifact root for non-default profiles (relative to model/)
+profiles_dir = os.path.join('profiles')
+
+
+def load_profiles():
+    """Built-in profiles merged with profiles.json (if present)"""
+    profiles = {name: dict(args) for name, args in builtin_profiles.items()}
+    if os.path.exists(profiles_path):
+        with open(profiles_path, 'r') as f:
+            for name, args in json.load(f).items():
+                profiles[name] = dict(args)
+    return profiles
+
+
+def get_profile(name=None):
+    """
+    Run-arg overrides for a profile.
+
+    Args:
+        name: Profile name; None selects ZK_PROFILE or 'default'
+
+    Raises:
+        KeyError for an unknown profile
+    """
+    name = name or active_profile()
+    profiles = load_profiles()
+    if name not in profiles:
+        raise KeyError(f"Unknown profile '{name}' (available: {', '.join(sorted(profiles))})")
+    return profiles[name]
+
+
+def active_profile():
+    return os.environ.get('ZK_PROFILE') or default_profile
+
+
+def profile_dir(name):
+    """Artifact directory of a profile ('.' for the default layout)"""
+    if name == default_profile:
+        return '.'
+    return os.path.join(profiles_dir, name)
+
+
+def commitment(name):
+    """Commitment scheme of a profile ('kzg' unless overridden)"""
+    return str(get_profile(name).get('commitment') or 'kzg').lower()
+
+
+def supports_evm(name):
+    """EZKL only generates Solidity verifiers for KZG"""
+    return commitment(name) == 'kzg'
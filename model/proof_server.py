@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Long-lived ZK proving server for services/zkService.ts.
+
+Endpoints (JSON over HTTP, CORS enabled for the Vite dev server):
+    POST /generate-proof  {"inputs": [btcVol, ethGas, volume], "prediction": float, "model": optional}
+        -> {"proof", "witness", "publicInputs", "proofSize", "calldata"}
+    POST /verify-proof    {"proof": hex or proof.json object, "publicInputs": [...], "model": optional}
+        -> {"valid": bool}   (404 for a hex proof this server did not generate)
+    GET  /health
+
+Setup (settings, circuit, PK/VK, SRS) runs once at startup, normally as an
+artifact cache hit. Proving and verification are CPU-bound and run in a
+process pool whose workers import ezkl and warm the artifacts once
+(generate_proof.warm_prover), so the event loop only parses requests and
+ships results.
+
+"calldata" is the ABI-encoded MonadPriceGuard.verifyPrediction call
+(calldata_encoder.py), ready to send as transaction data.
+
+/verify-proof binds a proof to its claimed inputs: "publicInputs" (as
+returned by /generate-proof) must match the proof's rescaled public
+inputs, otherwise the answer is valid: false. A proof that makes ezkl
+panic is reported as invalid, and a pool whose worker died is replaced.
+
+"model" selects a registered model (model_registry.py) by name or id.
+Each worker keeps recently used models' proving state staged in RAM
+(model_cache.py) within its share of --model-cache-mb; /health reports
+the workers' hit/miss/eviction counts and load times.
+
+Usage (from model/):
+    python proof_server.py [--host 127.0.0.1] [--port 8000] [--workers 2]
+    python proof_server.py --models btc-eth sol-eth --model-cache-mb 4096
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import calldata_encoder
+import generate_proof as gp
+import model_registry
+import proof_store
+from model_cache import ModelCache
+from workspace import JobWorkspace
+
+# Recently generated proofs, so /verify-proof can check a proof by its hex
+max_remembered_proofs = 1024
+
+# Max accepted request body
+max_body_bytes = 4 * 1024 * 1024
+
+_status_text = {
+    200: 'OK',
+    204: 'No Content',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    422: 'Unprocessable Entity',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+_model_cache = None
+
+def _prove_job(inputs, use_store):
+    """Witness + prove one input vector in a private job workspace"""
+    store = proof_store.open_store() if use_store else None
+    with JobWorkspace() as ws:
+        return gp.prove_input(inputs, ws, store=store)
+
+def _prove_model_job(inputs, use_store, model):
+    """Witness + prove on a registered model, paging its proving state in if cold"""
+    global _model_cache
+    if _model_cache is None:
+        _model_cache = ModelCache()
+    store = proof_store.open_store() if use_store else None
+    with _model_cache.workspace(model) as ws:
+        proof, witness = gp.prove_input(inputs, ws, store=store)
+    return proof, witness, os.getpid(), _model_cache.stats()
+
+def _verify_job(proof, model=None):
+    """Verify a proof.json dict against the warm VK/settings"""
+    artifacts_dir = None
+    if model is not None:
+        artifacts_dir = os.path.dirname(os.path.abspath(gp.circuit_paths(model=model)['settings.json']))
+    with JobWorkspace(prefix='zkverify-', artifacts_dir=artifacts_dir) as ws:
+        with open(ws.proof_path, 'w') as f:
+            json.dump(proof, f)
+        return bool(gp.ezkl.verify(ws.proof_path, ws.settings_path, ws.vk_path, srs_path=ws.srs_path))
+
+
+# ---------------------------------------------------------------------------
+# Event loop side
+# ---------------------------------------------------------------------------
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ProofServer:
+    """
+    Routes HTTP requests and dispatches ezkl work to the process pool.
+
+    Args:
+        make_pool: Callable returning a new ProcessPoolExecutor (also used
+                   to replace a pool broken by a dead worker)
+        use_store: Consult/populate the proof store
+    """
+
+    def __init__(self, make_pool, use_store=True):
+        self.make_pool = make_pool
+        self.pool = make_pool()
+        self.use_store = use_store
+        self.proofs = OrderedDict()  # proof hex -> proof.json dict
+        self.model_cache_stats = {}  # worker pid -> ModelCache.stats()
+
+    def _remember(self, proof_hex, proof):
+        self.proofs[proof_hex] = proof
+        self.proofs.move_to_end(proof_hex)
+        while len(self.proofs) > max_remembered_proofs:
+            self.proofs.popitem(last=False)
+
+    async def _run(self, fn, *args):
+        """
+        Run fn in the pool. Rust panics (pyo3 PanicException, a BaseException)
+        and dead workers surface as plain Exceptions so the request still
+        gets a response; a broken pool is replaced for later requests.
+        """
+        pool = self.pool
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            if self.pool is pool:
+                print("[WARNING] Worker process died; restarting the process pool")
+                self.pool = self.make_pool()
+                pool.shutdown(wait=False, cancel_futures=True)
+            raise Exception("worker process died")
+        except BaseException as e:
+            if isinstance(e, (KeyboardInterrupt, SystemExit, asyncio.CancelledError)):
+                raise
+            if isinstance(e, Exception):
+                raise
+            raise Exception(f"ezkl panic: {e}") from e
+
+    def _model(self, body):
+        """Registered model id of a request, or None for the default model"""
+        if body.get('model') is None:
+            return None
+        try:
+            return model_registry.resolve(str(body['model']))
+        except KeyError as e:
+            raise HttpError(404, e.args[0])
+
+    async def generate_proof(self, body):
+        inputs = body.get('inputs')
+        if not isinstance(inputs, list) or len(inputs) != 3:
+            raise HttpError(400, "'inputs' must be [BTC Vol, ETH Gas, Market Volume]")
+        try:
+            inputs = [float(v) for v in inputs]
+        except (TypeError, ValueError):
+            raise HttpError(400, "'inputs' must be numbers")
+
+        model = self._model(body)
+        if model is None:
+            proof, witness = await self._run(_prove_job, inputs, self.use_store)
+        else:
+            proof, witness, pid, stats = await self._run(_prove_model_job, inputs, self.use_store, model)
+            self.model_cache_stats[pid] = stats
+
+        proof_hex = gp.proof_to_hex(proof)
+        self._remember(proof_hex, proof)
+        public_inputs = gp.public_inputs_from_proof(proof)
+        if public_inputs is None:
+            public_inputs = inputs + [body['prediction']] if 'prediction' in body else inputs
+        return {
+            'proof': proof_hex,
+            'witness': witness,
+            'publicInputs': public_inputs,
+            'proofSize': (len(proof_hex) - 2) // 2,
+            'calldata': '0x' + calldata_encoder.encode_proof(proof).hex(),
+        }
+
+    async def verify_proof(self, body):
+        proof = body.get('proof')
+        if isinstance(proof, str):
+            proof = self.proofs.get(proof if proof.startswith('0x') else '0x' + proof)
+            if proof is None:
+                # Not verified, not invalid: e.g. generated before a restart or by another instance
+                raise HttpError(404, "Unknown proof hex; send the full proof.json object")
+        if not isinstance(proof, dict):
+            raise HttpError(400, "'proof' must be a hex string or a proof.json object")
+
+        claimed = body.get('publicInputs')
+        if claimed is not None:
+            if not isinstance(claimed, list):
+                raise HttpError(400, "'publicInputs' must be a list of numbers")
+            actual = gp.public_inputs_from_proof(proof)
+            if actual is None:
+                raise HttpError(422, "Proof carries no rescaled public inputs to check 'publicInputs' against")
+            try:
+                matches = len(claimed) == len(actual) and all(
+                    math.isclose(float(c), a, rel_tol=1e-9, abs_tol=1e-12) for c, a in zip(claimed, actual))
+            except (TypeError, ValueError):
+                raise HttpError(400, "'publicInputs' must be a list of numbers")
+            if not matches:
+                return {'valid': False, 'error': 'publicInputs do not match the proof'}
+
+        model = self._model(body)
+        try:
+            valid = await self._run(_verify_job, proof, model)
+        except Exception as e:
+            return {'valid': False, 'error': str(e)}
+        return {'valid': valid}
+
+    async def route(self, method, path, body):
+        if method == 'GET' and path == '/health':
+            health = {'status': 'ok', 'rememberedProofs': len(self.proofs)}
+            if self.use_store:
+                health['proofStore'] = proof_store.open_store().stats()
+            if self.model_cache_stats:
+                health['modelCache'] = {str(pid): stats for pid, stats in self.model_cache_stats.items()}
+            return health
+        routes = {
+            '/generate-proof': self.generate_proof,
+            '/verify-proof': self.verify_proof,
+        }
+        if path not in routes:
+            raise HttpError(404, f"No route for {path}")
+        if method != 'POST':
+            raise HttpError(405, f"{method} not allowed on {path}")
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            raise HttpError(400, "Body must be JSON")
+        if not isinstance(payload, dict):
+            raise HttpError(400, "Body must be a JSON object")
+        return await routes[path](payload)
+
+    async def handle(self, reader, writer):
+        status, result = 200, None
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                writer.close()
+                return
+            method, path, _ = request_line.decode('latin-1').split(' ', 2)
+            path = path.split('?', 1)[0]
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get('content-length', 0))
+            if length > max_body_bytes:
+                raise HttpError(413, "Request body too large")
+            body = await reader.readexactly(length) if length else b''
+
+            if method == 'OPTIONS':
+                status = 204
+            else:
+                result = await self.route(method, path, body)
+        except HttpError as e:
+            status, result = e.status, {'error': str(e)}
+        except Exception as e:
+            print(f"[ERROR] Request failed: {e}")
+            status, result = 500, {'error': str(e)}
+
+        payload = b'' if result is None else json.dumps(result).encode('utf-8')
+        head = [
+            f"HTTP/1.1 {status} {_status_text.get(status, '')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(payload)}",
+            "Access-Control-Allow-Origin: *",
+            "Access-Control-Allow-Methods: GET, POST, OPTIONS",
+            "Access-Control-Allow-Headers: Content-Type",
+            "Connection: close",
+        ]
+        try:
+            writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + payload)
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(host, port, workers, use_store=True, models=(), model_cache_mb=None):
+    model_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(model_dir)
+
+    # One-time setup; normally an artifact cache hit
+    gp.ensure_calibration_data()
+    if not gp.setup_circuit():
+        raise Exception("PK/VK setup failed; cannot serve real proofs")
+    for ref in models:
+        model = model_registry.resolve(ref)
+        if not gp.setup_circuit(model=model):
+            raise Exception(f"PK/VK setup failed for model {ref} ({model})")
+    if model_cache_mb is not None:
+        # Per-worker share, read by ModelCache in the worker processes
+        os.environ['ZK_MODEL_CACHE_MB'] = str(max(1, model_cache_mb // workers))
+
+    def make_pool():
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=gp.warm_prover,
+            initargs=(model_dir,),
+        )
+    server = ProofServer(make_pool, use_store=use_store)
+    srv = await asyncio.start_server(server.handle, host, port)
+    print(f"[OK] Proving server listening on http://{host}:{port} ({workers} worker(s))")
+    try:
+        async with srv:
+            await srv.serve_forever()
+    finally:
+        server.pool.shutdown(wait=True, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EZKL proving server")
+    parser.add_argument('--host', default=os.environ.get('ZK_API_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('ZK_API_PORT', 8000)))
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument('--no-proof-store', action='store_true', help="Always prove, never reuse stored proofs")
+    parser.add_argument('--models', nargs='+', default=[], help="Registered models to set up at startup")
+    parser.add_argument('--model-cache-mb', type=int,
+                        help="RAM budget for staged model proving state, split across workers")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, use_store=not args.no_proof_store,
+                          models=args.models, model_cache_mb=args.model_cache_mb))
+    except KeyboardInterrupt:
+        print("\n[OK] Server stopped")
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
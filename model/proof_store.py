@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistent proof store: skip proving inputs that were already proven.
+
+Inputs are quantized with the calibrated input scale exactly like the
+circuit does (round(x * 2^scale)), so near-identical
+[BTC Vol, ETH Gas, Market Volume] vectors that map to the same circuit
+input share one entry. The key also covers the compiled circuit and VK
+hashes, so a new model, calibration or key set never serves stale proofs.
+
+Layout (default model/proof_store/):
+    index.sqlite              key -> blob, size, timestamps, hit count
+    blobs/ab/<key>.json       {"proof": ..., "witness": ...}
+
+Eviction is LRU by last access, bounded by total blob bytes and entry age.
+Hit/miss counters are persisted so they survive restarts and aggregate
+across worker processes.
+
+Usage (from model/):
+    python proof_store.py stats
+    python proof_store.py evict
+    python proof_store.py clear
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+# Defaults (override per store)
+default_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'proof_store')
+default_max_bytes = 1024 * 1024 * 1024  # 1 GiB of proof blobs
+default_max_age = 7 * 24 * 3600  # seconds
+
+# Run eviction every N puts
+evict_every = 64
+
+_file_hashes = {}
+_stores = {}
+
+
+def file_hash(path):
+    """sha256 of a file, memoized per (path, mtime, size)"""
+    st = os.stat(path)
+    cache_key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    digest = _file_hashes.get(cache_key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _file_hashes[cache_key] = digest
+    return digest
+
+
+def input_scale(settings):
+    """Calibrated input scale from a settings.json dict"""
+    scales = settings.get('model_input_scales')
+    if scales:
+        return scales[0]
+    return settings['run_args']['input_scale']
+
+
+def quantize(values, scale):
+    """Quantize floats to the circuit's fixed-point integers"""
+    multiplier = 2 ** scale
+    return [int(round(float(v) * multiplier)) for v in values]
+
+
+def proof_key(input_data, settings, compiled_file, vk_file):
+    """
+    Store key for an input vector under the current circuit and VK.
+
+    Args:
+        input_data: List of floats
+        settings: settings.json dict (for the input scale)
+        compiled_file: Compiled circuit path
+        vk_file: Verification key path
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps(quantize(input_data, input_scale(settings))).encode('utf-8'))
+    h.update(b'\0')
+    h.update(file_hash(compiled_file).encode('ascii'))
+    h.update(b'\0')
+    h.update(file_hash(vk_file).encode('ascii'))
+    return h.hexdigest()
+
+
+class ProofStore:
+    """
+    SQLite index + blob files.
+
+    Args:
+        root: Store directory
+        max_bytes: Evict least recently used entries above this many blob bytes
+        max_age: Evict entries older than this many seconds (None = never)
+    """
+
+    def __init__(self, root=None, max_bytes=default_max_bytes, max_age=default_max_age):
+        self.root = os.path.abspath(root or default_root)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(os.path.join(self.root, 'blobs'), exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(self.root, 'index.sqlite'), timeout=30, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS proofs (
+                key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS proofs_last_access ON proofs(last_access)')
+        self.db.execute('CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        self._puts = 0
+
+    def _blob_path(self, key):
+        return os.path.join(self.root, 'blobs', key[:2], f'{key}.json')
+
+    def _count(self, name):
+        self.db.execute(
+            'INSERT INTO counters(name, value) VALUES (?, 1) '
+            'ON CONFLICT(name) DO UPDATE SET value = value + 1', (name,))
+
+    def get(self, key):
+        """
+        Look up a stored result.
+
+        Returns:
+            {"proof": ..., "witness": ...} or None on miss
+        """
+        row = self.db.execute('SELECT created FROM proofs WHERE key = ?', (key,)).fetchone()
+        now = time.time()
+        if row is not None and (self.max_age is None or now - row[0] <= self.max_age):
+            try:
+                with open(self._blob_path(key), 'r') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                entry = None
+            if entry is not None:
+                self.db.execute('UPDATE proofs SET last_access = ?, hits = hits + 1 WHERE key = ?', (now, key))
+                self._count('hits')
+                return entry
+            self._delete(key)
+        self._count('misses')
+        return None
+
+    def put(self, key, proof, witness=None):
+        """Store a proof (and its witness) under key"""
+        path = self._blob_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, 'w') as f:
+            json.dump({'proof': proof, 'witness': witness}, f)
+        os.replace(tmp, path)
+        now = time.time()
+        self.db.execute(
+            'INSERT OR REPLACE INTO proofs(key, size, created, last_access, hits) VALUES (?, ?, ?, ?, 0)',
+            (key, os.path.getsize(path), now, now))
+        self._puts += 1
+        if self._puts % evict_every == 0:
+            self.evict()
+
+    def _delete(self, key):
+        self.db.execute('DELETE FROM proofs WHERE key = ?', (key,))
+        try:
+            os.remove(self._blob_path(key))
+        except OSError:
+            pass
+
+    def evict(self):
+        """
+        Drop expired entries, then least recently used ones above max_bytes.
+
+        Returns:
+            Number of entries evicted
+        """
+        evicted = 0
+        if self.max_age is not None:
+            cutoff = time.time() - self.max_age
+            for (key,) in self.db.execute('SELECT key FROM proofs WHERE created < ?', (cutoff,)).fetchall():
+                self._delete(key)
+                evicted += 1
+        total = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM proofs').fetchone()[0]
+        if self.max_bytes is not None and total > self.max_bytes:
+            for key, size in self.db.execute('SELECT key, size FROM proofs ORDER BY last_access').fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._delete(key)
+                total -= size
+                evicted += 1
+        if evicted:
+            self.db.execute(
+                'INSERT INTO counters(name, value) VALUES (?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value', ('evictions', evicted))
+        return evicted
+
+    def clear(self):
+        for (key,) in self.db.execute('SELECT key FROM proofs').fetchall():
+            self._delete(key)
+        self.db.execute('DELETE FROM counters')
+
+    def stats(self):
+        counters = dict(self.db.execute('SELECT name, value FROM counters').fetchall())
+        entries, total = self.db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM proofs').fetchone()
+        hits, misses = counters.get('hits', 0), counters.get('misses', 0)
+        return {
+            'entries': entries,
+            'bytes': total,
+            'hits': hits,
+            'misses': misses,
+            'evictions': counters.get('evictions', 0),
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    def close(self):
+        self.db.close()
+
+
+def open_store(root=None):
+    """Per-process shared ProofStore (SQLite connections are not fork-safe)"""
+    root = os.path.abspath(root or default_root)
+    cache_key = (root, os.getpid())
+    if cache_key not in _stores:
+        _stores[cache_key] = ProofStore(root)
+    return _stores[cache_key]
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    store = ProofStore(sys.argv[2] if len(sys.argv) > 2 else None)
+    if command == 'stats':
+        for name, value in store.stats().items():
+            print(f"  {name}: {value}")
+    elif command == 'evict':
+        print(f"[OK] Evicted {store.evict()} entr(ies)")
+    elif command == 'clear':
+        store.clear()
+        print("[OK] Proof store cleared")
+    else:
+        print("usage: proof_store.py stats|evict|clear [store_dir]")
+        sys.exit(2)
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Float reference evaluation of the circuit, plus a quantization pre-check.
+
+    float_reference()   ../public/network.onnx through onnxruntime over an
+                        [N, 3] array in one vectorized call per chunk
+    circuit_outputs()   the circuit's dequantized outputs from gen_witness,
+                        spread over worker processes
+    error_stats()       abs/rel error percentiles + log10 histogram
+    precheck()          rejects rows whose quantized inputs (or float
+                        outputs) fall outside the calibrated lookup range
+                        or are not finite, without touching ezkl
+
+The CLI compares the current circuit, and optionally candidate circuits at
+other scales (built like calibrate.py does), against the float model over a
+whole dataset, and writes eval_output/accuracy_report.json.
+
+Usage (from model/):
+    python reference_eval.py rows.csv --scales 2 4 6 --workers 4
+    python reference_eval.py rows.csv --precheck-only   # exit 1 if any row is rejected
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import generate_proof as gp
+from instrumentation import percentiles
+from workspace import JobWorkspace
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Report and candidate circuits
+eval_dir = os.path.join('eval_output')
+report_path = os.path.join(eval_dir, 'accuracy_report.json')
+
+# Rows per onnxruntime call (bounds memory for very large arrays)
+reference_chunk_rows = 65536
+
+# Rows per gen_witness task
+witness_chunk_rows = 64
+
+# Abs error histogram bucket edges (log10 decades)
+error_bins = [0.0] + [10.0 ** e for e in range(-8, 3)] + [math.inf]
+
+
+def _require_numpy():
+    if np is None:
+        raise Exception("numpy is required: pip install numpy onnxruntime")
+
+
+def float_reference(rows, onnx_file=None, chunk_rows=reference_chunk_rows):
+    """
+    Float outputs of the ONNX model for many rows.
+
+    The model's batch dimension is symbolic, so each chunk is a single
+    session.run on an [n, 3] float32 array.
+
+    Returns:
+        np.ndarray [N, outputs per row]
+    """
+    _require_numpy()
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        raise Exception("onnxruntime is required: pip install onnxruntime")
+    session = ort.InferenceSession(onnx_file or gp.model_path, providers=['CPUExecutionProvider'])
+    input_name = session.get_inputs()[0].name
+    data = np.asarray(rows, dtype=np.float32).reshape(len(rows), -1)
+    chunks = []
+    for start in range(0, len(data), chunk_rows):
+        out = session.run(None, {input_name: data[start:start + chunk_rows]})[0]
+        chunks.append(np.asarray(out, dtype=np.float64).reshape(len(data[start:start + chunk_rows]), -1))
+    return np.concatenate(chunks) if chunks else np.zeros((0, 1))
+
+
+def lookup_range(settings):
+    """Calibrated (lo, hi) lookup range of a settings.json dict, or None"""
+    value = settings.get('run_args', {}).get('lookup_range')
+    if not value:
+        return None
+    return int(value[0]), int(value[1])
+
+
+def precheck(rows, settings, reference=None):
+    """
+    Reject rows that would overflow the circuit before proving them.
+
+    Inputs are quantized exactly like the circuit (round(x * 2^input_scale),
+    see proof_store.quantize) and compared against the lookup range. When
+    float reference outputs are given, they are checked the same way at the
+    output scale. Intermediate values are not simulated, so this is a
+    necessary, not sufficient, condition.
+
+    Returns:
+        List of {'index', 'reason'} for rejected rows
+    """
+    _require_numpy()
+    import proof_store
+    data = np.asarray(rows, dtype=np.float64).reshape(len(rows), -1)
+    bad = {}
+    finite = np.isfinite(data).all(axis=1)
+    for i in np.flatnonzero(~finite):
+        bad[int(i)] = 'non-finite input'
+
+    bounds = lookup_range(settings)
+    if bounds is not None:
+        lo, hi = bounds
+        checks = [('input', data, proof_store.input_scale(settings))]
+        if reference is not None:
+            scales = settings.get('model_output_scales') or [settings['run_args'].get('input_scale', 0)]
+            checks.append(('output', np.asarray(reference, dtype=np.float64), scales[0]))
+        for name, values, scale in checks:
+            with np.errstate(invalid='ignore', over='ignore'):
+                q = np.rint(values * 2.0 ** scale)
+            over = ((q < lo) | (q > hi)).any(axis=1) & finite
+            for i in np.flatnonzero(over):
+                if int(i) not in bad:
+                    worst = q[i][np.argmax(np.abs(q[i]))]
+                    bad[int(i)] = f"{name} quantizes to {int(worst)} at scale {scale}, outside [{lo}, {hi}]"
+    return [{'index': i, 'reason': reason} for i, reason in sorted(bad.items())]
+
+
+def _witness_chunk(rows, compiled_file, settings_file):
+    """Worker: circuit outputs of each row via gen_witness"""
+    settings = gp.load_settings(settings_file)
+    outputs = []
+    with JobWorkspace(prefix='zkeval-') as ws:
+        for row in rows:
+            with open(ws.input_path, 'w') as f:
+                json.dump(dict(input_data=[list(row)]), f)
+            try:
+                gp.ezkl.gen_witness(ws.input_path, compiled_file, ws.witness_path)
+                with open(ws.witness_path, 'r') as f:
+                    outputs.append(gp.witness_outputs(json.load(f), settings))
+            except Exception:
+                outputs.append(None)
+    return outputs
+
+
+def circuit_outputs(rows, compiled_file, settings_file, workers=1):
+    """
+    Dequantized circuit outputs for many rows (None for rows gen_witness rejects).
+
+    Returns:
+        List aligned with rows
+    """
+    compiled_file, settings_file = os.path.abspath(compiled_file), os.path.abspath(settings_file)
+    chunks = [rows[i:i + witness_chunk_rows] for i in range(0, len(rows), witness_chunk_rows)]
+    if workers <= 1:
+        return [out for chunk in chunks for out in _witness_chunk(chunk, compiled_file, settings_file)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_witness_chunk, chunks, [compiled_file] * len(chunks), [settings_file] * len(chunks))
+        return [out for chunk in results for out in chunk]
+
+
+def error_stats(reference, outputs):
+    """
+    Error distribution of circuit outputs against the float reference.
+
+    Returns:
+        Dict with abs/rel error percentiles, max/mean and a log10 histogram
+    """
+    _require_numpy()
+    ok = [i for i, out in enumerate(outputs) if out is not None]
+    if not ok:
+        return {'rows': len(outputs), 'failedRows': len(outputs)}
+    expected = np.asarray(reference, dtype=np.float64)[ok]
+    got = np.asarray([outputs[i] for i in ok], dtype=np.float64).reshape(expected.shape)
+    abs_err = np.abs(got - expected).ravel()
+    rel_err = (np.abs(got - expected) / np.maximum(np.abs(expected), 1e-9)).ravel()
+    counts, _ = np.histogram(abs_err, bins=error_bins)
+    return {
+        'rows': len(outputs),
+        'failedRows': len(outputs) - len(ok),
+        'maxAbsError': float(abs_err.max()),
+        'meanAbsError': float(abs_err.mean()),
+        'maxRelError': float(rel_err.max()),
+        'absError': percentiles(abs_err.tolist()),
+        'relError': percentiles(rel_err.tolist()),
+        'absErrorHistogram': [
+            {'upTo': None if math.isinf(hi) else hi, 'count': int(c)}
+            for hi, c in zip(error_bins[1:], counts)
+        ],
+    }
+
+
+def evaluate_circuit(name, rows, reference, compiled_file, settings_file, workers=1):
+    """Error stats + pre-check of one compiled circuit"""
+    settings = gp.load_settings(settings_file)
+    outputs = circuit_outputs(rows, compiled_file, settings_file, workers)
+    return dict(
+        error_stats(reference, outputs),
+        circuit=name,
+        logrows=settings['run_args'].get('logrows'),
+        inputScale=settings['run_args'].get('input_scale'),
+        paramScale=settings['run_args'].get('param_scale'),
+        lookupRange=lookup_range(settings),
+        rejectedByPrecheck=len(precheck(rows, settings, reference)),
+    )
+
+
+def print_row(r):
+    if 'maxAbsError' not in r:
+        print(f"  [ERROR] {r['circuit']}: {r.get('error', 'no witness succeeded')}")
+        return
+    print(f"  {r['circuit']:<12} logrows={r['logrows']} scale={r['inputScale']} "
+          f"abs p50/p99/max={r['absError']['p50']:.3g}/{r['absError']['p99']:.3g}/{r['maxAbsError']:.3g} "
+          f"rel max={r['maxRelError']:.3%} failed={r['failedRows']} precheck-rejected={r['rejectedByPrecheck']}")
+
+
+if __name__ == "__main__":
+    from batch_prove import read_rows
+
+    parser = argparse.ArgumentParser(description="Circuit accuracy against the float ONNX model")
+    parser.add_argument('dataset', help="CSV/JSONL rows of [BTC Vol, ETH Gas, Market Volume]")
+    parser.add_argument('--scales', type=int, nargs='*', default=[],
+                        help="Also build and evaluate candidate circuits at these scales")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--precheck-only', action='store_true',
+                        help="Only run the quantization pre-check against the current settings")
+    parser.add_argument('--out', default=report_path)
+    args = parser.parse_args()
+
+    args.dataset = os.path.abspath(args.dataset)
+    args.out = os.path.abspath(args.out)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        rows = read_rows(args.dataset)
+        if not rows:
+            raise ValueError(f"No input rows in {args.dataset}")
+        paths = gp.circuit_paths()
+        if not os.path.exists(paths['settings.json']):
+            raise FileNotFoundError(f"{paths['settings.json']} not found; run generate_proof.py first")
+        settings = gp.load_settings(paths['settings.json'])
+
+        print(f"[INFO] Float reference for {len(rows)} row(s)...")
+        reference = float_reference(rows)
+        rejected = precheck(rows, settings, reference)
+        print(f"[{'WARNING' if rejected else 'OK'}] Pre-check: {len(rejected)}/{len(rows)} row(s) "
+              f"outside lookup range {lookup_range(settings)}")
+        for r in rejected[:20]:
+            print(f"  row {r['index']}: {r['reason']}")
+        if args.precheck_only:
+            sys.exit(1 if rejected else 0)
+
+        import calibrate
+        results = [evaluate_circuit('current', rows, reference, paths['network.ezkl'],
+                                    paths['settings.json'], args.workers)]
+        print_row(results[0])
+        for scale in args.scales:
+            candidate = dict(gp.calibration_args, scales=[scale])
+            try:
+                settings_file, compiled_file = calibrate.build_candidate(
+                    candidate, gp.batch_calibration_data(), os.path.join(eval_dir, f's{scale}'))
+                r = evaluate_circuit(f'scale-{scale}', rows, reference, compiled_file, settings_file, args.workers)
+            except Exception as e:
+                r = {'circuit': f'scale-{scale}', 'error': str(e)}
+            print_row(r)
+            results.append(r)
+
+        os.makedirs(os.path.dirname(args.out), exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump({'rows': len(rows), 'precheckRejected': rejected, 'circuits': results}, f, indent=2)
+        print(f"\n[OK] Accuracy report saved to: {args.out}")
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
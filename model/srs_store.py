@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local, logrows-indexed SRS store.
+
+Layout (default model/srs/, override with EZKL_SRS_DIR):
+    srs/kzg17.srs        one read-only file per (commitment, logrows)
+    srs/ipa17.srs        (IPA only for profiles that select it)
+    srs/manifest.json    {"17": {...}, "ipa17": {"file", "sha256", "size", "source"}}
+
+Lookup is a single path join + stat: no downloads, polling, sleeping or
+copying on the proving path. The store is provisioned once (fetch while
+online, import a trusted file, or generate an insecure SRS for tests on
+air-gapped hosts) and then shared read-only by every worker.
+
+Usage (from model/):
+    python srs_store.py fetch 17          # download once (online)
+    python srs_store.py add kzg17.srs 17  # import a trusted file
+    python srs_store.py generate 17       # offline, INSECURE, tests only
+    python srs_store.py fetch 17 ipa      # non-KZG commitment
+    python srs_store.py list
+    python srs_store.py verify            # re-check all checksums
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+from functools import lru_cache
+
+# Store root
+store_dir = os.environ.get(
+    'EZKL_SRS_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'srs'),
+)
+manifest_name = 'manifest.json'
+
+
+class SRSNotFoundError(Exception):
+    pass
+
+
+def srs_file_name(logrows, commitment='kzg'):
+    return f'{commitment.lower()}{int(logrows)}.srs'
+
+def _manifest_key(logrows, commitment='kzg'):
+    # KZG entries keep the plain logrows key of earlier manifests
+    return str(int(logrows)) if commitment.lower() == 'kzg' else f'{commitment.lower()}{int(logrows)}'
+
+
+def srs_path(logrows, commitment='kzg'):
+    """
+    Resolve the SRS for logrows. Constant time: one stat, no I/O beyond it.
+
+    Raises:
+        SRSNotFoundError if the store has no SRS for logrows
+    """
+    path = os.path.join(store_dir, srs_file_name(logrows, commitment))
+    if not os.path.isfile(path):
+        suffix = '' if commitment.lower() == 'kzg' else f' {commitment.lower()}'
+        raise SRSNotFoundError(
+            f"No {commitment.upper()} SRS for logrows={logrows} in {store_dir}. Provision it once with "
+            f"'python srs_store.py fetch {logrows}{suffix}' (online), "
+            f"'python srs_store.py add <file> {logrows}{suffix}', or "
+            f"'python srs_store.py generate {logrows}{suffix}' (insecure, tests only)."
+        )
+    return path
+
+
+@lru_cache(maxsize=64)
+def _settings_srs_params(settings_file, mtime_ns):
+    with open(settings_file, 'r') as f:
+        run_args = json.load(f)['run_args']
+    return run_args['logrows'], str(run_args.get('commitment') or 'kzg').lower()
+
+def srs_for_settings(settings_file):
+    """SRS path for the logrows/commitment in a settings.json (cached per file version)"""
+    settings_file = os.path.abspath(settings_file)
+    return srs_path(*_settings_srs_params(settings_file, os.stat(settings_file).st_mtime_ns))
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def load_manifest():
+    path = os.path.join(store_dir, manifest_name)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _write_manifest(manifest):
+    path = os.path.join(store_dir, manifest_name)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def add(src, logrows, source='imported', move=False, commitment='kzg'):
+    """
+    Add an SRS file to the store (atomic rename, then made read-only).
+
+    Returns:
+        Path of the stored SRS
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    dst = os.path.join(store_dir, srs_file_name(logrows, commitment))
+    tmp = f"{dst}.tmp{os.getpid()}"
+    if move:
+        shutil.move(src, tmp)
+    else:
+        shutil.copyfile(src, tmp)
+    os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    os.replace(tmp, dst)
+
+    manifest = load_manifest()
+    manifest[_manifest_key(logrows, commitment)] = {
+        'file': srs_file_name(logrows, commitment),
+        'sha256': _sha256(dst),
+        'size': os.path.getsize(dst),
+        'source': source,
+    }
+    _write_manifest(manifest)
+    return dst
+
+
+def _ezkl():
+    import ezkl
+    return ezkl
+
+def _commitment_arg(commitment):
+    ezkl = _ezkl()
+    if hasattr(ezkl, 'PyCommitments'):
+        return getattr(ezkl.PyCommitments, commitment.upper())
+    return commitment
+
+def fetch(logrows, commitment='kzg'):
+    """Download the public SRS for logrows into the store (needs network)"""
+    os.makedirs(store_dir, exist_ok=True)
+    tmp = os.path.join(store_dir, f".download-{commitment}{logrows}-{os.getpid()}.srs")
+    if commitment.lower() == 'kzg':
+        _ezkl().get_srs(logrows=int(logrows), srs_path=tmp)
+    else:
+        _ezkl().get_srs(logrows=int(logrows), srs_path=tmp, commitment=_commitment_arg(commitment))
+    if not os.path.exists(tmp) or os.path.getsize(tmp) == 0:
+        raise Exception(f"get_srs did not produce an SRS at {tmp}")
+    return add(tmp, logrows, source='fetched', move=True, commitment=commitment)
+
+def generate(logrows, commitment='kzg'):
+    """Generate an SRS locally. INSECURE (known toxic waste): tests only"""
+    os.makedirs(store_dir, exist_ok=True)
+    tmp = os.path.join(store_dir, f".generate-{commitment}{logrows}-{os.getpid()}.srs")
+    if commitment.lower() == 'kzg':
+        _ezkl().gen_srs(tmp, int(logrows))
+    else:
+        _ezkl().gen_srs(tmp, int(logrows), commitment=_commitment_arg(commitment))
+    return add(tmp, logrows, source='generated-insecure', move=True, commitment=commitment)
+
+
+def _sort_key(manifest_key):
+    commitment = manifest_key.rstrip('0123456789')
+    return commitment, int(manifest_key[len(commitment):])
+
+def verify():
+    """
+    Re-hash every stored SRS against the manifest.
+
+    Returns:
+        List of (logrows, ok, message)
+    """
+    results = []
+    for logrows, entry in sorted(load_manifest().items(), key=lambda kv: _sort_key(kv[0])):
+        path = os.path.join(store_dir, entry['file'])
+        if not os.path.exists(path):
+            results.append((logrows, False, 'missing'))
+        elif _sha256(path) != entry['sha256']:
+            results.append((logrows, False, 'checksum mismatch'))
+        else:
+            results.append((logrows, True, 'ok'))
+    return results
+
+
+if __name__ == "__main__":
+    usage = ("usage: srs_store.py fetch <logrows> [kzg|ipa] | generate <logrows> [kzg|ipa] | "
+             "add <file> <logrows> [kzg|ipa] | list | verify")
+    args = sys.argv[1:]
+    try:
+        if args[:1] == ['fetch'] and len(args) in (2, 3):
+            print(f"[OK] Stored {fetch(int(args[1]), *args[2:])}")
+        elif args[:1] == ['generate'] and len(args) in (2, 3):
+            print("[WARNING] Generated SRS is insecure; use only for tests")
+            print(f"[OK] Stored {generate(int(args[1]), *args[2:])}")
+        elif args[:1] == ['add'] and len(args) in (3, 4):
+            print(f"[OK] Stored {add(args[1], int(args[2]), commitment=(args[3:] or ['kzg'])[0])}")
+        elif args[:1] == ['list']:
+            for logrows, entry in sorted(load_manifest().items(), key=lambda kv: _sort_key(kv[0])):
+                print(f"  logrows={logrows:>2}  {entry['size']:>12} bytes  {entry['sha256'][:16]}  {entry['source']}")
+        elif args[:1] == ['verify']:
+            results = verify()
+            for logrows, ok, message in results:
+                print(f"  [{'OK' if ok else 'ERROR'}] logrows={logrows}: {message}")
+            if not all(ok for _, ok, _ in results):
+                sys.exit(1)
+        else:
+            print(usage)
+            sys.exit(2)
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming proving of market ticks with latest-wins backpressure.
+
+Ticks arrive as JSONL, one per line, from stdin, a file / named pipe or a
+local socket:
+
+    [0.45, 24, 1.2]
+    {"inputs": [0.45, 24, 1.2], "ts": 1760000000.123}
+
+At most --max-in-flight ticks are in the witness/prove pipeline
+(pipeline.ProvingPipeline) at once. Ticks arriving while it is full are
+not queued: each new tick replaces the one waiting (coalesced), and a tick
+older than --max-age when a slot frees up is dropped as stale. The next
+proof therefore always covers the most recent tick, however far the
+prover falls behind the feed.
+
+Every proof is written to <out>/proofs/tick_<seq>.json and appended to
+<out>/results.jsonl; <out>/summary.json holds the counters and
+percentiles of tick-to-proof latency (from "ts" if the tick carries one,
+else from arrival), queue wait and lag (ticks received after the proven
+one by the time its proof is out).
+
+Usage (from model/):
+    tail -f ticks.jsonl | python stream_prove.py --max-in-flight 2
+    python stream_prove.py --source unix:/tmp/ticks.sock --max-age 5
+    python stream_prove.py --source tcp:127.0.0.1:9100
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+from collections import deque
+
+import generate_proof as gp
+import profiles
+from instrumentation import percentiles
+from pipeline import ProvingPipeline
+
+# Samples kept for latency/lag percentiles (bounded for long-running streams)
+max_samples = 10000
+
+
+def parse_tick(line):
+    """
+    Parse one JSONL tick.
+
+    Returns:
+        (inputs, source timestamp in seconds or None)
+    """
+    item = json.loads(line)
+    ts = None
+    if isinstance(item, dict):
+        ts = item.get('ts')
+        item = item.get('inputs', item.get('input_data'))
+    if not isinstance(item, list) or len(item) != 3:
+        raise ValueError("expected 3 input values")
+    if ts is not None:
+        ts = float(ts)
+        if ts > 1e12:
+            ts /= 1000.0  # milliseconds
+    return [float(v) for v in item], ts
+
+
+class TickMailbox:
+    """
+    Single-slot, latest-wins buffer between the feed and the pipeline.
+
+    put() never blocks: a tick still waiting when a newer one arrives is
+    replaced and counted as coalesced.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._tick = None
+        self._closed = False
+        self.coalesced = 0
+
+    def put(self, tick):
+        with self._cond:
+            if self._tick is not None:
+                self.coalesced += 1
+            self._tick = tick
+            self._cond.notify()
+
+    def take(self):
+        """Newest waiting tick; None once closed and empty"""
+        with self._cond:
+            while self._tick is None and not self._closed:
+                self._cond.wait()
+            tick, self._tick = self._tick, None
+            return tick
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class StreamStats:
+    """Counters and bounded latency samples of a stream run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.received = 0
+        self.invalid = 0
+        self.stale = 0
+        self.submitted = 0
+        self.proved = 0
+        self.cached = 0
+        self.failed = 0
+        self.latest_seq = -1
+        self.error = None
+        self.latency = deque(maxlen=max_samples)
+        self.queue_wait = deque(maxlen=max_samples)
+        self.lag = deque(maxlen=max_samples)
+
+    def summary(self, mailbox):
+        with self.lock:
+            dropped = mailbox.coalesced + self.stale
+            elapsed = time.time() - self.started
+            return {
+                'elapsedSeconds': elapsed,
+                'received': self.received,
+                'invalid': self.invalid,
+                'coalesced': mailbox.coalesced,
+                'stale': self.stale,
+                'dropped': dropped,
+                'dropRate': dropped / self.received if self.received else 0.0,
+                'submitted': self.submitted,
+                'proved': self.proved,
+                'cached': self.cached,
+                'failed': self.failed,
+                'ticksPerSecond': self.received / elapsed if elapsed > 0 else 0.0,
+                'proofsPerSecond': self.proved / elapsed if elapsed > 0 else 0.0,
+                'latency': percentiles(list(self.latency)),
+                'queueWait': percentiles(list(self.queue_wait)),
+                'lagTicks': percentiles(list(self.lag)),
+                'error': self.error,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Tick sources
+# ---------------------------------------------------------------------------
+
+def _read_lines(f, mailbox, stats):
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            inputs, ts = parse_tick(line)
+        except (ValueError, TypeError) as e:
+            with stats.lock:
+                stats.invalid += 1
+            print(f"[WARNING] Invalid tick ignored ({e}): {line[:80]}")
+            continue
+        with stats.lock:
+            stats.received += 1
+            stats.latest_seq += 1
+            seq = stats.latest_seq
+        mailbox.put({'seq': seq, 'inputs': inputs, 'ts': ts, 'received': time.time()})
+
+
+def _serve_socket(sock, mailbox, stats):
+    """Accept connections forever; each connection is a JSONL tick stream"""
+    def handle(conn):
+        with conn, conn.makefile('r', encoding='utf-8') as f:
+            _read_lines(f, mailbox, stats)
+
+    while True:
+        conn, _ = sock.accept()
+        threading.Thread(target=handle, args=(conn,), daemon=True).start()
+
+
+def open_source(source, mailbox, stats):
+    """
+    Start feeding ticks from a source into the mailbox.
+
+    Args:
+        source: '-' (stdin), a file / named pipe path, 'unix:/path.sock'
+            or 'tcp:host:port' (listening socket)
+
+    Returns:
+        Feeder thread; it only finishes (and closes the mailbox) for
+        stdin/file sources at EOF
+    """
+    if source.startswith('unix:') or source.startswith('tcp:'):
+        if source.startswith('unix:'):
+            path = source[len('unix:'):]
+            if os.path.exists(path):
+                os.unlink(path)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.bind(path)
+        else:
+            host, port = source[len('tcp:'):].rsplit(':', 1)
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((host, int(port)))
+        sock.listen()
+        print(f"[INFO] Listening for ticks on {source}")
+        target, args = _serve_socket, (sock, mailbox, stats)
+    else:
+        def target():
+            try:
+                if source == '-':
+                    _read_lines(sys.stdin, mailbox, stats)
+                else:
+                    with open(source, 'r', encoding='utf-8') as f:
+                        _read_lines(f, mailbox, stats)
+            finally:
+                mailbox.close()
+        args = ()
+    feeder = threading.Thread(target=target, args=args, daemon=True)
+    feeder.start()
+    return feeder
+
+
+# ---------------------------------------------------------------------------
+# Dispatch / collect
+# ---------------------------------------------------------------------------
+
+def _dispatch(pipe, mailbox, slots, pending, stats, max_age):
+    """Submit the newest tick whenever an in-flight slot is free"""
+    while True:
+        slots.acquire()
+        # Take the tick only after a slot is free, so it is the freshest one
+        tick = mailbox.take()
+        if tick is None or stats.error is not None:
+            slots.release()
+            return
+        now = time.time()
+        if max_age is not None and now - (tick['ts'] or tick['received']) > max_age:
+            with stats.lock:
+                stats.stale += 1
+            slots.release()
+            continue
+        tick['dispatched'] = now
+        pending[tick['seq']] = tick
+        with stats.lock:
+            stats.submitted += 1
+        pipe.submit(tick['seq'], tick['inputs'])
+
+
+def _collect(pipe, mailbox, slots, pending, stats, out_dir, done):
+    """Write finished proofs and record latency/lag until dispatch is done and drained"""
+    proofs_dir = os.path.join(out_dir, 'proofs')
+    with open(os.path.join(out_dir, 'results.jsonl'), 'a') as results:
+        while not (done.is_set() and not pending):
+            try:
+                r = pipe.get_result(timeout=0.2)
+            except queue.Empty:
+                continue
+            except Exception as e:
+                # A pipeline worker died: fail the in-flight ticks and stop dispatching
+                with stats.lock:
+                    stats.error = str(e)
+                    stats.failed += len(pending)
+                print(f"  [ERROR] {e}")
+                mailbox.close()
+                for _ in range(len(pending) + 1):
+                    slots.release()
+                pending.clear()
+                return
+            now = time.time()
+            tick = pending.pop(r['id'])
+            slots.release()
+            record = {
+                'seq': tick['seq'],
+                'inputs': tick['inputs'],
+                'ts': tick['ts'],
+                'latency_s': now - (tick['ts'] or tick['received']),
+                'queue_wait_s': tick['dispatched'] - tick['received'],
+            }
+            with stats.lock:
+                record['lag_ticks'] = stats.latest_seq - tick['seq']
+                if 'proof' in r:
+                    stats.proved += 1
+                    stats.cached += int(r['cached'])
+                    stats.latency.append(record['latency_s'])
+                    stats.queue_wait.append(record['queue_wait_s'])
+                    stats.lag.append(record['lag_ticks'])
+                else:
+                    stats.failed += 1
+            if 'proof' in r:
+                proof_file = os.path.join(proofs_dir, f"tick_{tick['seq']:08d}.json")
+                with open(proof_file, 'w') as f:
+                    json.dump(r['proof'], f)
+                record.update(proof=os.path.relpath(proof_file, out_dir), cached=r['cached'],
+                              prove_s=r['prove_s'])
+            else:
+                record['error'] = r['error']
+                print(f"  [ERROR] tick {tick['seq']}: {r['error']}")
+            results.write(json.dumps(record) + '\n')
+            results.flush()
+
+
+def print_stats(s):
+    latency = f"{s['latency']['p50']:.2f}s/{s['latency']['p90']:.2f}s" if s['latency'] else '-'
+    lag = f"{s['lagTicks']['p50']:.0f}/{s['lagTicks']['p90']:.0f}" if s['lagTicks'] else '-'
+    print(f"[INFO] ticks={s['received']} proved={s['proved']} failed={s['failed']} "
+          f"dropped={s['dropped']} ({s['dropRate']:.1%}) latency p50/p90={latency} lag p50/p90={lag} ticks")
+
+
+def stream(source, out_dir, max_in_flight=2, max_age=None, witness_workers=1, use_store=True,
+           report_interval=10.0):
+    """
+    Prove ticks from source until it ends (stdin/file EOF) or Ctrl-C.
+
+    Args:
+        source: See open_source
+        out_dir: Output directory for proofs, results.jsonl and summary.json
+        max_in_flight: Ticks in the witness/prove pipeline at once
+        max_age: Drop ticks older than this many seconds instead of proving them
+        witness_workers: Witness processes (prove processes = max_in_flight)
+        use_store: Consult/populate the proof store
+        report_interval: Seconds between progress lines
+
+    Returns:
+        Summary dict (also written to <out_dir>/summary.json)
+    """
+    os.makedirs(os.path.join(out_dir, 'proofs'), exist_ok=True)
+    mailbox = TickMailbox()
+    stats = StreamStats()
+    slots = threading.Semaphore(max_in_flight)
+    pending = {}
+    done = threading.Event()
+
+    # Queues sized to the in-flight bound, so submit() never blocks
+    with ProvingPipeline(witness_workers, max_in_flight, max_in_flight, use_store) as pipe:
+        collector = threading.Thread(target=_collect,
+                                     args=(pipe, mailbox, slots, pending, stats, out_dir, done),
+                                     daemon=True)
+        collector.start()
+        dispatcher = threading.Thread(target=_dispatch, args=(pipe, mailbox, slots, pending, stats, max_age),
+                                      daemon=True)
+        dispatcher.start()
+        open_source(source, mailbox, stats)
+        try:
+            while dispatcher.is_alive():
+                dispatcher.join(report_interval)
+                if dispatcher.is_alive():
+                    print_stats(stats.summary(mailbox))
+        except KeyboardInterrupt:
+            print("\n[INFO] Interrupted; finishing in-flight proofs...")
+            mailbox.close()
+            dispatcher.join()
+        done.set()
+        collector.join()
+
+    summary = dict(stats.summary(mailbox), source=source, maxInFlight=max_in_flight, maxAge=max_age)
+    with open(os.path.join(out_dir, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+    if summary['error']:
+        raise Exception(f"Stream aborted: {summary['error']}")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream JSONL market ticks into the prover (latest wins)")
+    parser.add_argument('--source', default='-',
+                        help="'-' (stdin), file or named pipe, unix:/path.sock or tcp:host:port")
+    parser.add_argument('--max-in-flight', type=int, default=2, help="Ticks being proven at once")
+    parser.add_argument('--max-age', type=float, help="Drop ticks older than this many seconds")
+    parser.add_argument('--witness-workers', type=int, default=1)
+    parser.add_argument('--out', default='stream_output')
+    parser.add_argument('--report-interval', type=float, default=10.0, help="Seconds between progress lines")
+    parser.add_argument('--no-cache', action='store_true', help="Full setup and no proof store")
+    parser.add_argument('--profile', help="Visibility/commitment profile (see profiles.py)")
+    args = parser.parse_args()
+
+    if args.source != '-' and not args.source.startswith(('unix:', 'tcp:')):
+        args.source = os.path.abspath(args.source)
+    args.out = os.path.abspath(args.out)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        if args.profile:
+            # Environment so the pipeline worker processes pick it up too
+            profiles.get_profile(args.profile)
+            os.environ['ZK_PROFILE'] = args.profile
+        gp.ensure_calibration_data()
+        if not gp.setup_circuit(use_cache=not args.no_cache):
+            raise Exception("PK/VK setup failed; cannot prove")
+
+        summary = stream(args.source, args.out, args.max_in_flight, args.max_age, args.witness_workers,
+                         use_store=not args.no_cache, report_interval=args.report_interval)
+        print("\n" + "=" * 60)
+        print_stats(summary)
+        print(f"     Summary: {os.path.join(args.out, 'summary.json')}")
+        print("=" * 60)
+        if summary['failed']:
+            sys.exit(1)
+    except Exception as e:
+        print(f"\n[ERROR] Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Job-scoped workspaces for concurrent proving.
+
+Each proof job gets its own scratch directory (on tmpfs when available) for
+input.json / witness.json / proof.json, so concurrent jobs never overwrite
+each other's files. The shared read-only artifacts (compiled circuit, PK,
+VK, settings, SRS) are referenced by absolute path, never copied.
+
+Usage:
+    with JobWorkspace() as ws:
+        ezkl.gen_witness(ws.input_path, ws.compiled_model_path, ws.witness_path)
+"""
+
+import os
+import shutil
+import tempfile
+
+import profiles
+import srs_store
+
+# Model directory holding the shared artifacts produced by generate_proof.py
+model_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Shared artifacts (file names inside model_dir)
+shared_artifacts = {
+    'compiled_model_path': 'network.ezkl',
+    'pk_path': 'pk.key',
+    'vk_path': 'vk.key',
+    'settings_path': 'settings.json',
+}
+
+
+def scratch_root():
+    """
+    Pick the parent directory for job workspaces.
+
+    ZK_SCRATCH_DIR overrides; otherwise /dev/shm (tmpfs) if writable,
+    falling back to the system temp directory.
+    """
+    override = os.environ.get('ZK_SCRATCH_DIR')
+    if override:
+        os.makedirs(override, exist_ok=True)
+        return override
+    shm = '/dev/shm'
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return tempfile.gettempdir()
+
+
+class JobWorkspace:
+    """
+    Scratch directory for a single proof job.
+
+    Args:
+        directory: Use an existing directory instead of a fresh temp dir
+                   (it is never deleted, e.g. '.' for the legacy CLI layout)
+        prefix: Temp dir name prefix
+        keep: Keep the temp dir after the job finishes (debugging)
+        artifacts_dir: Directory holding the shared read-only artifacts
+                       (default: the active profile's, see profiles.py)
+        owned: Override whether cleanup() deletes the directory, e.g. to
+               hand a job's workspace from one process to the next
+    """
+
+    def __init__(self, directory=None, prefix='zkjob-', keep=False, artifacts_dir=None, owned=None):
+        self._owned = directory is None if owned is None else owned
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix=prefix, dir=scratch_root())
+        else:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.keep = keep or not self._owned
+
+        self.input_path = os.path.join(directory, 'input.json')
+        self.witness_path = os.path.join(directory, 'witness.json')
+        self.proof_path = os.path.join(directory, 'proof.json')
+
+        if artifacts_dir is None:
+            artifacts_dir = os.path.join(model_dir, profiles.profile_dir(profiles.active_profile()))
+        artifacts_dir = os.path.abspath(artifacts_dir)
+        for attr, name in shared_artifacts.items():
+            setattr(self, attr, os.path.join(artifacts_dir, name))
+
+    @property
+    def srs_path(self):
+        """SRS for the shared settings' logrows, from the local SRS store"""
+        return srs_store.srs_for_settings(self.settings_path)
+
+    def path(self, name):
+        """Path for an extra per-job file"""
+        return os.path.join(self.directory, name)
+
+    def cleanup(self):
+        """Remove the scratch directory (no-op for kept/external directories)"""
+        if not self.keep:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+        return False
+
+    def __repr__(self):
+        return f"JobWorkspace({self.directory!r})"
@@ -208,6 +208,37 @@ export async function verifyPredictionOnChain(
   }
 }
 
+/**
+ * Submit pre-encoded verifyPrediction calldata (the prover's "calldata" field,
+ * see model/calldata_encoder.py), skipping proof parsing and ABI encoding.
+ */
+export async function submitPredictionCalldata(
+  contractAddress: string,
+  calldata: string
+): Promise<{ success: boolean; txHash?: string; error?: string }> {
+  try {
+    const provider = await getSigner();
+    const signer = await provider.getSigner();
+    await switchToMonadTestnet();
+
+    const tx = { to: contractAddress, data: calldata };
+    const gasEstimate = await signer.estimateGas(tx);
+    const sent = await signer.sendTransaction({ ...tx, gasLimit: gasEstimate * BigInt(2) });
+    const receipt = await sent.wait();
+
+    return {
+      success: true,
+      txHash: receipt?.hash,
+    };
+  } catch (error: any) {
+    console.error('Verification failed:', error);
+    return {
+      success: false,
+      error: error.message || 'Unknown error',
+    };
+  }
+}
+
 /**
  * Check if wallet is connected
  */
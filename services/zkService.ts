@@ -14,6 +14,7 @@ export interface ZKProofResult {
   witness: any;
   publicInputs: number[];
   proofSize: number;
+  calldata?: string; // Ready-to-send verifyPrediction calldata (backend proofs only)
 }
 
 export interface ZKArtifacts {
@@ -22,38 +23,156 @@ export interface ZKArtifacts {
   pk: ArrayBuffer | null;
 }
 
+interface ArtifactManifestEntry {
+  sha256: string;
+  size: number;
+  encodings?: Record<string, { file: string; size: number }>;
+}
+
+interface ArtifactManifest {
+  version: string;
+  artifacts: Record<string, ArtifactManifestEntry>;
+}
+
+const ARTIFACT_CACHE = 'zk-artifacts';
+let artifactsPromise: { version: string; promise: Promise<ZKArtifacts> } | null = null;
+
+const toHex = (buffer: ArrayBuffer): string =>
+  Array.from(new Uint8Array(buffer)).map(b => b.toString(16).padStart(2, '0')).join('');
+
 /**
- * Load ZK artifacts from public folder
+ * Download one artifact, preferring the precompressed .gz variant
  */
-export const loadZKArtifacts = async (): Promise<ZKArtifacts> => {
-  try {
-    // Try to load settings.json
-    const settingsResponse = await fetch('/settings.json');
-    const settings = settingsResponse.ok ? await settingsResponse.json() : null;
+const downloadArtifact = async (name: string, entry: ArtifactManifestEntry): Promise<ArrayBuffer> => {
+  const gz = entry.encodings?.gzip;
+  if (gz && typeof DecompressionStream !== 'undefined') {
+    const response = await fetch(`/${gz.file}?v=${entry.sha256}`);
+    if (response.ok && response.body) {
+      return new Response(response.body.pipeThrough(new DecompressionStream('gzip'))).arrayBuffer();
+    }
+  }
+  const response = await fetch(`/${name}?v=${entry.sha256}`);
+  if (!response.ok) {
+    throw new Error(`${name}: HTTP ${response.status}`);
+  }
+  return response.arrayBuffer();
+};
 
-    // Try to load verification key
-    let vk: ArrayBuffer | null = null;
-    try {
-      const vkResponse = await fetch('/vk.key');
-      if (vkResponse.ok) {
-        vk = await vkResponse.arrayBuffer();
+/**
+ * Fetch an artifact by content hash: served from the Cache API while the hash
+ * is unchanged, otherwise downloaded, verified and cached (older versions dropped)
+ */
+const fetchArtifact = async (name: string, entry: ArtifactManifestEntry): Promise<ArrayBuffer> => {
+  const key = `/${name}?v=${entry.sha256}`;
+  const cache = typeof caches !== 'undefined' ? await caches.open(ARTIFACT_CACHE) : null;
+  const cached = cache ? await cache.match(key) : undefined;
+  if (cached) {
+    return cached.arrayBuffer();
+  }
+
+  const data = await downloadArtifact(name, entry);
+  const digest = toHex(await crypto.subtle.digest('SHA-256', data));
+  if (digest !== entry.sha256) {
+    throw new Error(`${name}: sha256 mismatch (expected ${entry.sha256.slice(0, 12)}, got ${digest.slice(0, 12)})`);
+  }
+  if (cache) {
+    for (const request of await cache.keys()) {
+      if (new URL(request.url).pathname === `/${name}`) {
+        await cache.delete(request);
       }
+    }
+    await cache.put(key, new Response(data));
+  }
+  return data;
+};
+
+const loadFromManifest = async (manifest: ArtifactManifest): Promise<ZKArtifacts> => {
+  const load = async (name: string): Promise<ArrayBuffer | null> => {
+    const entry = manifest.artifacts[name];
+    if (!entry) {
+      console.warn(`[ZK] ${name} not in manifest, will use mock`);
+      return null;
+    }
+    try {
+      return await fetchArtifact(name, entry);
     } catch (e) {
-      console.warn('[ZK] vk.key not found, will use mock');
+      console.warn(`[ZK] Failed to load ${name}:`, e);
+      return null;
     }
+  };
+
+  const [settingsData, vk, pk] = await Promise.all([load('settings.json'), load('vk.key'), load('pk.key')]);
+  const settings = settingsData ? JSON.parse(new TextDecoder().decode(settingsData)) : null;
+  return { settings, vk, pk };
+};
 
-    // Try to load proving key
-    let pk: ArrayBuffer | null = null;
+/**
+ * Load ZK artifacts without a manifest (plain downloads, no cache validation)
+ */
+const loadUnversioned = async (): Promise<ZKArtifacts> => {
+  // Try to load settings.json
+  const settingsResponse = await fetch('/settings.json');
+  const settings = settingsResponse.ok ? await settingsResponse.json() : null;
+
+  // Try to load verification key
+  let vk: ArrayBuffer | null = null;
+  try {
+    const vkResponse = await fetch('/vk.key');
+    if (vkResponse.ok) {
+      vk = await vkResponse.arrayBuffer();
+    }
+  } catch (e) {
+    console.warn('[ZK] vk.key not found, will use mock');
+  }
+
+  // Try to load proving key
+  let pk: ArrayBuffer | null = null;
+  try {
+    const pkResponse = await fetch('/pk.key');
+    if (pkResponse.ok) {
+      pk = await pkResponse.arrayBuffer();
+    }
+  } catch (e) {
+    console.warn('[ZK] pk.key not found, will use mock');
+  }
+
+  return { settings, vk, pk };
+};
+
+/**
+ * Load ZK artifacts from public folder
+ *
+ * With public/artifacts-manifest.json (written by model/copy_artifacts.py)
+ * only the small manifest is revalidated; artifacts are cached by content hash
+ * and re-fetched only when their hash changes.
+ */
+export const loadZKArtifacts = async (): Promise<ZKArtifacts> => {
+  try {
+    let manifest: ArtifactManifest | null = null;
     try {
-      const pkResponse = await fetch('/pk.key');
-      if (pkResponse.ok) {
-        pk = await pkResponse.arrayBuffer();
-      }
+      const manifestResponse = await fetch('/artifacts-manifest.json', { cache: 'no-cache' });
+      manifest = manifestResponse.ok ? await manifestResponse.json() : null;
     } catch (e) {
-      console.warn('[ZK] pk.key not found, will use mock');
+      manifest = null;
+    }
+    if (!manifest) {
+      return await loadUnversioned();
     }
 
-    return { settings, vk, pk };
+    if (!artifactsPromise || artifactsPromise.version !== manifest.version) {
+      const promise = loadFromManifest(manifest);
+      artifactsPromise = { version: manifest.version, promise };
+      // Do not pin a partial load: retry missing artifacts on the next call
+      promise.then(
+        a => {
+          if (!a.settings || !a.vk || !a.pk) artifactsPromise = null;
+        },
+        () => {
+          artifactsPromise = null;
+        }
+      );
+    }
+    return await artifactsPromise.promise;
   } catch (error) {
     console.warn('[ZK] Failed to load artifacts, using mock mode:', error);
     return { settings: null, vk: null, pk: null };
@@ -113,6 +232,7 @@ const generateRealProof = async (
         witness: result.witness,
         publicInputs: result.publicInputs || [...inputs, prediction],
         proofSize: result.proofSize || 0,
+        calldata: result.calldata,
       };
     } else {
       throw new Error(`Backend API error: ${response.status}`);
@@ -163,8 +283,8 @@ export const verifyProof = async (
   vk: ArrayBuffer | null
 ): Promise<boolean> => {
   if (!vk) {
-    console.warn('[ZK] Verification key not available, skipping verification');
-    return true; // Mock: always return true
+    console.warn('[ZK] Verification key not available, proof not verified');
+    return false;
   }
 
   try {
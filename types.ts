@@ -26,4 +26,16 @@ export interface BenchmarkData {
   tokenName?: string;
   gasCostToken?: string;
   gasCostUsd?: string | null;
-}
\ No newline at end of file
+}
+
+export interface ProverBenchmarkData {
+  config: string;
+  logrows: number;
+  batchSize: number;
+  keygenTime: number;
+  proveTime: number; // p50 seconds
+  verifyTime: number; // p50 seconds
+  proofSize: number;
+  pkSize: number;
+  peakRssMb: number;
+}